@@ -0,0 +1,17 @@
+"""Gunicorn-Konfiguration, wird aus dem Arbeitsverzeichnis automatisch geladen."""
+import os
+
+# Mit NLP_PRELOAD=true lädt der Master die App samt spaCy-Modell einmal vor dem
+# Fork; die Worker teilen die Speicherseiten copy-on-write statt das Modell
+# jeweils selbst zu laden.
+preload_app = os.environ.get("NLP_PRELOAD", "false").lower() in ["true", "on", "1"]
+
+
+def post_fork(server, worker):
+    """Verbindungen, die der Master beim Laden der App geöffnet hat, nicht im Worker weiterverwenden."""
+    if not preload_app:
+        return
+    from medtech_newsletter.extensions import db
+
+    with server.app.wsgi().app_context():
+        db.engine.dispose(close=False)
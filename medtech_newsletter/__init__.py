@@ -13,11 +13,12 @@ from .extensions import db
 
 # Importiere andere Module
 from .config import config
-from .models import User, Document, DocumentChange, Newsletter
+from .models import User, Document, DocumentChange, Newsletter, upgrade_schema
 from .scheduler import TaskScheduler
 from .email_service import EmailService
 from .newsletter_generator import NewsletterGenerator
 from .analyzer import DocumentAnalyzer
+from . import nlp
 
 
 def login_required(f):
@@ -50,6 +51,7 @@ def create_app(config_name='development'):
 
     with app.app_context():
         db.create_all()
+        upgrade_schema()
         admin_email = os.environ.get('ADMIN_EMAIL')
         admin_pass = os.environ.get('ADMIN_PASSWORD')
         if admin_email and admin_pass and not User.query.filter_by(email=admin_email).first():
@@ -253,6 +255,9 @@ def create_app(config_name='development'):
                 'timestamp': datetime.utcnow().isoformat()
             }), 500
 
+    if app.config.get('NLP_PRELOAD'):
+        nlp.preload()
+
     if config_name == 'production' or os.environ.get('START_SCHEDULER', 'false').lower() == 'true':
         scheduler.start_scheduler()
 
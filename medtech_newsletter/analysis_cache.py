@@ -0,0 +1,73 @@
+"""Persistenter Cache der Dokumentanalyse, eine Analyse je Inhaltsversion."""
+from typing import Dict, Iterable, Set
+
+from loguru import logger
+
+from .analyzer import ANALYZER_VERSION
+from .extensions import db
+from .models import Document, DocumentAnalysis, DocumentChange
+
+
+class AnalysisCache:
+    """Ergebnisse von ``extract_key_information`` je ``content_hash`` und Analyzer-Version.
+
+    Der ``ScrapeResultWriter`` analysiert jeden geladenen Inhalt, für den
+    noch kein Eintrag existiert, genau einmal; die Newsletter-Generierung
+    liest nur noch die gespeicherten Ergebnisse. Mit einer neuen
+    ``ANALYZER_VERSION`` gelten alle bisherigen Einträge als veraltet.
+    """
+
+    def __init__(self, version: str = ANALYZER_VERSION):
+        self.version = version
+
+    def known(self, content_hashes: Iterable[str]) -> Set[str]:
+        """Die Hashes, deren Inhalt in dieser Version bereits analysiert ist"""
+        content_hashes = set(content_hashes)
+        if not content_hashes:
+            return set()
+        return {content_hash for content_hash, in db.session.query(DocumentAnalysis.content_hash).filter(
+            DocumentAnalysis.analyzer_version == self.version,
+            DocumentAnalysis.content_hash.in_(content_hashes)
+        )}
+
+    def lookup(self, content_hashes: Iterable[str]) -> Dict[str, DocumentAnalysis]:
+        """Gespeicherte Analysen der angegebenen Inhaltsversionen"""
+        content_hashes = {content_hash for content_hash in content_hashes if content_hash}
+        if not content_hashes:
+            return {}
+        return {analysis.content_hash: analysis for analysis in DocumentAnalysis.query.filter(
+            DocumentAnalysis.analyzer_version == self.version,
+            DocumentAnalysis.content_hash.in_(content_hashes)
+        )}
+
+    def store(self, content_hash: str, info: Dict):
+        """Speichert das Ergebnis von ``extract_key_information`` (ohne Commit)"""
+        db.session.add(DocumentAnalysis(
+            content_hash=content_hash,
+            analyzer_version=self.version,
+            summary=info['summary'],
+            key_topics=info['key_topics'],
+            regulations=info['regulations'],
+            standards=info['standards'],
+            dates=info['dates'],
+            change_indicators=info['change_indicators'],
+            importance_score=info['importance_score']
+        ))
+
+    def prune(self) -> int:
+        """Löscht Analysen älterer Versionen und nicht mehr benötigter Inhalte (ohne Commit)
+
+        Benötigt werden die aktuellen Inhalte und die Versionen noch nicht
+        versendeter Änderungen.
+        """
+        current = db.session.query(Document.content_hash).filter(Document.content_hash.isnot(None))
+        pending = db.session.query(DocumentChange.content_hash).filter(
+            DocumentChange.processed.is_(False), DocumentChange.content_hash.isnot(None)
+        )
+        removed = DocumentAnalysis.query.filter(
+            (DocumentAnalysis.analyzer_version != self.version)
+            | (DocumentAnalysis.content_hash.notin_(current) & DocumentAnalysis.content_hash.notin_(pending))
+        ).delete(synchronize_session=False)
+        if removed:
+            logger.info(f"{removed} veraltete Dokumentanalysen entfernt")
+        return removed
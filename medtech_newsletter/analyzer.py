@@ -1,41 +1,32 @@
-import spacy
-import nltk
 from textdistance import levenshtein, jaccard
 import difflib
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-from loguru import logger
 import re
 import json
 from collections import Counter
 
-# NLTK Downloads (falls noch nicht vorhanden)
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+from .entities import extract_entities
+from .keywords import ANALYZER_TABLES, MEDICAL_KEYWORDS, TOPIC_KEYWORDS, KeywordHits, KeywordMatcher
+from .nlp import get_sentence_pipeline
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# Bei jeder Änderung an extract_key_information erhöhen; zwischengespeicherte
+# Ergebnisse älterer Versionen werden dann neu berechnet (siehe analysis_cache)
+ANALYZER_VERSION = '1'
 
 class DocumentAnalyzer:
     """Klasse für die Analyse und Verarbeitung von Dokumenten"""
     
     def __init__(self):
-        self.nlp = None
-        self._load_nlp_model()
-        
         # Medizintechnik-spezifische Keywords
-        self.medical_keywords = {
-            'regulations': ['regulation', 'directive', 'law', 'act', 'verordnung', 'richtlinie', 'gesetz'],
-            'standards': ['standard', 'norm', 'iso', 'iec', 'din', 'astm'],
-            'devices': ['medical device', 'medizinprodukt', 'implant', 'diagnostic', 'therapeutic'],
-            'quality': ['quality', 'safety', 'risk', 'qualität', 'sicherheit', 'risiko'],
-            'approval': ['approval', 'certification', 'clearance', 'zulassung', 'zertifizierung'],
-            'clinical': ['clinical trial', 'study', 'evaluation', 'klinische studie', 'bewertung']
-        }
+        self.medical_keywords = MEDICAL_KEYWORDS
+        
+        # Ein Automat für alle Keyword-Tabellen; die Gewichte ersetzen die
+        # bisherigen Schleifen über die einzelnen Tabellen
+        self.keyword_matcher = KeywordMatcher(ANALYZER_TABLES)
+        medical = {f'medical:{category}': 1 for category in MEDICAL_KEYWORDS}
+        self.sentence_keyword_weights = self.keyword_matcher.weights({**medical, 'change': 2})
+        self.document_keyword_weights = self.keyword_matcher.weights({**medical, 'high_importance': 2})
         
         # Wichtigkeits-Scores für verschiedene Änderungstypen
         self.importance_weights = {
@@ -48,23 +39,30 @@ class DocumentAnalyzer:
             'general_update': 5
         }
     
-    def _load_nlp_model(self):
-        """Lädt das spaCy NLP-Modell"""
-        try:
-            # Versuche deutsches Modell zu laden
-            self.nlp = spacy.load("de_core_news_sm")
-            logger.info("Deutsches spaCy-Modell geladen")
-        except OSError:
-            try:
-                # Fallback auf englisches Modell
-                self.nlp = spacy.load("en_core_web_sm")
-                logger.info("Englisches spaCy-Modell geladen")
-            except OSError:
-                logger.warning("Kein spaCy-Modell gefunden. Verwende einfache Textverarbeitung.")
-                self.nlp = None
+    @property
+    def nlp(self):
+        """spaCy-Pipeline für die Satzaufteilung, beim ersten Zugriff einmal je Prozess geladen"""
+        return get_sentence_pipeline()
     
     def extract_key_information(self, content: str, metadata: Dict) -> Dict:
         """Extrahiert Schlüsselinformationen aus dem Dokumentinhalt"""
+        return self.extract_key_information_batch([(content, metadata)])[0]
+    
+    def extract_key_information_batch(self, documents: List[Tuple[str, Dict]], n_process: int = 1,
+                                      batch_size: int = 16) -> List[Dict]:
+        """Schlüsselinformationen vieler Dokumente (Paare aus Inhalt und Metadaten).
+        
+        Die Satzaufteilung aller Dokumente läuft gebündelt über ``nlp.pipe``,
+        mit ``n_process`` > 1 in mehreren Prozessen; das Ergebnis entspricht
+        je Dokument dem von ``extract_key_information``.
+        """
+        contents = [content for content, _ in documents if content]
+        sentences = iter(self.split_sentences_batch(contents, n_process=n_process, batch_size=batch_size))
+        return [self._key_information(content, next(sentences) if content else [])
+                for content, _ in documents]
+    
+    def _key_information(self, content: str, sentences: List[str]) -> Dict:
+        """Schlüsselinformationen eines Dokuments, dessen Sätze bereits aufgeteilt sind"""
         info = {
             'summary': '',
             'key_topics': [],
@@ -78,62 +76,55 @@ class DocumentAnalyzer:
         if not content:
             return info
         
-        # Text in Sätze aufteilen
-        sentences = self._split_into_sentences(content)
-        
         # Wichtige Sätze identifizieren
         important_sentences = self._identify_important_sentences(sentences)
         info['summary'] = ' '.join(important_sentences[:3])  # Top 3 Sätze als Zusammenfassung
         
-        # Schlüsselthemen extrahieren
-        info['key_topics'] = self._extract_topics(content)
+        # Alle Keywords des Dokuments in einem Durchlauf zählen
+        hits = self.keyword_matcher.scan(content)
         
-        # Daten extrahieren
-        info['dates'] = self._extract_dates(content)
+        # Schlüsselthemen extrahieren
+        info['key_topics'] = self._extract_topics(content, hits)
         
-        # Regulierungen und Standards identifizieren
-        info['regulations'] = self._extract_regulations(content)
-        info['standards'] = self._extract_standards(content)
+        # Daten, Regulierungen, Standards und Änderungsindikatoren in einem Durchlauf
+        entities = extract_entities(content)
+        info['dates'] = entities['dates']
+        info['regulations'] = entities['regulations']
+        info['standards'] = entities['standards']
         
         # Wichtigkeitsscore berechnen
-        info['importance_score'] = self._calculate_importance_score(content, info)
+        info['importance_score'] = self._calculate_importance_score(content, info, hits)
         
-        # Änderungsindikatoren suchen
-        info['change_indicators'] = self._find_change_indicators(content)
+        info['change_indicators'] = entities['change_indicators']
         
         return info
     
     def _split_into_sentences(self, text: str) -> List[str]:
         """Teilt Text in Sätze auf"""
         if self.nlp:
-            doc = self.nlp(text)
+            # Längere Texte lehnt spaCy ab (E088); Sätze dahinter fehlen dann
+            doc = self.nlp(text[:self.nlp.max_length])
             return [sent.text.strip() for sent in doc.sents if len(sent.text.strip()) > 10]
         else:
             # Fallback: einfache Satzaufteilung
             sentences = re.split(r'[.!?]+', text)
             return [s.strip() for s in sentences if len(s.strip()) > 10]
     
+    def split_sentences_batch(self, texts: List[str], n_process: int = 1, batch_size: int = 16) -> List[List[str]]:
+        """Teilt viele Texte in Sätze auf, mit spaCy gebündelt über ``nlp.pipe``"""
+        if not self.nlp:
+            return [self._split_into_sentences(text) for text in texts]
+        texts = (text[:self.nlp.max_length] for text in texts)
+        return [[sent.text.strip() for sent in doc.sents if len(sent.text.strip()) > 10]
+                for doc in self.nlp.pipe(texts, n_process=n_process, batch_size=batch_size)]
+    
     def _identify_important_sentences(self, sentences: List[str]) -> List[str]:
         """Identifiziert wichtige Sätze basierend auf Keywords"""
         scored_sentences = []
         
-        for sentence in sentences:
-            score = 0
-            sentence_lower = sentence.lower()
-            
-            # Score basierend auf medizinischen Keywords
-            for category, keywords in self.medical_keywords.items():
-                for keyword in keywords:
-                    if keyword in sentence_lower:
-                        score += 1
-            
-            # Zusätzliche Punkte für Änderungsindikatoren
-            change_words = ['new', 'updated', 'revised', 'amended', 'changed', 'modified', 
-                           'neu', 'aktualisiert', 'überarbeitet', 'geändert', 'modifiziert']
-            for word in change_words:
-                if word in sentence_lower:
-                    score += 2
-            
+        # Ein Punkt je gefundenem medizinischen Keyword, zwei je Änderungsindikator
+        for sentence, hits in zip(sentences, self.keyword_matcher.scan_each(sentences)):
+            score = hits.score(self.sentence_keyword_weights, distinct=True)
             if score > 0:
                 scored_sentences.append((sentence, score))
         
@@ -141,99 +132,20 @@ class DocumentAnalyzer:
         scored_sentences.sort(key=lambda x: x[1], reverse=True)
         return [sent[0] for sent in scored_sentences]
     
-    def _extract_topics(self, content: str) -> List[str]:
+    def _extract_topics(self, content: str, hits: Optional[KeywordHits] = None) -> List[str]:
         """Extrahiert Hauptthemen aus dem Inhalt"""
-        topics = []
-        content_lower = content.lower()
-        
-        # Suche nach spezifischen Themen
-        topic_patterns = {
-            'Medical Device Regulation': ['mdr', 'medical device regulation', 'medizinprodukteverordnung'],
-            'In Vitro Diagnostic': ['ivd', 'in vitro diagnostic', 'in-vitro-diagnostika'],
-            'Quality Management': ['quality management', 'qualitätsmanagement', 'iso 13485'],
-            'Risk Management': ['risk management', 'risikomanagement', 'iso 14971'],
-            'Clinical Evaluation': ['clinical evaluation', 'klinische bewertung'],
-            'Post Market Surveillance': ['post market surveillance', 'marktüberwachung'],
-            'Biocompatibility': ['biocompatibility', 'biokompatibilität', 'iso 10993'],
-            'Software': ['software', 'iec 62304'],
-            'Sterilization': ['sterilization', 'sterilisation', 'iso 11135']
-        }
-        
-        for topic, patterns in topic_patterns.items():
-            for pattern in patterns:
-                if pattern in content_lower:
-                    topics.append(topic)
-                    break
-        
-        return list(set(topics))  # Entferne Duplikate
-    
-    def _extract_dates(self, content: str) -> List[str]:
-        """Extrahiert Daten aus dem Inhalt"""
-        date_patterns = [
-            r'\b\d{1,2}[./]\d{1,2}[./]\d{4}\b',
-            r'\b\d{4}[./]\d{1,2}[./]\d{1,2}\b',
-            r'\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b',
-            r'\b\d{1,2}\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}\b',
-            r'\b(Januar|Februar|März|April|Mai|Juni|Juli|August|September|Oktober|November|Dezember)\s+\d{1,2},?\s+\d{4}\b'
-        ]
-        
-        dates = []
-        for pattern in date_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            dates.extend(matches)
-        
-        return list(set(dates))  # Entferne Duplikate
-    
-    def _extract_regulations(self, content: str) -> List[str]:
-        """Extrahiert Regulierungen aus dem Inhalt"""
-        regulation_patterns = [
-            r'\b(EU|EC)\s+\d+/\d+\b',  # EU Regulierungen
-            r'\bMDR\b',  # Medical Device Regulation
-            r'\bIVDR\b',  # In Vitro Diagnostic Regulation
-            r'\bFDA\s+\w+\b',  # FDA Regulierungen
-            r'\b21\s+CFR\s+\d+\b',  # FDA Code of Federal Regulations
-            r'\bMedizinproduktegesetz\b',
-            r'\bMPG\b'
-        ]
-        
-        regulations = []
-        for pattern in regulation_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            regulations.extend(matches)
-        
-        return list(set(regulations))
-    
-    def _extract_standards(self, content: str) -> List[str]:
-        """Extrahiert Standards aus dem Inhalt"""
-        standard_patterns = [
-            r'\bISO\s+\d+(-\d+)?\b',
-            r'\bIEC\s+\d+(-\d+)?\b',
-            r'\bDIN\s+EN\s+\d+\b',
-            r'\bASTM\s+\w+\d+\b'
-        ]
-        
-        standards = []
-        for pattern in standard_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            standards.extend(matches)
-        
-        return list(set(standards))
+        if hits is None:
+            hits = self.keyword_matcher.scan(content)
+        return [topic for topic in TOPIC_KEYWORDS if hits.any(f'topic:{topic}')]
     
-    def _calculate_importance_score(self, content: str, info: Dict) -> int:
+    def _calculate_importance_score(self, content: str, info: Dict,
+                                    hits: Optional[KeywordHits] = None) -> int:
         """Berechnet einen Wichtigkeitsscore für das Dokument"""
-        score = 0
-        content_lower = content.lower()
+        if hits is None:
+            hits = self.keyword_matcher.scan(content)
         
-        # Basis-Score basierend auf Schlüsselwörtern
-        for category, keywords in self.medical_keywords.items():
-            for keyword in keywords:
-                score += content_lower.count(keyword)
-        
-        # Zusätzliche Punkte für spezifische Indikatoren
-        high_importance_words = ['mandatory', 'required', 'deadline', 'compliance', 
-                                'pflicht', 'erforderlich', 'frist', 'konformität']
-        for word in high_importance_words:
-            score += content_lower.count(word) * 2
+        # Basis-Score basierend auf Schlüsselwörtern, doppelt für spezifische Indikatoren
+        score = hits.score(self.document_keyword_weights)
         
         # Punkte für gefundene Regulierungen und Standards
         score += len(info.get('regulations', [])) * 3
@@ -244,24 +156,6 @@ class DocumentAnalyzer:
         
         return min(score, 100)  # Maximal 100 Punkte
     
-    def _find_change_indicators(self, content: str) -> List[str]:
-        """Findet Indikatoren für Änderungen im Inhalt"""
-        change_patterns = [
-            r'(new|updated|revised|amended|changed|modified|introduced)\s+\w+',
-            r'(neu|aktualisiert|überarbeitet|geändert|modifiziert|eingeführt)\s+\w+',
-            r'effective\s+(date|from)',
-            r'(gültig|wirksam)\s+(ab|vom)',
-            r'deadline\s+\w+',
-            r'(frist|termin)\s+\w+'
-        ]
-        
-        indicators = []
-        for pattern in change_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            indicators.extend([match if isinstance(match, str) else ' '.join(match) for match in matches])
-        
-        return list(set(indicators))
-    
     def compare_documents(self, old_content: str, new_content: str) -> Dict:
         """Vergleicht zwei Dokumentversionen und identifiziert Änderungen"""
         if not old_content or not new_content:
@@ -361,16 +255,11 @@ class DocumentAnalyzer:
         
         summary = f"Dokument wurde aktualisiert: {total_additions} Zeilen hinzugefügt, {total_removals} Zeilen entfernt."
         
-        # Versuche spezifische Änderungen zu identifizieren
-        change_keywords = []
-        for change in detailed_changes:
-            for line in change.get('added_lines', []):
-                if any(keyword in line.lower() for keyword in ['deadline', 'requirement', 'mandatory', 'frist', 'pflicht']):
-                    change_keywords.append('Wichtige Anforderungen geändert')
-                    break
-        
-        if change_keywords:
-            summary += f" Wichtige Änderungen: {', '.join(set(change_keywords))}"
+        # Versuche spezifische Änderungen zu identifizieren (Keywords enthalten
+        # keine Zeilenumbrüche, die Zeilen können also gemeinsam durchsucht werden)
+        added_text = '\n'.join(line for change in detailed_changes for line in change.get('added_lines', []))
+        if self.keyword_matcher.scan(added_text).any('requirement'):
+            summary += " Wichtige Änderungen: Wichtige Anforderungen geändert"
         
         return summary
     
@@ -379,23 +268,17 @@ class DocumentAnalyzer:
         if not detailed_changes:
             return 0
         
-        importance = 0
-        
-        for change in detailed_changes:
-            # Punkte für hinzugefügte Zeilen
-            added_lines = change.get('added_lines', [])
-            for line in added_lines:
-                line_lower = line.lower()
-                if any(keyword in line_lower for keyword in ['mandatory', 'required', 'deadline', 'pflicht', 'frist']):
-                    importance += 5
-                elif any(keyword in line_lower for keyword in ['new', 'updated', 'revised', 'neu', 'aktualisiert']):
-                    importance += 3
-                else:
-                    importance += 1
-            
-            # Punkte für entfernte Zeilen
-            removed_lines = change.get('removed_lines', [])
-            importance += len(removed_lines)
+        # Punkte für entfernte Zeilen
+        importance = sum(len(change.get('removed_lines', [])) for change in detailed_changes)
+        
+        # Punkte für hinzugefügte Zeilen
+        added_lines = [line for change in detailed_changes for line in change.get('added_lines', [])]
+        for hits in self.keyword_matcher.scan_each(added_lines):
+            if hits.any('mandatory'):
+                importance += 5
+            elif hits.any('update'):
+                importance += 3
+            else:
+                importance += 1
         
         return min(importance, 100)  # Maximal 100 Punkte
-
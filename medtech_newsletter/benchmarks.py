@@ -0,0 +1,322 @@
+"""Micro-Benchmarks der Analyse- und Extraktionspfade gegenüber ihren bisherigen Implementierungen.
+
+Auf synthetischen Leitlinien-Texten oder eigenen Textdateien bzw. auf den
+Seiten eines Fixture-Archivs (siehe ``replay``)::
+
+    python -m medtech_newsletter.benchmarks keywords [leitlinie.txt ...] [--rounds 5]
+    python -m medtech_newsletter.benchmarks entities [leitlinie.txt ...] [--rounds 5]
+    python -m medtech_newsletter.benchmarks metadata [fixtures/sources.zip] [--scan-kb 16]
+    python -m medtech_newsletter.benchmarks sentences [leitlinie.txt ...] [--model de_core_news_sm]
+"""
+import argparse
+import re
+import time
+from typing import Dict, List, Optional
+
+from .entities import extract_entities
+from .keywords import (ANALYZER_TABLES, CHANGE_WORDS, HIGH_IMPORTANCE_WORDS, MEDICAL_KEYWORDS, TOPIC_KEYWORDS,
+                       KeywordMatcher)
+from .metadata import MAX_DATES, MetadataExtractor
+from .nlp import load_sentence_pipeline
+
+MONTHS_EN = 'January|February|March|April|May|June|July|August|September|October|November|December'
+
+# Bisherige Einzelmuster des Analyzers für Entitäten
+_LEGACY_ENTITY_PATTERNS = [
+    r'\b\d{1,2}[./]\d{1,2}[./]\d{4}\b',
+    r'\b\d{4}[./]\d{1,2}[./]\d{1,2}\b',
+    r'\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b',
+    r'\b\d{1,2}\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}\b',
+    r'\b(Januar|Februar|März|April|Mai|Juni|Juli|August|September|Oktober|November|Dezember)\s+\d{1,2},?\s+\d{4}\b',
+    r'\b(EU|EC)\s+\d+/\d+\b', r'\bMDR\b', r'\bIVDR\b', r'\bFDA\s+\w+\b', r'\b21\s+CFR\s+\d+\b',
+    r'\bMedizinproduktegesetz\b', r'\bMPG\b',
+    r'\bISO\s+\d+(-\d+)?\b', r'\bIEC\s+\d+(-\d+)?\b', r'\bDIN\s+EN\s+\d+\b', r'\bASTM\s+\w+\d+\b',
+    r'(new|updated|revised|amended|changed|modified|introduced)\s+\w+',
+    r'(neu|aktualisiert|überarbeitet|geändert|modifiziert|eingeführt)\s+\w+',
+    r'effective\s+(date|from)', r'(gültig|wirksam)\s+(ab|vom)', r'deadline\s+\w+', r'(frist|termin)\s+\w+',
+]
+
+
+def _legacy_sentence_scores(sentences: List[str]) -> List[int]:
+    """Bisherige Satzbewertung (ein ``in`` je Keyword und Satz)"""
+    scores = []
+    for sentence in sentences:
+        sentence_lower = sentence.lower()
+        score = sum(1 for keywords in MEDICAL_KEYWORDS.values() for keyword in keywords
+                    if keyword in sentence_lower)
+        score += sum(2 for word in CHANGE_WORDS if word in sentence_lower)
+        scores.append(score)
+    return scores
+
+
+def _legacy_document_score(content: str) -> Dict:
+    """Bisherige Themen und Keyword-Punkte eines Dokuments (ein Durchlauf je Keyword)"""
+    content_lower = content.lower()
+    score = sum(content_lower.count(keyword) for keywords in MEDICAL_KEYWORDS.values() for keyword in keywords)
+    score += sum(content_lower.count(word) * 2 for word in HIGH_IMPORTANCE_WORDS)
+    topics = [topic for topic, patterns in TOPIC_KEYWORDS.items()
+              if any(pattern in content_lower for pattern in patterns)]
+    return {'score': score, 'topics': topics}
+
+
+def _legacy_extract_entities(text: str) -> List:
+    return [re.findall(pattern, text, re.IGNORECASE) for pattern in _LEGACY_ENTITY_PATTERNS]
+
+
+def _legacy_extract_dates(text: str) -> List:
+    """Bisherige Datumssuche der Metadaten (vier Muster über den gesamten Text)"""
+    patterns = [
+        r'(\d{1,2}[./]\d{1,2}[./]\d{4})',
+        r'(\d{4}[./]\d{1,2}[./]\d{1,2})',
+        rf'({MONTHS_EN})\s+\d{{1,2}},?\s+\d{{4}}',
+        rf'(\d{{1,2}}\s+({MONTHS_EN})\s+\d{{4}})'
+    ]
+    for pattern in patterns:
+        matches = re.findall(pattern, text, re.IGNORECASE)
+        if matches:
+            return matches[:MAX_DATES]
+    return []
+
+
+def _read_documents(paths: List[str]) -> List[str]:
+    documents = []
+    for path in paths:
+        with open(path, encoding='utf-8') as text_file:
+            documents.append(text_file.read())
+    return documents
+
+
+def _sample_guidelines(paths: Optional[List[str]]) -> List[str]:
+    """Inhalte der angegebenen Textdateien bzw. synthetische Leitlinien verschiedener Länge"""
+    if paths:
+        return _read_documents(paths)
+    paragraphs = [
+        'Die Leitlinie beschreibt Anforderungen an die klinische Bewertung von Medizinprodukten '
+        'nach MDR und den Nachweis der Leistungsfähigkeit über den gesamten Lebenszyklus. ',
+        'The manufacturer shall establish a quality management system according to ISO 13485 '
+        'and document the risk management process in line with ISO 14971. ',
+        'Annex II lists the technical documentation that has to be kept available for the '
+        'competent authorities for a period of at least ten years. ',
+        'Updated requirements for post market surveillance become mandatory after the '
+        'transition deadline; existing certificates remain valid until then. ',
+        'Hersteller müssen die Konformität ihrer Software mit IEC 62304 nachweisen und '
+        'Änderungen an der Zweckbestimmung der benannten Stelle melden. ',
+    ]
+    text = ''.join(paragraphs)
+    return [text * repeat for repeat in (10, 100, 1000)]
+
+
+def _sample_entity_texts(paths: Optional[List[str]]) -> List[str]:
+    """Inhalte der angegebenen Textdateien bzw. synthetische Texte mit vielen Entitäten"""
+    if paths:
+        return _read_documents(paths)
+    text = ('Die Verordnung (EU) 2017/745 gilt seit dem 26. Mai 2021; die Übergangsfrist für '
+            'Bestandsprodukte wurde verlängert. Hersteller weisen die Konformität mit ISO 13485:2016 '
+            'und IEC 60601-1 nach. The FDA guidance on 21 CFR Part 820 was updated on March 12, 2024 '
+            'and becomes effective from 02/02/2026. Die Anforderungen der klinischen Bewertung '
+            'bleiben unverändert; weitere Hinweise enthält das Dokument vom 12.03.2024. ')
+    return [text * repeat for repeat in (10, 100, 1000)]
+
+
+def _sample_pages(archive_path: Optional[str]) -> List[Dict]:
+    """Text und Meta-Tags der HTML-Seiten eines Fixture-Archivs bzw. synthetische Seiten"""
+    from .extraction import ContentRules, extract_document
+
+    if not archive_path:
+        paragraph = ('Die Leitlinie beschreibt Anforderungen an die klinische Bewertung von '
+                     'Medizinprodukten nach MDR und den Nachweis der Leistungsfähigkeit. ')
+        pages = []
+        for size in (5, 50, 500):
+            # Datum nur am Ende: schlechtester Fall für die alte Suche über den gesamten Text
+            text = paragraph * size + 'Stand: 12.03.2024'
+            pages.append({'text': text, 'meta': {'description': 'Leitlinie'}})
+        return pages
+
+    from .replay import FixtureArchive
+    fixtures = FixtureArchive.load(archive_path)
+    pages = []
+    for key in fixtures.entries:
+        response = fixtures.get(key)
+        if not response['headers'].get('Content-Type', '').startswith('text/html'):
+            continue
+        page = extract_document(response['content'], encoding=response['encoding'], rules=ContentRules())
+        pages.append({'text': ' '.join(page['text'].split()), 'meta': page['meta']})
+    return pages
+
+
+def _fastest_ms(function, *args, rounds: int = 5) -> float:
+    """Schnellster von ``rounds`` Durchläufen in Millisekunden"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def keyword_benchmark(paths: Optional[List[str]] = None, rounds: int = 5) -> List[Dict]:
+    """Vergleicht die bisherige Keyword-Suche mit ``KeywordMatcher`` (Millisekunden pro Dokument)"""
+    matcher = KeywordMatcher(ANALYZER_TABLES)
+    medical = {f'medical:{category}': 1 for category in MEDICAL_KEYWORDS}
+    sentence_weights = matcher.weights({**medical, 'change': 2})
+    document_weights = matcher.weights({**medical, 'high_importance': 2})
+
+    def legacy(content: str, sentences: List[str]) -> Dict:
+        result = _legacy_document_score(content)
+        result['sentences'] = _legacy_sentence_scores(sentences)
+        return result
+
+    def automaton(content: str, sentences: List[str]) -> Dict:
+        hits = matcher.scan(content)
+        return {
+            'score': hits.score(document_weights),
+            'topics': [topic for topic in TOPIC_KEYWORDS if hits.any(f'topic:{topic}')],
+            'sentences': [sentence_hits.score(sentence_weights, distinct=True)
+                          for sentence_hits in matcher.scan_each(sentences)]
+        }
+
+    results = []
+    for content in _sample_guidelines(paths):
+        # Satzaufteilung wie der Analyzer ohne spaCy-Modell
+        sentences = [sentence.strip() for sentence in re.split(r'[.!?]+', content) if len(sentence.strip()) > 10]
+        legacy_ms = _fastest_ms(legacy, content, sentences, rounds=rounds)
+        automaton_ms = _fastest_ms(automaton, content, sentences, rounds=rounds)
+        results.append({
+            'kb': round(len(content) / 1024, 1),
+            'sentences': len(sentences),
+            'legacy_ms': legacy_ms,
+            'automaton_ms': automaton_ms,
+            'speedup': round(legacy_ms / automaton_ms, 1),
+            'identical': legacy(content, sentences) == automaton(content, sentences)
+        })
+    return results
+
+
+def entity_benchmark(paths: Optional[List[str]] = None, rounds: int = 5) -> List[Dict]:
+    """Vergleicht die bisherigen Einzelmuster mit ``extract_entities`` (Millisekunden pro Dokument)"""
+    results = []
+    for text in _sample_entity_texts(paths):
+        legacy_ms = _fastest_ms(_legacy_extract_entities, text, rounds=rounds)
+        fused_ms = _fastest_ms(extract_entities, text, rounds=rounds)
+        entities = extract_entities(text)
+        results.append({
+            'kb': round(len(text) / 1024, 1),
+            'legacy_ms': legacy_ms,
+            'fused_ms': fused_ms,
+            'speedup': round(legacy_ms / fused_ms, 1),
+            'entities': {entity_type: len(values) for entity_type, values in sorted(entities.items())}
+        })
+    return results
+
+
+def metadata_benchmark(archive_path: Optional[str] = None, scan_kb: float = 16, rounds: int = 20) -> Dict:
+    """Vergleicht die bisherige Datumssuche mit ``MetadataExtractor`` (Mikrosekunden pro Seite)"""
+    pages = _sample_pages(archive_path)
+    if not pages:
+        raise ValueError('Keine HTML-Seiten im Archiv')
+    extractor = MetadataExtractor(scan_kb=scan_kb)
+    full_scan = MetadataExtractor(scan_kb=None)
+
+    def measure(function) -> float:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for page in pages:
+                function(page)
+        return (time.perf_counter() - start) / (rounds * len(pages)) * 1_000_000
+
+    results = {
+        'pages': len(pages),
+        'avg_text_kb': round(sum(len(page['text']) for page in pages) / len(pages) / 1024, 1),
+        'legacy_us': measure(lambda page: _legacy_extract_dates(page['text'])),
+        'full_scan_us': measure(lambda page: full_scan.find_dates(page['text'], page['meta'])),
+        'head_scan_us': measure(lambda page: extractor.find_dates(page['text'], page['meta'])),
+    }
+    results['speedup'] = round(results['legacy_us'] / results['head_scan_us'], 1)
+    return results
+
+
+def sentence_benchmark(model: str = 'de_core_news_sm', paths: Optional[List[str]] = None, documents: int = 200,
+                       n_process: int = 2, batch_size: int = 16) -> List[Dict]:
+    """Durchsatz der Satzaufteilung in Dokumenten pro Sekunde.
+
+    Vergleicht den bisherigen Pfad (komplette Pipeline, ein ``nlp(text)`` je
+    Dokument) mit der gekürzten Pipeline, einzeln und gebündelt über
+    ``nlp.pipe`` mit einem bzw. ``n_process`` Prozessen.
+    """
+    import spacy
+
+    texts = _sample_guidelines(paths) if paths else [_sample_guidelines(None)[0]] * documents
+    full = spacy.load(model)
+    trimmed = load_sentence_pipeline(model)
+
+    def sentences(docs) -> List[List[str]]:
+        return [[sent.text.strip() for sent in doc.sents if len(sent.text.strip()) > 10] for doc in docs]
+
+    variants = [
+        (f'komplett, einzeln ({", ".join(full.pipe_names)})', lambda: sentences(full(text) for text in texts)),
+        (f'gekürzt, einzeln ({", ".join(trimmed.pipe_names)})', lambda: sentences(trimmed(text) for text in texts)),
+        ('gekürzt, nlp.pipe', lambda: sentences(trimmed.pipe(texts, batch_size=batch_size))),
+        (f'gekürzt, nlp.pipe, {n_process} Prozesse',
+         lambda: sentences(trimmed.pipe(texts, batch_size=batch_size, n_process=n_process))),
+    ]
+    results = []
+    baseline = None
+    for name, run in variants:
+        start = time.perf_counter()
+        run()
+        docs_per_second = len(texts) / (time.perf_counter() - start)
+        baseline = baseline or docs_per_second
+        results.append({'variant': name, 'docs_per_second': docs_per_second,
+                        'speedup': round(docs_per_second / baseline, 1)})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m medtech_newsletter.benchmarks',
+                                     description='Micro-Benchmarks der Analyse- und Extraktionspfade')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in (('keywords', 'Keyword-Suche des Analyzers'),
+                            ('entities', 'Entitäten-Extraktion')):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('files', nargs='*', help='Textdateien (Standard: synthetische Leitlinien)')
+        command.add_argument('--rounds', type=int, default=5)
+
+    metadata = commands.add_parser('metadata', help='Metadaten-Extraktion')
+    metadata.add_argument('archive', nargs='?', help='Fixture-Archiv aus "replay record"')
+    metadata.add_argument('--scan-kb', type=float, default=16)
+    metadata.add_argument('--rounds', type=int, default=20)
+
+    sentences = commands.add_parser('sentences', help='Durchsatz der spaCy-Satzaufteilung des Analyzers')
+    sentences.add_argument('files', nargs='*', help='Textdateien (Standard: synthetische Leitlinien)')
+    sentences.add_argument('--model', default='de_core_news_sm', help='Name oder Pfad des spaCy-Modells')
+    sentences.add_argument('--documents', type=int, default=200)
+    sentences.add_argument('--processes', type=int, default=2)
+    sentences.add_argument('--batch-size', type=int, default=16)
+
+    args = parser.parse_args(argv)
+    if args.command == 'keywords':
+        print(f"{'KB':>8} {'Sätze':>7} {'bisher ms':>10} {'Automat ms':>11} {'Faktor':>7}  identisch")
+        for result in keyword_benchmark(args.files, rounds=args.rounds):
+            print(f"{result['kb']:>8} {result['sentences']:>7} {result['legacy_ms']:>10.2f} "
+                  f"{result['automaton_ms']:>11.2f} {result['speedup']:>6}x  {result['identical']}")
+    elif args.command == 'entities':
+        print(f"{'KB':>8} {'bisher ms':>10} {'fusioniert ms':>14} {'Faktor':>7}  Entitäten")
+        for result in entity_benchmark(args.files, rounds=args.rounds):
+            print(f"{result['kb']:>8} {result['legacy_ms']:>10.2f} {result['fused_ms']:>14.2f} "
+                  f"{result['speedup']:>6}x  {result['entities']}")
+    elif args.command == 'metadata':
+        results = metadata_benchmark(args.archive, scan_kb=args.scan_kb, rounds=args.rounds)
+        print(f"{results['pages']} Seiten, Ø {results['avg_text_kb']} KB Text")
+        print(f"Bisher (4 Muster, gesamter Text): {results['legacy_us']:8.1f} µs/Seite")
+        print(f"Neu, gesamter Text:               {results['full_scan_us']:8.1f} µs/Seite")
+        print(f"Neu, erste {args.scan_kb:g} KB:                 {results['head_scan_us']:8.1f} µs/Seite "
+              f"({results['speedup']}x)")
+    else:
+        for result in sentence_benchmark(args.model, args.files, documents=args.documents,
+                                         n_process=args.processes, batch_size=args.batch_size):
+            print(f"{result['docs_per_second']:>10.1f} Dok./s {result['speedup']:>6}x  {result['variant']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Pool wiederverwendbarer Headless-Browser für dynamische Quellen."""
+import atexit
+import queue
+import threading
+from typing import Callable
+
+from loguru import logger
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+class _BrowserWorker:
+    """Ein langlebiger WebDriver samt Zähler der gerenderten Seiten"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.debug(f"Fehler beim Beenden des WebDrivers: {e}")
+
+
+class BrowserPool:
+    """Stellt bis zu ``size`` Browser bereit, die über Seiten und Läufe hinweg
+    wiederverwendet werden.
+
+    Browser werden erst bei Bedarf gestartet und nach ``max_pages_per_worker``
+    Seiten neu gestartet, um Speicherwachstum zu begrenzen. Statt fester
+    Pausen wird gewartet, bis die Seite geladen ist und ``wait_for``
+    (CSS-Selektor) im DOM auftaucht.
+    """
+
+    def __init__(self, driver_factory: Callable, size: int = 2,
+                 max_pages_per_worker: int = 50, page_timeout: float = 20):
+        self.driver_factory = driver_factory
+        self.size = size
+        self.max_pages_per_worker = max_pages_per_worker
+        self.page_timeout = page_timeout
+        self._slots = queue.Queue()
+        self._workers = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(size):
+            self._slots.put(None)  # Platzhalter für einen noch nicht gestarteten Browser
+        atexit.register(self.close)
+
+    def _acquire(self) -> _BrowserWorker:
+        worker = self._slots.get()
+        if worker is None:
+            try:
+                worker = _BrowserWorker(self.driver_factory())
+            except Exception:
+                self._slots.put(None)
+                raise
+            with self._lock:
+                self._workers.add(worker)
+            logger.info("Headless-Browser gestartet")
+        return worker
+
+    def _release(self, worker: _BrowserWorker, healthy: bool = True):
+        if not healthy or self._closed or worker.pages >= self.max_pages_per_worker:
+            if healthy and not self._closed:
+                logger.info(f"Headless-Browser nach {worker.pages} Seiten recycelt")
+            self._discard(worker)
+            self._slots.put(None)
+        else:
+            self._slots.put(worker)
+
+    def _discard(self, worker: _BrowserWorker):
+        with self._lock:
+            self._workers.discard(worker)
+        worker.quit()
+
+    def render(self, url: str, wait_for: str = 'a[href]') -> str:
+        """Lädt eine Seite im Browser und gibt das gerenderte HTML zurück"""
+        if self._closed:
+            raise RuntimeError("BrowserPool wurde bereits geschlossen")
+
+        worker = self._acquire()
+        healthy = True
+        try:
+            worker.driver.get(url)
+            worker.pages += 1
+            try:
+                WebDriverWait(worker.driver, self.page_timeout).until(
+                    lambda driver: driver.execute_script('return document.readyState') == 'complete'
+                    and driver.find_elements(By.CSS_SELECTOR, wait_for)
+                )
+            except TimeoutException:
+                logger.warning(f"Seite {url} nach {self.page_timeout}s nicht vollständig geladen, "
+                               f"verwende aktuellen Stand")
+            return worker.driver.page_source
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            self._release(worker, healthy)
+
+    def close(self):
+        """Beendet alle Browser des Pools"""
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.quit()
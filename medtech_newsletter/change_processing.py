@@ -0,0 +1,347 @@
+"""Parallele Änderungsanalyse und gebündeltes Schreiben der Scraping-Ergebnisse."""
+import atexit
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from .analysis_cache import AnalysisCache
+from .analyzer import DocumentAnalyzer
+from .extensions import db
+from .models import Document, DocumentChange, DocumentValidator
+from .urls import url_fingerprint
+
+# Zusammenfassung gespeicherter Änderungen; die vorherige Version liegt nur als Hash vor
+CHANGE_SUMMARY = 'Dokument geändert'
+
+# Analyzer des Worker-Prozesses, wird von ``_init_worker`` einmal geladen
+_worker_analyzer: Optional[DocumentAnalyzer] = None
+
+
+def _init_worker():
+    global _worker_analyzer
+    _worker_analyzer = DocumentAnalyzer()
+
+
+def analyze_content(analyzer: DocumentAnalyzer, content: str) -> Dict:
+    """Schlüsselinformationen eines geladenen Inhalts für den ``AnalysisCache``.
+
+    Einen Vergleich mit der vorherigen Version gibt es nicht: gespeichert
+    wird nur deren Hash, nicht der Inhalt. Die Wichtigkeit einer Änderung
+    ist daher die ``importance_score`` der neuen Version.
+    """
+    return analyzer.extract_key_information(content, {})
+
+
+def analyze_in_worker(content: str) -> Dict:
+    """Läuft im Worker-Prozess, daher eine Funktion auf Modulebene"""
+    return analyze_content(_worker_analyzer, content)
+
+
+class ChangeAnalysisPool:
+    """Analysiert geänderte Dokumente in bis zu ``max_workers`` Hintergrundprozessen.
+
+    Jeder Worker erzeugt seinen Analyzer einmal beim Start; der
+    Pool wird erst bei der ersten Änderung gestartet und bleibt über Läufe
+    hinweg bestehen. Mit ``max_workers=0`` analysiert ``analyzer`` im
+    aufrufenden Thread.
+    """
+
+    def __init__(self, max_workers: int = 2, analyzer: Optional[DocumentAnalyzer] = None):
+        self.max_workers = max_workers
+        self.analyzer = analyzer
+        self._executor: Optional[ProcessPoolExecutor] = None
+        atexit.register(self.close)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Kein fork: der Scheduler-Prozess hat Threads und offene Datenbankverbindungen
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+            logger.info(f"Analyse-Worker-Pool mit {self.max_workers} Prozessen gestartet")
+        return self._executor
+
+    def submit(self, content: str) -> Future:
+        """Plant die Analyse eines Inhalts ein (siehe ``analyze_content``); das Ergebnis liefert das ``Future``"""
+        if not self.max_workers:
+            future = Future()
+            try:
+                future.set_result(analyze_content(self.analyzer, content))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        try:
+            return self._get_executor().submit(analyze_in_worker, content)
+        except BrokenProcessPool:
+            logger.error("Analyse-Worker-Pool abgestürzt, wird neu gestartet")
+            self.close()
+            return self._get_executor().submit(analyze_in_worker, content)
+
+    def close(self, wait: bool = False):
+        """Beendet die Worker-Prozesse; mit ``wait`` erst, wenn sie sich beendet haben"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+class ScrapeResultWriter:
+    """Einziger Schreiber der Ergebnisse eines Scraping-Laufs.
+
+    Der Scraper läuft in einem eigenen Thread und übergibt Frontier und
+    Dokumente über ``on_frontier``/``on_document`` an eine Queue, sodass
+    Datenbankzugriffe die Event-Loop nicht mehr blockieren. Der Writer
+    arbeitet im Thread des Aufrufers, dem die Datenbank-Session gehört, und
+    schreibt jeweils bis zu ``batch_size`` Dokumente mit gemeinsamen
+    Abfragen. Inhalte ohne Eintrag im ``AnalysisCache`` gehen an den
+    ``ChangeAnalysisPool``; ihre URL wird erst mit dem Analyseergebnis im
+    Journal abgeschlossen und eine Änderung erst dann gespeichert, sodass
+    ein abgebrochener Lauf sie erneut lädt.
+    """
+
+    def __init__(self, journal, analysis_pool: ChangeAnalysisPool, documents: Dict[str, str],
+                 validators: Dict[str, DocumentValidator], batch_size: int = 20,
+                 analysis_cache: Optional[AnalysisCache] = None, heartbeat_poll: float = 5.0):
+        self.journal = journal
+        self.analysis_pool = analysis_pool
+        # Gespeicherte URLs stammen teils aus der Zeit vor der URL-Normalisierung
+        # der Frontier; daher wird über ``url_fingerprint`` verglichen
+        self.documents = {url_fingerprint(url): content_hash for url, content_hash in documents.items()}
+        self._stored_urls = {url_fingerprint(url): url for url in documents}
+        self.validators = {url_fingerprint(url): validator for url, validator in validators.items()}
+        self.batch_size = batch_size
+        self.analysis_cache = analysis_cache or AnalysisCache()
+        # Wartet höchstens so lange, damit der Heartbeat des Journals nicht ausbleibt
+        self.heartbeat_poll = heartbeat_poll
+        self.counts = {'new': 0, 'changed': 0, 'unchanged': 0, 'deferred': 0, 'failed': 0, 'analyzed': 0}
+        self._queue = queue.Queue()
+        # (Future, Eintrag, Dokument, ob dieser Eintrag die Analyse eingeplant hat)
+        self._pending: List[Tuple[Future, Dict, Dict, bool]] = []
+        # Analysen dieses Laufs je Hash; gleiche Inhalte warten auf dasselbe Future
+        self._analyzing: Dict[str, Future] = {}
+        self._aborted = threading.Event()
+
+    def on_frontier(self, entries: List[Dict]):
+        self._put('frontier', entries)
+
+    def on_document(self, entry: Dict, doc_data: Optional[Dict]):
+        self._put('document', (entry, doc_data))
+
+    def _put(self, kind: str, payload):
+        if self._aborted.is_set():
+            # Bricht den Scraper ab, wenn der Writer nicht mehr schreiben kann
+            raise RuntimeError('Ergebnisse können nicht mehr gespeichert werden')
+        self._queue.put((kind, payload))
+
+    def run(self, scrape: Callable):
+        """Führt ``scrape(on_frontier, on_document)`` in einem eigenen Thread aus und schreibt dessen Ergebnisse.
+
+        Kehrt zurück, wenn der Scraper fertig und alle Analysen geschrieben
+        sind; Fehler des Scrapers oder des Writers werden weitergereicht.
+        """
+        outcome = {}
+
+        def target():
+            try:
+                scrape(self.on_frontier, self.on_document)
+            except Exception as e:
+                outcome['error'] = e
+            finally:
+                self._queue.put(('done', None))
+
+        thread = threading.Thread(target=target, name='scraper', daemon=True)
+        thread.start()
+        try:
+            self._write_until_done()
+        except Exception:
+            self._aborted.set()
+            thread.join()
+            raise
+        thread.join()
+        if 'error' in outcome:
+            raise outcome['error']
+
+    def _write_until_done(self):
+        done = False
+        while not done or self._pending:
+            batch = self._next_batch(done)
+            documents = []
+            for kind, payload in batch:
+                if kind == 'frontier':
+                    self.journal.record_frontier(payload)
+                elif kind == 'document':
+                    documents.append(payload)
+                else:
+                    done = True
+            if documents:
+                self._write_documents(documents)
+            self._write_analyses()
+            self.journal.heartbeat()
+
+    def _next_batch(self, done: bool) -> List:
+        """Wartet auf neue Ergebnisse des Scrapers oder auf fertige Analysen"""
+        if done:
+            wait([future for future, _, _, _ in self._pending], timeout=self.heartbeat_poll, return_when=FIRST_COMPLETED)
+            return []
+        try:
+            batch = [self._queue.get(timeout=0.1 if self._pending else self.heartbeat_poll)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _store_validators(self, doc_data: Dict):
+        """Speichert ETag/Last-Modified eines geladenen Dokuments für bedingte Requests"""
+        etag = doc_data.get('etag')
+        last_modified = doc_data.get('last_modified')
+        key = url_fingerprint(doc_data['url'])
+        validator = self.validators.get(key)
+        if not etag and not last_modified:
+            if validator:
+                db.session.delete(validator)
+                del self.validators[key]
+            return
+        if not validator:
+            validator = DocumentValidator(url=doc_data['url'])
+            db.session.add(validator)
+            self.validators[key] = validator
+        validator.etag = etag
+        validator.last_modified = last_modified
+        validator.updated_at = datetime.utcnow()
+
+    def _write_documents(self, items: List):
+        """Schreibt neue Dokumente, Prüfzeitpunkte und Änderungen; noch nicht analysierte Inhalte gehen zur Analyse"""
+        now = datetime.utcnow()
+        unchanged = []
+        changes = []
+        processed = []
+        cached = self.analysis_cache.lookup(doc_data['content_hash'] for _, doc_data in items
+                                            if doc_data and 'content' in doc_data)
+        for entry, doc_data in items:
+            if doc_data is None:
+                processed.append((entry['url'], 'failed'))
+                self.counts['failed'] += 1
+                continue
+            if doc_data.get('deferred'):
+                # Host gestört (Circuit Breaker offen): im nächsten Lauf erneut versuchen
+                processed.append((entry['url'], 'deferred'))
+                self.counts['deferred'] += 1
+                continue
+            url = doc_data['url']
+            key = url_fingerprint(url)
+            if doc_data.get('not_modified'):
+                # 304 Not Modified: nur last_checked aktualisieren, kein Download und kein Hash
+                unchanged.append(self._stored_urls.get(key, url))
+                processed.append((entry['url'], 'done'))
+                continue
+            if 'content' not in doc_data:
+                logger.warning(f"Kein Inhalt für {url} vom Scraper geliefert, Dokument übersprungen")
+                processed.append((entry['url'], 'done'))
+                continue
+
+            content_hash = doc_data['content_hash']
+            if key not in self.documents:
+                db.session.add(Document(source=doc_data['source'], url=url, title=doc_data['title'],
+                                        content_hash=content_hash, last_checked=now))
+                self.documents[key] = content_hash
+                self._stored_urls[key] = url
+                self.counts['new'] += 1
+                logger.info(f"Neues Dokument gefunden: {doc_data['title']}")
+            elif self.documents[key] == content_hash:
+                # Unverändert; der Prüfzeitpunkt bestimmt den nächsten fälligen Besuch
+                unchanged.append(self._stored_urls[key])
+            analysis = cached.get(content_hash)
+            if analysis is None:
+                # Jede Inhaltsversion wird genau einmal analysiert, auch bereits bekannte
+                # Dokumente, deren Inhalt noch nicht im Cache liegt
+                self._submit(entry, doc_data)
+            elif self.documents[key] != content_hash:
+                changes.append((entry, doc_data, analysis.importance_score))
+            else:
+                self._store_validators(doc_data)
+                processed.append((entry['url'], 'done'))
+
+        if unchanged:
+            Document.query.filter(Document.url.in_(unchanged)).update(
+                {'last_checked': now}, synchronize_session=False
+            )
+            self.counts['unchanged'] += len(unchanged)
+        for url, status in processed:
+            self.journal.record_document(url, status)
+        self._write_changes(changes)
+
+    def _submit(self, entry: Dict, doc_data: Dict):
+        # ETag/Last-Modified werden erst mit dem Analyseergebnis gespeichert
+        # (siehe _write_analyses); scheitert die Analyse oder bricht der Lauf
+        # ab, lädt der nächste Lauf den Inhalt vollständig statt eines 304
+        content_hash = doc_data['content_hash']
+        future = self._analyzing.get(content_hash)
+        owner = future is None
+        if owner:
+            future = self._analyzing[content_hash] = self.analysis_pool.submit(doc_data['content'])
+        self._pending.append((future, entry, doc_data, owner))
+
+    def _write_analyses(self):
+        """Schreibt die Ergebnisse aller fertigen Analysen und die davon abhängigen Änderungen"""
+        finished = [pending for pending in self._pending if pending[0].done()]
+        if not finished:
+            return
+        self._pending = [pending for pending in self._pending if not pending[0].done()]
+        changes = []
+        for future, entry, doc_data, owner in finished:
+            url = doc_data['url']
+            content_hash = doc_data['content_hash']
+            try:
+                info = future.result()
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    if owner:
+                        logger.error(f"Analyse-Worker-Pool bei {url} abgestürzt, wird neu gestartet")
+                        self.analysis_pool.close()
+                elif owner:
+                    logger.error(f"Fehler bei der Analyse von {url}: {e}")
+                # Beim nächsten Laden des Inhalts erneut analysieren
+                self._analyzing.pop(content_hash, None)
+                self.journal.record_document(entry['url'], 'failed')
+                self.counts['failed'] += 1
+                continue
+
+            if owner:
+                self.analysis_cache.store(content_hash, info)
+                self.counts['analyzed'] += 1
+            if self.documents[url_fingerprint(url)] != content_hash:
+                changes.append((entry, doc_data, info['importance_score']))
+            else:
+                self._store_validators(doc_data)
+                self.journal.record_document(entry['url'])
+        self._write_changes(changes)
+
+    def _write_changes(self, changes: List[Tuple[Dict, Dict, int]]):
+        """Schreibt Änderungen bekannter Dokumente mit einer gemeinsamen Abfrage"""
+        if not changes:
+            return
+        keys = [url_fingerprint(doc_data['url']) for _, doc_data, _ in changes]
+        documents = {document.url: document for document in Document.query.filter(
+            Document.url.in_([self._stored_urls[key] for key in keys])
+        )}
+        now = datetime.utcnow()
+        for key, (entry, doc_data, importance_score) in zip(keys, changes):
+            document = documents[self._stored_urls[key]]
+            db.session.add(DocumentChange(document_id=document.id, change_summary=CHANGE_SUMMARY,
+                                          importance_score=importance_score,
+                                          content_hash=doc_data['content_hash']))
+            document.content_hash = doc_data['content_hash']
+            document.last_checked = now
+            self.documents[key] = doc_data['content_hash']
+            self._store_validators(doc_data)
+            self.counts['changed'] += 1
+            logger.info(f"Änderung im Dokument gefunden: {doc_data['title']}")
+            self.journal.record_document(entry['url'])
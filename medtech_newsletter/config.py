@@ -26,37 +26,161 @@ class Config:
     SCRAPING_INTERVAL_HOURS = int(os.environ.get("SCRAPING_INTERVAL_HOURS") or 24)
     NEWSLETTER_GENERATION_INTERVAL_HOURS = int(os.environ.get("NEWSLETTER_GENERATION_INTERVAL_HOURS") or 168)  # Wöchentlich
     
-    # NEUE, FOKUSSIERTE QUELLEN-KONFIGURATION
+    # Adaptive Besuchsintervalle je Quelle und Dokument aus der Änderungshistorie;
+    # SCRAPING_INTERVAL_HOURS ist dann das Startintervall ohne Historie
+    SCRAPING_ADAPTIVE = os.environ.get("SCRAPING_ADAPTIVE", "true").lower() in ["true", "on", "1"]
+    SCRAPING_MIN_INTERVAL_HOURS = float(os.environ.get("SCRAPING_MIN_INTERVAL_HOURS") or 2)
+    SCRAPING_MAX_INTERVAL_HOURS = float(os.environ.get("SCRAPING_MAX_INTERVAL_HOURS") or 336)
+    SCRAPING_CHANGE_WINDOW_DAYS = int(os.environ.get("SCRAPING_CHANGE_WINDOW_DAYS") or 90)
+    
+    # Parallelität der Fetch-Engine (global und pro Host)
+    FETCH_MAX_CONCURRENCY = int(os.environ.get("FETCH_MAX_CONCURRENCY") or 20)
+    FETCH_PER_HOST_CONCURRENCY = int(os.environ.get("FETCH_PER_HOST_CONCURRENCY") or 4)
+    
+    # Wiederholungen mit exponentiellem Backoff (Versuche je Request, Budget je Lauf)
+    # und Circuit Breaker je Host (Fehler in Folge, Sekunden bis zum Probe-Request)
+    FETCH_RETRY_ATTEMPTS = int(os.environ.get("FETCH_RETRY_ATTEMPTS") or 3)
+    FETCH_RETRY_BUDGET = int(os.environ.get("FETCH_RETRY_BUDGET") or 100)
+    FETCH_RETRY_BASE_DELAY = float(os.environ.get("FETCH_RETRY_BASE_DELAY") or 1.0)
+    FETCH_RETRY_MAX_DELAY = float(os.environ.get("FETCH_RETRY_MAX_DELAY") or 60.0)
+    CIRCUIT_BREAKER_THRESHOLD = int(os.environ.get("CIRCUIT_BREAKER_THRESHOLD") or 5)
+    CIRCUIT_BREAKER_RESET_SECONDS = float(os.environ.get("CIRCUIT_BREAKER_RESET_SECONDS") or 300)
+    
+    # ScraperAPI: gleichzeitige Requests laut Tarif und Timeouts ohne/mit Rendering
+    SCRAPERAPI_CONCURRENCY = int(os.environ.get("SCRAPERAPI_CONCURRENCY") or 5)
+    SCRAPERAPI_TIMEOUT = float(os.environ.get("SCRAPERAPI_TIMEOUT") or 70)
+    SCRAPERAPI_RENDER_TIMEOUT = float(os.environ.get("SCRAPERAPI_RENDER_TIMEOUT") or 180)
+    
+    # Checkpoints: Commit alle N Dokumente, abgebrochene Läufe bis zu N Stunden fortsetzen
+    SCRAPING_CHECKPOINT_EVERY = int(os.environ.get("SCRAPING_CHECKPOINT_EVERY") or 20)
+    SCRAPING_RESUME_HOURS = int(os.environ.get("SCRAPING_RESUME_HOURS") or 12)
+    
+    # Worker-Prozesse für die Analyse geänderter Dokumente (0: im Scraping-Thread)
+    SCRAPING_ANALYSIS_WORKERS = int(os.environ.get("SCRAPING_ANALYSIS_WORKERS") or 2)
+    
+    # spaCy-Modell schon beim Start der App laden statt bei der ersten Analyse;
+    # mit gunicorn --preload (siehe gunicorn.conf.py) einmal im Master für alle Worker
+    NLP_PRELOAD = os.environ.get("NLP_PRELOAD", "false").lower() in ["true", "on", "1"]
+    
+    # Standard-Ratenlimit pro Host (Requests pro Sekunde, Burst-Größe)
+    SCRAPING_DEFAULT_RATE_LIMIT = {
+        "rate": float(os.environ.get("SCRAPING_DEFAULT_RATE") or 1.0),
+        "burst": int(os.environ.get("SCRAPING_DEFAULT_BURST") or 3)
+    }
+    
+    # Connection-Pool der Fetch-Engine (0: Verbindungen je Host nur durch
+    # FETCH_MAX_CONCURRENCY begrenzt) und Keep-Alive-Dauer in Sekunden
+    HTTP_POOL_PER_HOST = int(os.environ.get("HTTP_POOL_PER_HOST") or 8)
+    HTTP_KEEPALIVE_SECONDS = float(os.environ.get("HTTP_KEEPALIVE_SECONDS") or 30)
+    
+    # Größenlimit für Dokumente; einzelne Quellen können es mit "max_document_mb" überschreiben
+    SCRAPING_MAX_DOCUMENT_MB = float(os.environ.get("SCRAPING_MAX_DOCUMENT_MB") or 10)
+    
+    # Worker-Prozesse und Seitenlimit für die PDF-Textextraktion
+    PDF_WORKERS = int(os.environ.get("PDF_WORKERS") or 2)
+    PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES") or 200)
+    
+    # Datumsangaben werden nur in den Meta-Tags und den ersten KB des Dokumenttexts gesucht
+    SCRAPING_METADATA_SCAN_KB = float(os.environ.get("SCRAPING_METADATA_SCAN_KB") or 16)
+    
+    # Lokaler HTTP-Antwort-Cache des Scrapers für Entwicklung und Mitschnitte,
+    # z.B. ".cache/http"; standardmäßig aus, da er bis zu HTTP_CACHE_TTL_HOURS
+    # alte Inhalte liefert und Änderungen verdecken kann
+    HTTP_CACHE_DIR = os.environ.get("HTTP_CACHE_DIR", "")
+    HTTP_CACHE_TTL_HOURS = float(os.environ.get("HTTP_CACHE_TTL_HOURS") or 6)
+    HTTP_CACHE_MAX_MB = int(os.environ.get("HTTP_CACHE_MAX_MB") or 500)
+    
+    # Pool wiederverwendbarer Headless-Browser für dynamische Quellen
+    BROWSER_POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE") or 2)
+    BROWSER_MAX_PAGES_PER_WORKER = int(os.environ.get("BROWSER_MAX_PAGES_PER_WORKER") or 50)
+    
+    # Quellen-Konfiguration; die Schlüssel beschreibt sources.SourceAdapter
     SOURCES = {
-        "G-BA": {
-            "base_url": "https://www.g-ba.de",
+        "FDA": {
+            "base_url": "https://www.fda.gov",
             "search_paths": [
-                "/presse/pressemitteilungen/"
-            ]
+                "/medical-devices/device-regulation-and-guidance",
+                "/medical-devices/guidance-documents-medical-devices-and-radiation-emitting-products"
+            ],
+            "feeds": ["/sitemap.xml"],
+            "url_prefixes": [
+                "/medical-devices/guidance-documents-medical-devices-and-radiation-emitting-products/",
+                "/regulatory-information/search-fda-guidance-documents/"
+            ],
+            "keywords": ["guidance", "regulation", "standard", "requirement", "device"],
+            "fetch": "plain"
         },
         "BfArM": {
             "base_url": "https://www.bfarm.de",
             "search_paths": [
                 "/DE/Medizinprodukte/_node.html"
-            ]
+            ],
+            "max_document_mb": 25,
+            "feeds": ["/SiteGlobals/Functions/RSSFeed/DE/RSSNewsfeed/RSSNewsfeed.xml"],
+            "keywords": ["richtlinie", "verordnung", "leitfaden", "norm", "medizinprodukt"],
+            "fetch": "proxy",
+            "render": "auto"
+        },
+        "ISO": {
+            "base_url": "https://www.iso.org",
+            "search_paths": [
+                "/committee/54892.html",  # ISO/TC 210 Quality management and corresponding general aspects for medical devices
+                "/committee/54808.html"   # ISO/TC 194 Biological and clinical evaluation of medical devices
+            ],
+            "keywords": ["iso", "standard", "medical", "device", "quality"],
+            "fetch": "plain",
+            "browser_fallback": True,
+            "concurrency": 1,
+            "rate_limit": {"rate": 0.5, "burst": 1}
+        },
+        "TUV": {
+            "base_url": "https://www.tuv.com",
+            "search_paths": [
+                "/world/en/services/testing/medical-devices-testing.html"
+            ],
+            "keywords": ["medical", "device", "testing", "certification", "standard"],
+            "fetch": "plain"
+        },
+        "G-BA": {
+            "base_url": "https://www.g-ba.de",
+            "search_paths": [
+                "/presse/pressemitteilungen/"
+            ],
+            "fetch": "proxy",
+            "render": "auto",
+            "premium": True,
+            "concurrency": 2,
+            "max_document_mb": 5,
+            "rate_limit": {"rate": 0.5, "burst": 2}
         },
         "BVMed": {
             "base_url": "https://www.bvmed.de",
             "search_paths": [
                 "/de/bvmed/presse/pressemeldungen"
-            ]
+            ],
+            "feeds": ["/sitemap.xml"],
+            "url_prefixes": ["/de/bvmed/presse/pressemeldungen/"],
+            "fetch": "proxy",
+            "render": "auto"
         },
         "MDCG": {
             "base_url": "https://health.ec.europa.eu",
             "search_paths": [
                 "/medical-devices-sector/new-regulations/guidance-mdcg-endorsed-documents-and-other-guidance_en"
-            ]
+            ],
+            "feeds": ["/sitemap.xml"],
+            "url_prefixes": ["/medical-devices-sector/new-regulations/"],
+            "fetch": "proxy",
+            "render": "auto"
         },
         "MedTechEurope": {
             "base_url": "https://www.medtecheurope.org",
             "search_paths": [
                 "/news-and-events/press-releases/"
-            ]
+            ],
+            "feeds": ["/feed/"],
+            "fetch": "proxy",
+            "render": "auto"
         }
     }
     
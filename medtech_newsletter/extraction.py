@@ -0,0 +1,281 @@
+"""Schnelle HTML-Extraktion von Links, Meta-Tags und Text ohne Dokumentbaum."""
+import codecs
+import re
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from lxml import etree
+
+# Inhalte dieser Elemente sind kein sichtbarer Text
+SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'svg', 'head'}
+
+# An Grenzen dieser Elemente wird ein Leerzeichen eingefügt, damit Wörter
+# benachbarter Blöcke nicht zusammenkleben
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li',
+    'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'td', 'th', 'tr', 'ul'
+}
+
+# Elemente, die praktisch nie zum eigentlichen Inhalt gehören
+BOILERPLATE_TAGS = {'nav', 'header', 'footer', 'aside', 'form', 'dialog', 'button'}
+BOILERPLATE_ROLES = {'navigation', 'banner', 'contentinfo', 'complementary', 'search', 'dialog', 'alertdialog'}
+# Ganze id-/class-Namen; Teilwörter wie in "layout-with-sidebar" zählen nicht,
+# solche Layout-Container umschließen oft den Hauptinhalt
+BOILERPLATE_NAMES = {
+    'cookie', 'cookies', 'cookie-banner', 'cookie-consent', 'consent', 'gdpr', 'banner',
+    'breadcrumb', 'breadcrumbs', 'nav', 'navbar', 'navigation', 'main-nav', 'menu', 'sidebar',
+    'footer', 'site-footer', 'header', 'site-header', 'related', 'teaser', 'teasers', 'social',
+    'share', 'sharing', 'newsletter', 'subscribe', 'skip', 'skip-link', 'pagination', 'pager'
+}
+
+# Container, die typischerweise den Hauptinhalt enthalten
+DEFAULT_MAIN_SELECTORS = ('main', 'article', '[role=main]')
+
+# Unterhalb dieser Länge gilt ein gefundener Hauptinhalt bzw. der bereinigte
+# Text als Fehltreffer
+MIN_MAIN_CONTENT_CHARS = 100
+
+_SELECTOR = re.compile(
+    r'^(?P<tag>[a-z][a-z0-9]*)?(?:#(?P<id>[\w-]+))?(?P<classes>(?:\.[\w-]+)*)'
+    r'(?:\[(?P<attr>[\w-]+)=["\']?(?P<value>[^"\'\]]+)["\']?\])?$'
+)
+
+
+class SimpleSelector:
+    """Minimaler CSS-Selektor: ``tag``, ``#id``, ``.klasse``, ``[attr=wert]`` und Kombinationen davon"""
+
+    def __init__(self, selector: str):
+        match = _SELECTOR.match(selector.strip())
+        if not match or not any(match.group('tag', 'id', 'classes', 'attr')):
+            raise ValueError(f"Nicht unterstützter Selektor: {selector}")
+        self.selector = selector
+        self.tag = match.group('tag')
+        self.id = match.group('id')
+        self.classes = set(filter(None, match.group('classes').split('.')))
+        self.attr = match.group('attr')
+        self.value = match.group('value')
+
+    def __repr__(self):
+        return f"<SimpleSelector {self.selector}>"
+
+    def matches(self, tag: str, attrib) -> bool:
+        if self.tag and tag != self.tag:
+            return False
+        if self.id and attrib.get('id') != self.id:
+            return False
+        if self.classes and not self.classes <= set(attrib.get('class', '').split()):
+            return False
+        if self.attr and attrib.get(self.attr) != self.value:
+            return False
+        return True
+
+
+class ContentRules:
+    """Regeln zur Extraktion des Hauptinhalts einer Seite.
+
+    ``main`` sind Selektoren für den Inhaltscontainer (Standard: ``main``,
+    ``article``, ``[role=main]``), ``strip`` zusätzliche Selektoren für
+    Bereiche, die verworfen werden. Navigation, Kopf- und Fußzeilen,
+    Cookie-Banner, Teaser u.ä. werden immer entfernt, außer mit
+    ``boilerplate=False``; ohne eigene ``main``-Selektoren wird dann der
+    gesamte sichtbare Text verwendet. Ein ``main``-Container gilt auch
+    innerhalb eines Bereichs, der wie Boilerplate aussieht.
+    """
+
+    def __init__(self, main: Optional[Iterable[str]] = None, strip: Optional[Iterable[str]] = None,
+                 boilerplate: bool = True):
+        if not main:
+            main = DEFAULT_MAIN_SELECTORS if boilerplate else []
+        self.main = [SimpleSelector(selector) for selector in main]
+        self.strip = [SimpleSelector(selector) for selector in (strip or [])]
+        self.boilerplate = boilerplate
+
+    def is_main(self, tag: str, attrib) -> bool:
+        return any(selector.matches(tag, attrib) for selector in self.main)
+
+    def is_boilerplate(self, tag: str, attrib) -> bool:
+        if any(selector.matches(tag, attrib) for selector in self.strip):
+            return True
+        if not self.boilerplate or tag in ('html', 'body'):
+            return False
+        if tag in BOILERPLATE_TAGS or attrib.get('role') in BOILERPLATE_ROLES:
+            return True
+        if attrib.get('aria-hidden') == 'true' or 'hidden' in attrib:
+            return True
+        names = f"{attrib.get('id', '')} {attrib.get('class', '')}".lower().split()
+        return not BOILERPLATE_NAMES.isdisjoint(names)
+
+
+class _HtmlCollector:
+    """Parser-Target für lxml, das beim Parsen nur die benötigten Teile sammelt"""
+
+    def __init__(self, collect_text: bool = True, rules: Optional[ContentRules] = None):
+        self.collect_text = collect_text
+        self.rules = rules
+        self.links = []
+        self.meta = {}
+        self.title_parts = []
+        self.text_parts = []
+        self.main_parts = []
+        # Ungefilterter Text als Rückfall, falls die Bereinigung fast alles verwirft
+        self.raw_parts = []
+        self._skip_depth = 0
+        self._in_title = False
+        self._anchor = None
+        # Verschachtelungstiefe und Tiefe, auf der ein Boilerplate- bzw.
+        # Hauptinhalt-Bereich begonnen hat
+        self._depth = 0
+        self._boilerplate_at = None
+        self._main_at = None
+        self._outer_boilerplate_at = None
+
+    def start(self, tag, attrib):
+        if tag == 'meta':
+            key = attrib.get('name') or attrib.get('property')
+            if key and 'content' in attrib:
+                self.meta.setdefault(key.lower(), attrib['content'])
+        elif tag == 'title':
+            self._in_title = True
+        elif tag == 'a' and 'href' in attrib:
+            self._anchor = (attrib['href'], [])
+
+        self._depth += 1
+        if self.rules and self.collect_text:
+            if self._main_at is None and self.rules.is_main(tag, attrib):
+                # Der Hauptinhalt hebt einen umschließenden Boilerplate-Bereich auf
+                self._main_at = self._depth
+                self._outer_boilerplate_at, self._boilerplate_at = self._boilerplate_at, None
+            elif self._boilerplate_at is None and self.rules.is_boilerplate(tag, attrib):
+                self._boilerplate_at = self._depth
+
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS and self.collect_text:
+            self._append_text(' ')
+
+    def end(self, tag):
+        if tag == 'title':
+            self._in_title = False
+        elif tag == 'a' and self._anchor is not None:
+            href, parts = self._anchor
+            self.links.append((href, ''.join(parts)))
+            self._anchor = None
+
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in BLOCK_TAGS and self.collect_text:
+            self._append_text(' ')
+
+        if self._boilerplate_at == self._depth:
+            self._boilerplate_at = None
+        if self._main_at == self._depth:
+            self._main_at = None
+            self._boilerplate_at, self._outer_boilerplate_at = self._outer_boilerplate_at, None
+        self._depth = max(0, self._depth - 1)
+
+    def data(self, data):
+        if self._in_title:
+            self.title_parts.append(data)
+        if self._skip_depth:
+            return
+        if self._anchor is not None:
+            self._anchor[1].append(data)
+        if self.collect_text:
+            self._append_text(data)
+
+    def _append_text(self, text: str):
+        if self.rules:
+            self.raw_parts.append(text)
+        if self._boilerplate_at is not None:
+            return
+        self.text_parts.append(text)
+        if self._main_at is not None:
+            self.main_parts.append(text)
+
+    def content_text(self) -> str:
+        """Hauptinhalt, falls ein ausreichend langer Container gefunden wurde, sonst der bereinigte Text.
+
+        Ist auch dieser zu kurz, wurde vermutlich Inhalt als Boilerplate
+        verworfen; dann wird der ungefilterte Text verwendet.
+        """
+        main_text = ''.join(self.main_parts)
+        if len(main_text.strip()) >= MIN_MAIN_CONTENT_CHARS:
+            return main_text
+        text = ''.join(self.text_parts)
+        if not self.rules or len(text.strip()) >= MIN_MAIN_CONTENT_CHARS:
+            return text
+        raw_text = ''.join(self.raw_parts)
+        return raw_text if len(raw_text.strip()) > len(text.strip()) else text
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        return self
+
+
+class HtmlExtractor:
+    """Streaming-Extraktor: HTML kann stückweise per ``feed`` übergeben werden.
+
+    Es wird kein Dokumentbaum aufgebaut; Links, Meta-Tags, Titel und
+    sichtbarer Text werden in einem einzigen Durchlauf gesammelt. Mit
+    ``rules`` enthält ``text`` nur den Hauptinhalt ohne Boilerplate.
+    """
+
+    def __init__(self, collect_text: bool = True, encoding: Optional[str] = None,
+                 rules: Optional[ContentRules] = None):
+        self._collector = _HtmlCollector(collect_text=collect_text, rules=rules)
+        self._parser = etree.HTMLParser(target=self._collector, remove_comments=True, recover=True)
+        self._decoder = None
+        if encoding:
+            # Bytes selbst dekodieren; libxml2 kennt nicht alle Python-Encodingnamen
+            try:
+                self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            except LookupError:
+                self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._fed = False
+
+    def feed(self, chunk: Union[bytes, str]):
+        if isinstance(chunk, bytes) and self._decoder:
+            chunk = self._decoder.decode(chunk)
+        if chunk:
+            self._parser.feed(chunk)
+            self._fed = True
+
+    def close(self) -> Dict:
+        """Beendet das Parsen und gibt die gesammelten Daten zurück"""
+        if self._decoder:
+            self.feed(self._decoder.decode(b'', final=True))
+        if self._fed:
+            try:
+                self._parser.close()
+            except etree.XMLSyntaxError:
+                # Bei stark kaputtem HTML liefert lxml trotzdem alles bis zum Fehler
+                pass
+        collector = self._collector
+        return {
+            'links': collector.links,
+            'meta': collector.meta,
+            'title': ''.join(collector.title_parts).strip(),
+            'text': collector.content_text()
+        }
+
+
+def parse_html(chunks: Iterable[Union[bytes, str]], collect_text: bool = True,
+               encoding: Optional[str] = None, rules: Optional[ContentRules] = None) -> Dict:
+    """Parst HTML aus einem Iterable von Chunks"""
+    extractor = HtmlExtractor(collect_text=collect_text, encoding=encoding, rules=rules)
+    for chunk in chunks:
+        extractor.feed(chunk)
+    return extractor.close()
+
+
+def extract_links(html: Union[bytes, str], encoding: Optional[str] = None) -> List[Tuple[str, str]]:
+    """Gibt alle (href, Linktext)-Paare einer Seite zurück, ohne Text zu sammeln"""
+    return parse_html([html], collect_text=False, encoding=encoding)['links']
+
+
+def extract_document(html: Union[bytes, str], encoding: Optional[str] = None,
+                     rules: Optional[ContentRules] = None) -> Dict:
+    """Extrahiert sichtbaren Text (bzw. mit ``rules`` den Hauptinhalt), Titel und Meta-Tags eines Dokuments"""
+    return parse_html([html], encoding=encoding, rules=rules)
@@ -0,0 +1,143 @@
+"""Streaming-Parser für Sitemaps und RSS-/Atom-Feeds."""
+import zlib
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, List, NamedTuple, Optional, Union
+
+from lxml import etree
+
+CHUNK_SIZE = 64 * 1024
+# Obergrenze einer unkomprimierten Sitemap laut Sitemaps-Protokoll
+MAX_FEED_BYTES = 50 * 1024 * 1024
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+class FeedEntry(NamedTuple):
+    """Ein Eintrag aus einer Sitemap oder einem Feed"""
+    url: str
+    title: str
+    lastmod: Optional[datetime]  # naive UTC wie ``Document.last_checked``
+    is_sitemap: bool = False     # Verweis auf eine weitere Sitemap (Sitemap-Index)
+
+
+def parse_feed_date(value: Optional[str]) -> Optional[datetime]:
+    """Parst W3C-Datumsangaben (Sitemap, Atom) und RFC-822-Daten (RSS) nach naive UTC"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _text(element) -> str:
+    return (element.text or '').strip()
+
+
+def _localname(element) -> str:
+    return etree.QName(element).localname.lower()
+
+
+def _entry_from_element(element, kind: str) -> Optional[FeedEntry]:
+    """Baut einen FeedEntry aus einem abgeschlossenen <url>, <sitemap>, <item> oder <entry>"""
+    url = title = ''
+    lastmod = None
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue
+        name = _localname(child)
+        if name == 'loc' or (name == 'link' and kind == 'item'):
+            url = _text(child)
+        elif name == 'link' and kind == 'entry':
+            # Atom: bevorzugt den alternate-Link
+            if child.get('rel', 'alternate') == 'alternate' or not url:
+                url = child.get('href', '').strip()
+        elif name == 'title':
+            title = ' '.join(''.join(child.itertext()).split())
+        elif name in ('lastmod', 'pubdate', 'updated') or (name in ('published', 'date') and lastmod is None):
+            lastmod = parse_feed_date(_text(child)) or lastmod
+    if not url:
+        return None
+    return FeedEntry(url, title, lastmod, kind == 'sitemap')
+
+
+class FeedParser:
+    """Parst eine Sitemap, einen Sitemap-Index, RSS oder Atom inkrementell.
+
+    Die Daten werden mit ``feed`` stückweise in einen Pull-Parser gegeben,
+    etwa direkt aus der laufenden Übertragung; jedes abgeschlossene Element
+    wird sofort ausgewertet und verworfen, sodass auch Sitemaps mit
+    zehntausenden Einträgen mit konstantem Speicher gelesen werden.
+    Gzip-komprimierte Sitemaps (``sitemap.xml.gz``) werden an ihren ersten
+    Bytes erkannt und beim Lesen entpackt, unabhängig von Content-Type und
+    Dateiendung. Mehr als ``max_bytes`` entpackte Daten werden nicht
+    gelesen, ``truncated`` ist dann gesetzt.
+    """
+
+    def __init__(self, max_bytes: int = MAX_FEED_BYTES):
+        self.max_bytes = max_bytes
+        self.truncated = False
+        self.entries: List[FeedEntry] = []
+        self._parser = etree.XMLPullParser(events=('end',), recover=True, resolve_entities=False,
+                                           no_network=True)
+        self._decompressor = None
+        self._started = False
+        self._size = 0
+
+    def feed(self, chunk: bytes):
+        if not chunk or self.truncated:
+            return
+        if not self._started:
+            self._started = True
+            if chunk.startswith(GZIP_MAGIC):
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._decompressor is not None:
+            # Höchstens ein Byte über dem Limit entpacken (Schutz vor Gzip-Bomben)
+            chunk = self._decompressor.decompress(chunk, self.max_bytes - self._size + 1)
+        self._size += len(chunk)
+        if self._size > self.max_bytes:
+            chunk = chunk[:len(chunk) - (self._size - self.max_bytes)]
+            self.truncated = True
+        self._parser.feed(chunk)
+        self._drain()
+
+    def close(self) -> List[FeedEntry]:
+        """Beendet das Parsen und gibt alle Einträge zurück"""
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            pass
+        self._drain()
+        return self.entries
+
+    def _drain(self):
+        for _, element in self._parser.read_events():
+            if not isinstance(element.tag, str):
+                continue
+            kind = _localname(element)
+            if kind in ('url', 'sitemap', 'item', 'entry'):
+                entry = _entry_from_element(element, kind)
+                if entry:
+                    self.entries.append(entry)
+                element.clear()
+                # Bereits ausgewertete Geschwister freigeben
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+
+def parse_feed(chunks: Union[bytes, Iterable[bytes]]) -> List[FeedEntry]:
+    """Parst einen vollständig vorliegenden Feed oder eine Folge von Blöcken (siehe ``FeedParser``)"""
+    if isinstance(chunks, bytes):
+        data = chunks
+        chunks = (data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE))
+    parser = FeedParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
@@ -0,0 +1,392 @@
+"""Asynchrone Fetch-Engine für den Scraper."""
+import asyncio
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from urllib.parse import urlparse
+
+import aiohttp
+from loguru import logger
+from multidict import CIMultiDict
+
+from .http_cache import ResponseCache
+from .ratelimit import HostRateLimiter
+from .resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from .urls import normalize_url
+
+try:  # aiohttp dekodiert Brotli nur, wenn eines dieser Pakete installiert ist
+    import brotli  # noqa: F401
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if HAS_BROTLI else 'gzip, deflate'
+
+CHUNK_SIZE = 64 * 1024
+
+# Signaturen am Dateianfang für Antworten ohne aussagekräftigen Content-Type
+MAGIC_NUMBERS = (
+    (b'%PDF-', 'application/pdf'),
+    (b'PK\x03\x04', 'application/zip'),
+    (b'\x1f\x8b', 'application/gzip'),
+    (b'\x89PNG', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF8', 'image/gif'),
+    (b'\xd0\xcf\x11\xe0', 'application/msword'),
+)
+
+
+class ContentRejectedError(Exception):
+    """Die Antwort wurde wegen Typ oder Größe verworfen, bevor der Inhalt gelesen wurde."""
+
+
+def sniff_content_type(head: bytes) -> str:
+    """Bestimmt den Inhaltstyp anhand der ersten Bytes einer Antwort"""
+    for magic, content_type in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return content_type
+    text = head.lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    if text.startswith((b'<!doctype html', b'<html', b'<head', b'<body', b'<!--', b'<div', b'<p')):
+        return 'text/html'
+    if text.startswith(b'<?xml') or text.startswith(b'<'):
+        return 'application/xml'
+    return 'application/octet-stream'
+
+
+def _type_accepted(content_type: str, accept_types: Sequence[str]) -> bool:
+    return any(content_type.startswith(accepted) for accepted in accept_types)
+
+
+class AsyncFetcher:
+    """Lädt viele URLs parallel mit globalem und hostbezogenem Parallelitätslimit.
+
+    Wird als asynchroner Kontextmanager verwendet, damit alle Requests eines
+    Scraping-Laufs über dieselbe aiohttp-Session laufen. Ein optionaler
+    ``HostRateLimiter`` drosselt die Request-Rate pro Origin, ein optionaler
+    ``ResponseCache`` beantwortet wiederholte Requests ohne Netzwerkzugriff.
+    ``host_concurrency`` überschreibt das hostbezogene Limit für einzelne Hosts.
+
+    Alle Requests teilen sich einen Connection-Pool mit Keep-Alive
+    (``pool_size`` Verbindungen insgesamt, ``pool_per_host`` je Host) und
+    fordern komprimierte Antworten an. ``pool_stats`` zählt neu geöffnete und
+    wiederverwendete Verbindungen.
+
+    Vorübergehende Fehler werden nach ``retry_policy`` wiederholt. Liefert
+    ein Host ``breaker_threshold`` Fehler in Folge, werden weitere Requests
+    an ihn mit ``CircuitOpenError`` abgelehnt, ohne ihn zu kontaktieren.
+
+    Für Offline-Messungen (siehe ``replay``) kann ein ``recorder`` jede
+    erfolgreiche Antwort unter ihrem Cache-Schlüssel mitschneiden, und
+    ``replay_url`` leitet Requests anhand dieses Schlüssels auf einen lokalen
+    Ersatzserver um. Parallelitäts- und Ratenlimits gelten weiterhin für den
+    ursprünglichen Host.
+    """
+
+    def __init__(self, max_concurrency: int = 20, per_host_concurrency: int = 4,
+                 timeout: float = 30, headers: Optional[Dict] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 cache: Optional[ResponseCache] = None,
+                 host_concurrency: Optional[Dict[str, int]] = None,
+                 pool_size: Optional[int] = None, pool_per_host: Optional[int] = None,
+                 keepalive_timeout: float = 30, retry_policy: Optional[RetryPolicy] = None,
+                 breaker_threshold: int = 5, breaker_reset_timeout: float = 300,
+                 recorder=None, replay_url: Optional[Callable[[str], str]] = None):
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.host_concurrency = host_concurrency or {}
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.headers.setdefault('Accept-Encoding', ACCEPT_ENCODING)
+        self.pool_size = pool_size or max_concurrency
+        self.pool_per_host = pool_per_host or 0  # 0: nur durch pool_size begrenzt
+        self.keepalive_timeout = keepalive_timeout
+        self.pool_stats = {'opened': 0, 'reused': 0}
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset_timeout = breaker_reset_timeout
+        self._breakers = {}
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.cache_hits = 0
+        self.recorder = recorder
+        self.replay_url = replay_url
+        self._session = None
+        self._global_limit = None
+        self._host_limits = {}
+
+    async def __aenter__(self):
+        self._global_limit = asyncio.Semaphore(self.max_concurrency)
+        self._host_limits = {}
+        self.pool_stats = {'opened': 0, 'reused': 0}
+        self.retry_policy.reset()
+        self._breakers = {}
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.pool_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=300
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            trace_configs=[self._pool_trace_config()]
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+        self._session = None
+        total = self.pool_stats['opened'] + self.pool_stats['reused']
+        if total:
+            logger.info(f"HTTP-Verbindungen: {self.pool_stats['opened']} geöffnet, "
+                        f"{self.pool_stats['reused']} wiederverwendet "
+                        f"({self.pool_stats['reused'] / total:.0%} Wiederverwendung)")
+        if self.retry_policy.retries:
+            logger.info(f"{self.retry_policy.retries} von {self.retry_policy.budget} Wiederholungen verbraucht")
+        open_hosts = self.open_circuits()
+        if open_hosts:
+            logger.warning(f"Circuit Breaker offen für: {', '.join(open_hosts)}")
+
+    def _breaker(self, url: str) -> CircuitBreaker:
+        """Gibt den Circuit Breaker für den Host der URL zurück"""
+        host = HostRateLimiter.host_of(url)
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_reset_timeout)
+        return self._breakers[host]
+
+    def _check_circuit(self, url: str):
+        if self._breaker(url).blocked():
+            raise CircuitOpenError(f"Circuit Breaker für {HostRateLimiter.host_of(url)} ist offen")
+
+    def _claim_circuit(self, url: str) -> bool:
+        """Wie ``_check_circuit``, beansprucht aber einen fälligen Probe-Request; ``True``, wenn dies die Probe ist"""
+        breaker = self._breaker(url)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit Breaker für {HostRateLimiter.host_of(url)} ist offen")
+        return breaker.is_open
+
+    def open_circuits(self) -> List[str]:
+        """Hosts, deren Circuit Breaker gerade offen ist"""
+        return sorted(host for host, breaker in self._breakers.items() if breaker.is_open)
+
+    def _pool_trace_config(self) -> aiohttp.TraceConfig:
+        """Zählt neu geöffnete und wiederverwendete Verbindungen des Pools"""
+        async def on_create(session, context, params):
+            self.pool_stats['opened'] += 1
+
+        async def on_reuse(session, context, params):
+            self.pool_stats['reused'] += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(on_create)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        return trace_config
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        """Gibt das Semaphor für den Host der URL zurück"""
+        host = urlparse(url).netloc.lower()
+        if host not in self._host_limits:
+            limit = self.host_concurrency.get(host, self.per_host_concurrency)
+            self._host_limits[host] = asyncio.Semaphore(limit)
+        return self._host_limits[host]
+
+    async def throttle(self, url: str):
+        """Wartet auf das Ratenbudget des Hosts der URL"""
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(url)
+
+    @staticmethod
+    def _matches_validators(headers: Optional[Dict], cached: Dict) -> bool:
+        """Prüft, ob bedingte Request-Header zur gecachten Antwort passen"""
+        if not headers:
+            return False
+        etag = cached['headers'].get('ETag')
+        last_modified = cached['headers'].get('Last-Modified')
+        return bool((etag and headers.get('If-None-Match') == etag) or
+                    (last_modified and headers.get('If-Modified-Since') == last_modified))
+
+    async def fetch(self, url: str, headers: Optional[Dict] = None,
+                    timeout: Optional[float] = None, origin: Optional[str] = None,
+                    cache_key: Optional[str] = None, max_bytes: Optional[int] = None,
+                    accept_types: Optional[Sequence[str]] = None,
+                    on_chunk: Optional[Callable[[bytes], None]] = None) -> Dict:
+        """Lädt eine URL und gibt Status, Header und Rohinhalt zurück.
+
+        ``origin`` ist die URL, deren Host für Parallelitäts- und Ratenlimit
+        zählt (z.B. die Ziel-URL bei Requests über einen Proxy), ``cache_key``
+        der Schlüssel im Antwort-Cache und in Mitschnitten (Standard:
+        normalisierte URL).
+
+        Der Inhalt wird in Blöcken gelesen. Mit ``accept_types`` (Präfixe wie
+        ``'text/html'``) und ``max_bytes`` wird eine Antwort anhand von
+        Content-Type, Content-Length bzw. der ersten Bytes verworfen, bevor
+        der Rest übertragen wird; dann wird ``ContentRejectedError`` geworfen.
+        Wirft ``aiohttp.ClientResponseError`` bei HTTP-Statuscodes ab 400
+        (nach erfolglosen Wiederholungen) und ``CircuitOpenError``, wenn der
+        Host in diesem Lauf nicht mehr angefragt wird.
+
+        Mit ``on_chunk`` erhält der Aufrufer den Inhalt blockweise, während
+        er übertragen wird. ``content`` bleibt dann leer, außer Antwort-Cache
+        oder Mitschnitt benötigen ihn. Nach bereits gelieferten Blöcken wird
+        ein Fehler nicht mehr wiederholt.
+        """
+        request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        origin = origin or url
+        cache_key = cache_key or normalize_url(url)
+        request_url = self.replay_url(cache_key) if self.replay_url is not None else url
+
+        if self.cache:
+            # SQLite, Dateizugriff und Dekompression nicht in der Event-Loop
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached:
+                self.cache_hits += 1
+                # Gleiche Grenzen wie beim Laden, der Cache kennt die Parameter des Aufrufers nicht
+                self._check_cached(cached, url, max_bytes, accept_types)
+                if self._matches_validators(headers, cached):
+                    return dict(cached, status=304, content=b'')
+                if on_chunk is not None:
+                    for start in range(0, len(cached['content']), CHUNK_SIZE):
+                        on_chunk(cached['content'][start:start + CHUNK_SIZE])
+                        await asyncio.sleep(0)
+                return cached
+
+        streamed = False
+
+        def deliver(chunk: bytes):
+            nonlocal streamed
+            streamed = True
+            on_chunk(chunk)
+
+        attempt = 0
+        breaker = self._breaker(origin)
+        while True:
+            self._check_circuit(origin)
+            try:
+                result = await self._fetch_once(url, origin, headers, request_timeout, max_bytes, accept_types,
+                                                request_url, deliver if on_chunk is not None else None)
+            except ContentRejectedError:
+                # Der Host hat geantwortet, nur der Inhalt wird nicht verarbeitet
+                breaker.record_success()
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if isinstance(e, CircuitOpenError):
+                    raise
+                attempt += 1
+                if self.retry_policy.is_host_failure(e):
+                    if breaker.record_failure():
+                        logger.warning(f"Circuit Breaker für {HostRateLimiter.host_of(origin)} geöffnet "
+                                       f"nach {self.breaker_threshold} Fehlern in Folge")
+                elif isinstance(e, aiohttp.ClientResponseError):
+                    # Jede HTTP-Antwort (z.B. 404) zeigt, dass der Host erreichbar ist
+                    breaker.record_success()
+                # Bereits gelieferte Blöcke lassen sich nicht zurücknehmen
+                if streamed or not self.retry_policy.should_retry(e, attempt):
+                    raise
+                delay = self.retry_policy.backoff(attempt, e)
+                logger.info(f"Versuch {attempt} für {url} fehlgeschlagen ({e!r}), "
+                            f"neuer Versuch in {delay:.1f}s")
+                # Warten ohne Host- oder globalen Slot zu belegen
+                await asyncio.sleep(delay)
+                continue
+            breaker.record_success()
+            break
+
+        if self.cache and result['status'] == 200:
+            await asyncio.to_thread(self.cache.put, cache_key, result)
+        if self.recorder is not None and result['status'] == 200:
+            self.recorder.record(cache_key, result)
+        return result
+
+    async def _fetch_once(self, url: str, origin: str, headers: Optional[Dict],
+                          request_timeout: Optional[aiohttp.ClientTimeout], max_bytes: Optional[int],
+                          accept_types: Optional[Sequence[str]], request_url: Optional[str] = None,
+                          on_chunk: Optional[Callable[[bytes], None]] = None) -> Dict:
+        """Ein einzelner Request-Versuch; ``request_url`` ist die tatsächlich angefragte Adresse"""
+        request_url = request_url or url
+        # Erst Host-Slot und Ratenbudget belegen, damit wartende Requests auf
+        # einen ausgelasteten Host keine globalen Slots blockieren
+        async with self._host_limit(origin):
+            # Während des Wartens kann der Breaker geöffnet worden sein
+            probe = self._claim_circuit(origin)
+            try:
+                await self.throttle(origin)
+                async with self._global_limit:
+                    async with self._session.get(request_url, headers=headers, timeout=request_timeout) as response:
+                        response.raise_for_status()
+                        content = await self._read_body(
+                            response, url, max_bytes, accept_types, on_chunk,
+                            keep_content=on_chunk is None or self.cache is not None or self.recorder is not None
+                        )
+                        result = {
+                            'url': url,
+                            'final_url': str(response.url) if request_url == url else url,
+                            'status': response.status,
+                            'headers': CIMultiDict(response.headers),
+                            'content': content,
+                            'encoding': response.charset or 'utf-8'
+                        }
+            finally:
+                if probe:
+                    # Erfolg oder Fehler meldet ``fetch``; endet die Probe anders
+                    # (Abbruch, unerwartete Exception), prüft der nächste Request erneut
+                    self._breaker(origin).release_probe()
+        return result
+
+    @staticmethod
+    async def _read_body(response: aiohttp.ClientResponse, url: str,
+                         max_bytes: Optional[int], accept_types: Optional[Sequence[str]],
+                         on_chunk: Optional[Callable[[bytes], None]] = None, keep_content: bool = True) -> bytes:
+        """Liest den Inhalt blockweise und bricht bei unpassendem Typ oder Überschreiten von ``max_bytes`` ab"""
+        if response.status == 304:
+            return b''
+
+        declared_type = response.content_type if response.headers.get('Content-Type') else ''
+        if accept_types and declared_type and declared_type != 'application/octet-stream' \
+                and not _type_accepted(declared_type, accept_types):
+            raise ContentRejectedError(f"{url}: Inhaltstyp {declared_type} wird nicht verarbeitet")
+        if max_bytes and response.content_length and response.content_length > max_bytes:
+            raise ContentRejectedError(f"{url}: {response.content_length} Bytes überschreiten "
+                                       f"das Limit von {max_bytes} Bytes")
+
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            if not size and accept_types and declared_type in ('', 'application/octet-stream'):
+                sniffed_type = sniff_content_type(chunk[:512])
+                if not _type_accepted(sniffed_type, accept_types):
+                    raise ContentRejectedError(f"{url}: Inhalt als {sniffed_type} erkannt, wird nicht verarbeitet")
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise ContentRejectedError(f"{url}: Inhalt überschreitet das Limit von {max_bytes} Bytes")
+            if on_chunk is not None:
+                on_chunk(chunk)
+            if keep_content:
+                chunks.append(chunk)
+        return b''.join(chunks)
+
+    @staticmethod
+    def _check_cached(cached: Dict, url: str, max_bytes: Optional[int], accept_types: Optional[Sequence[str]]):
+        """Wendet die Prüfungen von ``_read_body`` auf eine Antwort aus dem Cache an"""
+        declared_type = cached['headers'].get('Content-Type', '').split(';', 1)[0].strip().lower()
+        if accept_types:
+            if declared_type in ('', 'application/octet-stream'):
+                content_type = sniff_content_type(cached['content'][:512])
+            else:
+                content_type = declared_type
+            if not _type_accepted(content_type, accept_types):
+                raise ContentRejectedError(f"{url}: Inhaltstyp {content_type} wird nicht verarbeitet")
+        if max_bytes and len(cached['content']) > max_bytes:
+            raise ContentRejectedError(f"{url}: Inhalt überschreitet das Limit von {max_bytes} Bytes")
+
+    async def fetch_all(self, urls: Iterable[str], **kwargs) -> List:
+        """Lädt mehrere URLs parallel; Fehler werden als Exception-Objekte zurückgegeben"""
+        urls = list(urls)
+        results = await asyncio.gather(*(self.fetch(url, **kwargs) for url in urls),
+                                       return_exceptions=True)
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Fehler beim Laden von {url}: {result}")
+        return results
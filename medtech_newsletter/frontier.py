@@ -0,0 +1,80 @@
+"""Crawl-Frontier mit Duplikaterkennung und Priorisierung."""
+import heapq
+import itertools
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from .urls import normalize_url, url_fingerprint
+
+
+class CrawlFrontier:
+    """Warteschlange der zu ladenden Dokument-URLs eines Scraping-Laufs.
+
+    Jede URL wird über ihren kanonischen Fingerprint nur einmal aufgenommen,
+    auch wenn mehrere Quellen oder Listen-Seiten auf sie verweisen. Neu
+    entdeckte URLs werden zuerst ausgegeben, danach bekannte URLs in
+    aufsteigender Reihenfolge ihres ``last_checked``-Zeitpunkts.
+
+    ``next_visit`` (URL -> Zeitpunkt) gibt an, ab wann eine bekannte URL
+    wieder geprüft werden soll; ``is_due`` wertet das aus.
+    """
+
+    def __init__(self, last_checked: Optional[Dict[str, datetime]] = None,
+                 next_visit: Optional[Dict[str, datetime]] = None):
+        self._seen = set()
+        self._heap = []
+        self._counter = itertools.count()  # stabile Reihenfolge bei gleicher Priorität
+        self._last_checked = {url_fingerprint(url): checked
+                              for url, checked in (last_checked or {}).items() if checked}
+        self._next_visit = {url_fingerprint(url): due for url, due in (next_visit or {}).items()}
+        self._now = datetime.utcnow()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, url: str) -> bool:
+        return url_fingerprint(url) in self._seen
+
+    def _priority(self, fingerprint: str):
+        checked = self._last_checked.get(fingerprint)
+        if checked is None:
+            return (0, 0.0)
+        return (1, checked.timestamp())
+
+    def last_checked(self, url: str) -> Optional[datetime]:
+        """Zeitpunkt der letzten Prüfung einer bekannten URL"""
+        return self._last_checked.get(url_fingerprint(url))
+
+    def latest_check(self, host: str) -> Optional[datetime]:
+        """Jüngster ``last_checked``-Zeitpunkt aller bekannten URLs eines Hosts"""
+        host = host[4:] if host.startswith('www.') else host
+        checks = [checked for fingerprint, checked in self._last_checked.items()
+                  if urlsplit(fingerprint).netloc == host]
+        return max(checks, default=None)
+
+    def is_due(self, url: str) -> bool:
+        """Ist die URL neu oder ihre nächste Prüfung fällig?"""
+        due = self._next_visit.get(url_fingerprint(url))
+        return due is None or due <= self._now
+
+    def add(self, url: str, **data) -> bool:
+        """Nimmt eine URL auf; gibt ``False`` zurück, wenn sie schon bekannt ist"""
+        fingerprint = url_fingerprint(url)
+        if fingerprint in self._seen:
+            return False
+        self._seen.add(fingerprint)
+        entry = dict(data, url=normalize_url(url))
+        heapq.heappush(self._heap, (self._priority(fingerprint), next(self._counter), entry))
+        return True
+
+    def pop(self) -> Dict:
+        """Gibt den Eintrag mit der höchsten Priorität zurück"""
+        return heapq.heappop(self._heap)[2]
+
+    def drain(self) -> List[Dict]:
+        """Entnimmt alle Einträge in Prioritätsreihenfolge"""
+        entries = []
+        while self._heap:
+            entries.append(self.pop())
+        return entries
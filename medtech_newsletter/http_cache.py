@@ -0,0 +1,168 @@
+"""Lokaler HTTP-Antwort-Cache für den Scraper."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from loguru import logger
+from multidict import CIMultiDict
+
+
+class ResponseCache:
+    """Speichert HTTP-Antworten auf der Festplatte.
+
+    Die Bodies liegen zlib-komprimiert und inhaltsadressiert (SHA-256) unter
+    ``bodies/``; identische Antworten verschiedener URLs teilen sich eine
+    Datei. Ein SQLite-Index hält pro Schlüssel Header, Status und Abrufzeit.
+    Einträge verfallen nach ``ttl`` Sekunden, bei Überschreiten von
+    ``max_bytes`` werden die am längsten nicht gelesenen Einträge entfernt;
+    aufgeräumt wird höchstens alle ``evict_interval`` Sekunden beim
+    Speichern. ``get`` und ``put`` blockieren (SQLite, Dateien, zlib) und
+    gehören in asynchronem Code in einen Thread.
+    """
+
+    def __init__(self, directory: str, ttl: float = 6 * 3600, max_bytes: int = 500 * 1024 * 1024,
+                 evict_interval: float = 60):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evict_interval = evict_interval
+        self._lock = threading.Lock()
+        self._last_evict = 0.0
+
+        os.makedirs(os.path.join(directory, 'bodies'), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, 'index.sqlite'), check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS bodies (
+                hash TEXT PRIMARY KEY,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body_hash TEXT NOT NULL REFERENCES bodies(hash),
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                encoding TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access);
+            CREATE INDEX IF NOT EXISTS idx_entries_fetched_at ON entries(fetched_at);
+        """)
+        self._db.commit()
+
+    def _body_path(self, body_hash: str) -> str:
+        return os.path.join(self.directory, 'bodies', body_hash[:2], body_hash)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Gibt eine noch gültige Antwort zurück oder ``None``"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, body_hash, status, headers, encoding, fetched_at FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if not row or row[5] + self.ttl < now:
+                return None
+            try:
+                with open(self._body_path(row[1]), 'rb') as f:
+                    content = zlib.decompress(f.read())
+            except (OSError, zlib.error) as e:
+                logger.warning(f"Cache-Eintrag für {row[0]} unlesbar: {e}")
+                self._delete_entry(key, row[1])
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            self._db.commit()
+
+        return {
+            'url': row[0],
+            'final_url': row[0],
+            'status': row[2],
+            'headers': CIMultiDict(json.loads(row[3])),
+            'content': content,
+            'encoding': row[4],
+            'fetched_at': row[5],
+            'from_cache': True
+        }
+
+    def put(self, key: str, response: Dict):
+        """Legt eine Antwort im Cache ab"""
+        content = response['content']
+        body_hash = hashlib.sha256(content).hexdigest()
+        path = self._body_path(body_hash)
+        now = time.time()
+
+        with self._lock:
+            known = self._db.execute("SELECT 1 FROM bodies WHERE hash = ?", (body_hash,)).fetchone()
+            if not known:
+                compressed = zlib.compress(content, 6)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(compressed)
+                self._db.execute("INSERT INTO bodies (hash, size) VALUES (?, ?)", (body_hash, len(compressed)))
+
+            previous = self._db.execute("SELECT body_hash FROM entries WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, url, body_hash, status, headers, encoding, fetched_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response['url'], body_hash, response['status'],
+                 json.dumps(list(response['headers'].items())), response.get('encoding'), now, now)
+            )
+            if previous and previous[0] != body_hash:
+                self._drop_orphan_body(previous[0])
+            if now - self._last_evict >= self.evict_interval:
+                self._last_evict = now
+                self._evict()
+            self._db.commit()
+
+    def _delete_entry(self, key: str, body_hash: str) -> int:
+        """Löscht einen Eintrag und gibt die freigegebenen Bytes zurück"""
+        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        return self._drop_orphan_body(body_hash)
+
+    def _drop_orphan_body(self, body_hash: str) -> int:
+        """Löscht einen Body, auf den kein Eintrag mehr verweist"""
+        if self._db.execute("SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)).fetchone():
+            return 0
+        row = self._db.execute("SELECT size FROM bodies WHERE hash = ?", (body_hash,)).fetchone()
+        self._db.execute("DELETE FROM bodies WHERE hash = ?", (body_hash,))
+        try:
+            os.remove(self._body_path(body_hash))
+        except FileNotFoundError:
+            pass
+        return row[0] if row else 0
+
+    def _total_size(self) -> int:
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+
+    def _evict(self):
+        """Entfernt abgelaufene Einträge und danach die am längsten ungenutzten (LRU)"""
+        expired = self._db.execute(
+            "SELECT key, body_hash FROM entries WHERE fetched_at < ?", (time.time() - self.ttl,)
+        ).fetchall()
+        for key, body_hash in expired:
+            self._delete_entry(key, body_hash)
+
+        total = self._total_size()
+        if total <= self.max_bytes:
+            return
+
+        # Auf 90 % der Maximalgröße verkleinern, damit nicht bei jedem put evictet wird
+        target = self.max_bytes * 0.9
+        for key, body_hash in self._db.execute(
+                "SELECT key, body_hash FROM entries ORDER BY last_access").fetchall():
+            total -= self._delete_entry(key, body_hash)
+            if total <= target:
+                break
+        logger.info(f"HTTP-Cache auf {total / 1024 / 1024:.1f} MB verkleinert")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,130 @@
+"""Keyword-Tabellen des Analyzers und ein gemeinsamer Aho-Corasick-Automat für alle Tabellen.
+
+Micro-Benchmark gegenüber der bisherigen Suche: ``python -m medtech_newsletter.benchmarks keywords``
+"""
+from typing import Dict, Iterable, List
+
+import ahocorasick
+
+# Medizintechnik-spezifische Keywords
+MEDICAL_KEYWORDS = {
+    'regulations': ['regulation', 'directive', 'law', 'act', 'verordnung', 'richtlinie', 'gesetz'],
+    'standards': ['standard', 'norm', 'iso', 'iec', 'din', 'astm'],
+    'devices': ['medical device', 'medizinprodukt', 'implant', 'diagnostic', 'therapeutic'],
+    'quality': ['quality', 'safety', 'risk', 'qualität', 'sicherheit', 'risiko'],
+    'approval': ['approval', 'certification', 'clearance', 'zulassung', 'zertifizierung'],
+    'clinical': ['clinical trial', 'study', 'evaluation', 'klinische studie', 'bewertung']
+}
+
+TOPIC_KEYWORDS = {
+    'Medical Device Regulation': ['mdr', 'medical device regulation', 'medizinprodukteverordnung'],
+    'In Vitro Diagnostic': ['ivd', 'in vitro diagnostic', 'in-vitro-diagnostika'],
+    'Quality Management': ['quality management', 'qualitätsmanagement', 'iso 13485'],
+    'Risk Management': ['risk management', 'risikomanagement', 'iso 14971'],
+    'Clinical Evaluation': ['clinical evaluation', 'klinische bewertung'],
+    'Post Market Surveillance': ['post market surveillance', 'marktüberwachung'],
+    'Biocompatibility': ['biocompatibility', 'biokompatibilität', 'iso 10993'],
+    'Software': ['software', 'iec 62304'],
+    'Sterilization': ['sterilization', 'sterilisation', 'iso 11135']
+}
+
+# Änderungsindikatoren in Sätzen
+CHANGE_WORDS = ['new', 'updated', 'revised', 'amended', 'changed', 'modified',
+                'neu', 'aktualisiert', 'überarbeitet', 'geändert', 'modifiziert']
+
+# Wörter, die ein Dokument besonders wichtig machen
+HIGH_IMPORTANCE_WORDS = ['mandatory', 'required', 'deadline', 'compliance',
+                         'pflicht', 'erforderlich', 'frist', 'konformität']
+
+# Hinzugefügte Zeilen eines Diffs: geänderte Anforderungen bzw. Aktualisierungen
+REQUIREMENT_WORDS = ['deadline', 'requirement', 'mandatory', 'frist', 'pflicht']
+MANDATORY_WORDS = ['mandatory', 'required', 'deadline', 'pflicht', 'frist']
+UPDATE_WORDS = ['new', 'updated', 'revised', 'neu', 'aktualisiert']
+
+# Alle Tabellen des Analyzers für einen gemeinsamen Automaten
+ANALYZER_TABLES = {
+    **{f'medical:{category}': keywords for category, keywords in MEDICAL_KEYWORDS.items()},
+    **{f'topic:{topic}': keywords for topic, keywords in TOPIC_KEYWORDS.items()},
+    'change': CHANGE_WORDS,
+    'high_importance': HIGH_IMPORTANCE_WORDS,
+    'requirement': REQUIREMENT_WORDS,
+    'mandatory': MANDATORY_WORDS,
+    'update': UPDATE_WORDS,
+}
+
+
+class KeywordHits:
+    """Treffer eines Texts: Anzahl der Vorkommen je Keyword-Index (nur gefundene Keywords)"""
+
+    __slots__ = ('_matcher', 'counts')
+
+    def __init__(self, matcher: 'KeywordMatcher', counts: Dict[int, int]):
+        self._matcher = matcher
+        self.counts = counts
+
+    def any(self, table: str) -> bool:
+        """Kommt mindestens ein Keyword der Tabelle vor?"""
+        return not self._matcher.tables[table].isdisjoint(self.counts)
+
+    def score(self, weights: List[float], distinct: bool = False) -> float:
+        """Gewichtete Summe der Vorkommen (``distinct``: jedes gefundene Keyword einmal)"""
+        if distinct:
+            return sum(weights[index] for index in self.counts)
+        return sum(weights[index] * count for index, count in self.counts.items())
+
+
+class KeywordMatcher:
+    """Aho-Corasick-Automat über mehrere Keyword-Tabellen.
+
+    ``tables`` ordnet Tabellennamen ihre Keywords zu; ein Keyword darf in
+    mehreren Tabellen stehen. Gesucht wird wie mit ``keyword in text.lower()``
+    ohne Rücksicht auf Wortgrenzen, aber für alle Keywords aller Tabellen in
+    einem einzigen Durchlauf über den Text.
+    """
+
+    def __init__(self, tables: Dict[str, Iterable[str]]):
+        tables = {name: [keyword.lower() for keyword in keywords] for name, keywords in tables.items()}
+        self.keywords = sorted({keyword for keywords in tables.values() for keyword in keywords})
+        index = {keyword: position for position, keyword in enumerate(self.keywords)}
+        self.tables = {name: frozenset(index[keyword] for keyword in keywords)
+                       for name, keywords in tables.items()}
+        self._automaton = ahocorasick.Automaton()
+        for keyword, position in index.items():
+            self._automaton.add_word(keyword, position)
+        self._automaton.make_automaton()
+
+    def weights(self, table_weights: Dict[str, float]) -> List[float]:
+        """Gewicht je Keyword als Summe der Gewichte seiner Tabellen, für ``KeywordHits.score``"""
+        weights = [0] * len(self.keywords)
+        for table, weight in table_weights.items():
+            for position in self.tables[table]:
+                weights[position] += weight
+        return weights
+
+    def scan(self, text: str) -> KeywordHits:
+        """Alle Keyword-Vorkommen in ``text``"""
+        counts = {}
+        for _, position in self._automaton.iter(text.lower()):
+            counts[position] = counts.get(position, 0) + 1
+        return KeywordHits(self, counts)
+
+    def scan_each(self, texts: List[str]) -> List[KeywordHits]:
+        """Keyword-Vorkommen mehrerer Texte (Sätze, Zeilen) in einem gemeinsamen Durchlauf.
+
+        Die Texte werden durch Zeilenumbrüche getrennt verkettet; kein
+        Keyword enthält einen Zeilenumbruch, Treffer über Textgrenzen hinweg
+        sind daher ausgeschlossen.
+        """
+        lowered = [text.lower() for text in texts]
+        counts = [{} for _ in lowered]
+        if not lowered:
+            return []
+        segment = 0
+        segment_end = len(lowered[0])
+        for end, position in self._automaton.iter('\n'.join(lowered)):
+            while end >= segment_end:
+                segment += 1
+                segment_end += len(lowered[segment]) + 1
+            segment_counts = counts[segment]
+            segment_counts[position] = segment_counts.get(position, 0) + 1
+        return [KeywordHits(self, segment_counts) for segment_counts in counts]
@@ -0,0 +1,116 @@
+"""Metadaten-Extraktion für gescrapte Dokumente mit vorkompilierten Mustern.
+
+Micro-Benchmark auf Seiten eines Fixture-Archivs (siehe ``replay``) oder,
+ohne Archiv, auf synthetischen Seiten: ``python -m medtech_newsletter.benchmarks metadata``
+"""
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .entities import NAMED_DATE_PATTERN, NUMERIC_DATE_PATTERN, normalize_date
+
+# Jedes Datum enthält eine vierstellige Jahreszahl. Dieses einfache Muster
+# durchläuft den Text um ein Vielfaches schneller als die Datumsmuster;
+# diese werden nur im Umfeld gefundener Jahreszahlen angewendet.
+YEAR_PATTERN = re.compile(r'(?:19|20)\d\d')
+
+# Maximaler Abstand zwischen Datumsanfang und Jahreszahl ("12. September 2024")
+DATE_WINDOW = 24
+
+# Meta-Tags (Name bzw. Property, kleingeschrieben) -> Feld in den Metadaten
+META_FIELDS = {
+    'description': 'description',
+    'keywords': 'keywords',
+    'og:title': 'og_title',
+}
+
+# Meta-Tags mit Veröffentlichungs- oder Änderungsdatum, in absteigender Priorität
+DATE_META_TAGS = (
+    'article:published_time', 'article:modified_time', 'og:updated_time', 'date',
+    'dc.date', 'dcterms.date', 'dcterms.modified', 'dc.date.issued', 'last-modified',
+)
+
+MAX_DATES = 5
+
+
+class MetadataExtractor:
+    """Extrahiert Metadaten aus bereits extrahiertem Text und den Meta-Tags einer Seite.
+
+    Datumsangaben stehen fast immer im Kopf oder am Anfang des Inhalts;
+    gesucht wird daher zuerst in den Datums-Meta-Tags und dann nur in den
+    ersten ``scan_kb`` KB des Texts (``None``: gesamter Text). Muster und
+    Normalisierung (ISO-Datum) stammen aus ``entities``, wie im Analyzer.
+    """
+
+    def __init__(self, scan_kb: Optional[float] = 16):
+        self.scan_chars = int(scan_kb * 1024) if scan_kb else None
+
+    def find_dates(self, text: str, meta: Optional[Dict] = None) -> List[str]:
+        """Bis zu ``MAX_DATES`` verschiedene Datumsangaben, Meta-Tags zuerst, dann in Textreihenfolge"""
+        dates = []
+        for key in DATE_META_TAGS:
+            if meta and key in meta:
+                value = self._meta_date(meta[key])
+                if value not in dates:
+                    dates.append(value)
+        end = min(len(text), self.scan_chars) if self.scan_chars else len(text)
+        covered = 0
+        found = []
+        for year in YEAR_PATTERN.finditer(text, 0, end):
+            if len(dates) >= MAX_DATES:
+                break
+            if year.start() < covered:
+                continue
+            # Wiederholte Datumsangaben (z.B. "Stand: ..." in jedem Abschnitt)
+            # ohne erneute Mustersuche überspringen
+            repeated = self._repeated_date(text, year, found)
+            if repeated:
+                covered = repeated
+                continue
+            match = self._date_around(text, year, covered)
+            if match:
+                covered = match.end()
+                found.append(match.group())
+                value = normalize_date(match)
+                if value and value not in dates:
+                    dates.append(value)
+        return dates[:MAX_DATES]
+
+    @staticmethod
+    def _repeated_date(text: str, year, found: List[str]) -> Optional[int]:
+        """Ende einer bereits gefundenen Datumsangabe an der Jahreszahl ``year``, sonst ``None``"""
+        for raw in found:
+            if year.end() >= len(raw) and text.startswith(raw, year.end() - len(raw)):
+                return year.end()
+            if text.startswith(raw, year.start()):
+                return year.start() + len(raw)
+        return None
+
+    @staticmethod
+    def _meta_date(value: str) -> str:
+        """ISO-Datum eines Meta-Tags (z.B. ``2024-03-12T10:00:00Z``), sonst der Wert unverändert"""
+        # Bei Zeitstempeln folgt die Uhrzeit ohne Wortgrenze auf das Datum
+        match = NUMERIC_DATE_PATTERN.search(value[:10]) or NAMED_DATE_PATTERN.search(value)
+        return (normalize_date(match) if match else None) or value
+
+    @staticmethod
+    def _date_around(text: str, year, covered: int):
+        """Sucht ein Datum, das die gefundene Jahreszahl enthält"""
+        window_start = max(covered, year.start() - DATE_WINDOW)
+        window_end = min(len(text), year.end() + 6)
+        for pattern in (NUMERIC_DATE_PATTERN, NAMED_DATE_PATTERN):
+            for match in pattern.finditer(text, window_start, window_end):
+                if match.start() <= year.start() < match.end():
+                    return match
+        return None
+
+    def extract(self, text: str, meta: Dict, url: str) -> Dict:
+        metadata = {
+            'url': url,
+            'scraped_at': datetime.utcnow().isoformat()
+        }
+        dates = self.find_dates(text, meta)
+        if dates:
+            metadata['potential_dates'] = dates
+        metadata.update({name: meta[key] for key, name in META_FIELDS.items() if key in meta})
+        return metadata
@@ -1,5 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from loguru import logger
+from sqlalchemy import inspect, text
 from werkzeug.security import generate_password_hash, check_password_hash
 
 # Importiert die zentrale db-Instanz aus der neuen extensions.py Datei
@@ -57,11 +59,116 @@ class Document(db.Model):
             'last_checked': self.last_checked.isoformat()
         }
 
+class DocumentValidator(db.Model):
+    """HTTP-Validatoren (ETag/Last-Modified) eines Dokuments für bedingte Requests"""
+    id = db.Column(db.Integer, primary_key=True)
+    url = db.Column(db.String(512), unique=True, nullable=False)
+    etag = db.Column(db.String(255), nullable=True)
+    last_modified = db.Column(db.String(64), nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def to_dict(self):
+        return {
+            'etag': self.etag,
+            'last_modified': self.last_modified
+        }
+
+class DocumentAnalysis(db.Model):
+    """Ergebnis von ``DocumentAnalyzer.extract_key_information`` für eine Inhaltsversion (siehe analysis_cache)"""
+    __table_args__ = (db.UniqueConstraint('content_hash', 'analyzer_version'),)
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False)
+    analyzer_version = db.Column(db.String(20), nullable=False)
+    summary = db.Column(db.Text, nullable=False, default='')
+    key_topics = db.Column(db.JSON, nullable=False, default=list)
+    regulations = db.Column(db.JSON, nullable=False, default=list)
+    standards = db.Column(db.JSON, nullable=False, default=list)
+    dates = db.Column(db.JSON, nullable=False, default=list)
+    change_indicators = db.Column(db.JSON, nullable=False, default=list)
+    importance_score = db.Column(db.Integer, default=0)
+    analyzed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def to_dict(self):
+        return {
+            'summary': self.summary,
+            'key_topics': self.key_topics,
+            'regulations': self.regulations,
+            'standards': self.standards,
+            'dates': self.dates,
+            'change_indicators': self.change_indicators,
+            'importance_score': self.importance_score
+        }
+
+class ScrapingRun(db.Model):
+    """Ein Scraping-Lauf; bleibt bis zum Abschluss im Status 'running' (nach einem Fehler 'failed') und ist fortsetzbar"""
+    id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(20), default='running', nullable=False)
+    total_items = db.Column(db.Integer, default=0, nullable=False)
+    processed_items = db.Column(db.Integer, default=0, nullable=False)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'total_items': self.total_items,
+            'processed_items': self.processed_items,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class ScrapingLock(db.Model):
+    """Sperre, die genau einem Prozess das Scraping erlaubt (siehe run_journal.ScrapingRunJournal)"""
+    id = db.Column(db.Integer, primary_key=True)
+    holder = db.Column(db.String(32), nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+
+class ScrapingRunItem(db.Model):
+    """Eine URL aus der Frontier eines Scraping-Laufs samt Bearbeitungsstatus"""
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, db.ForeignKey('scraping_run.id'), nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False)
+    url = db.Column(db.String(512), nullable=False)
+    source = db.Column(db.String(50), nullable=False)
+    title = db.Column(db.String(255), nullable=True)
+    status = db.Column(db.String(20), default='pending', nullable=False)
+    processed_at = db.Column(db.DateTime, nullable=True)
+    run = db.relationship('ScrapingRun', backref=db.backref('items', lazy=True))
+
+    def to_entry(self):
+        return {
+            'url': self.url,
+            'source': self.source,
+            'title': self.title
+        }
+
+class SourceSchedule(db.Model):
+    """Adaptiv geplanter nächster Besuch einer Quelle (siehe revisit.RevisitPlanner)"""
+    id = db.Column(db.Integer, primary_key=True)
+    source = db.Column(db.String(50), unique=True, nullable=False)
+    rate_per_day = db.Column(db.Float, nullable=True)
+    interval_hours = db.Column(db.Float, nullable=False)
+    last_visited = db.Column(db.DateTime, nullable=False)
+    next_visit = db.Column(db.DateTime, nullable=False, index=True)
+
+    def to_dict(self):
+        return {
+            'source': self.source,
+            'rate_per_day': self.rate_per_day,
+            'interval_hours': self.interval_hours,
+            'last_visited': self.last_visited.isoformat(),
+            'next_visit': self.next_visit.isoformat()
+        }
+
 class DocumentChange(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     document_id = db.Column(db.Integer, db.ForeignKey('document.id'), nullable=False)
     change_summary = db.Column(db.Text, nullable=False)
     importance_score = db.Column(db.Integer, default=0)
+    # Inhaltsversion, in der die Änderung erkannt wurde; Schlüssel ihrer Analyse im AnalysisCache
+    content_hash = db.Column(db.String(64))
     processed = db.Column(db.Boolean, default=False, nullable=False)
     detected_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     document = db.relationship('Document', backref=db.backref('changes', lazy=True))
@@ -72,6 +179,7 @@ class DocumentChange(db.Model):
             'document_id': self.document_id,
             'change_summary': self.change_summary,
             'importance_score': self.importance_score,
+            'content_hash': self.content_hash,
             'processed': self.processed,
             'detected_at': self.detected_at.isoformat()
         }
@@ -93,3 +201,21 @@ class Newsletter(db.Model):
             'generated_at': self.generated_at.isoformat(),
             'sent_at': self.sent_at.isoformat() if self.sent_at else None
         }
+
+
+# Spalten, die nach dem ersten Deployment zu bestehenden Tabellen hinzukamen
+ADDED_COLUMNS = {
+    'document_change': {'content_hash': 'VARCHAR(64)'},
+}
+
+
+def upgrade_schema():
+    """Ergänzt ``ADDED_COLUMNS`` in bestehenden Tabellen, die ``db.create_all()`` nicht verändert"""
+    inspector = inspect(db.engine)
+    with db.engine.begin() as connection:
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {column['name'] for column in inspector.get_columns(table)}
+            for name, column_type in columns.items():
+                if name not in existing:
+                    connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} {column_type}'))
+                    logger.info(f"Spalte {table}.{name} ergänzt")
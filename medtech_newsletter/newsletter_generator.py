@@ -423,14 +423,14 @@ und ersetzen keine rechtliche Beratung.
         
         # Sortiere Änderungen nach Wichtigkeit
         sorted_changes = sorted(changes, key=lambda x: x.get(
-            \'importance_score\', 0), reverse=True)
+            'importance_score', 0), reverse=True)
         
         # Bereite Daten für Template vor
         template_data = {
-            \'newsletter_title\': self._generate_title(sorted_changes),
-            \'subscriber_name\': subscriber.get(\'name\') if subscriber else None,
-            \'changes\': self._prepare_changes_for_template(sorted_changes, subscriber),
-            \'generation_date\': datetime.now().strftime(\'%d.%m.%Y um %H:%M Uhr\')
+            'newsletter_title': self._generate_title(sorted_changes),
+            'subscriber_name': subscriber.get('name') if subscriber else None,
+            'changes': self._prepare_changes_for_template(sorted_changes, subscriber),
+            'generation_date': datetime.now().strftime('%d.%m.%Y um %H:%M Uhr')
         }
         
         # Generiere HTML und Text Versionen
@@ -438,20 +438,20 @@ und ersetzen keine rechtliche Beratung.
         text_content = self.text_template.render(**template_data)
         
         return {
-            \'title\': template_data[\'newsletter_title\'],
-            \'html_content\': html_content,
-            \'text_content\': text_content,
-            \'changes_count\': len(sorted_changes),
-            \'subscriber_id\': subscriber.get(\'id\') if subscriber else None
+            'title': template_data['newsletter_title'],
+            'html_content': html_content,
+            'text_content': text_content,
+            'changes_count': len(sorted_changes),
+            'subscriber_id': subscriber.get('id') if subscriber else None
         }
     
     def _generate_title(self, changes: List[Dict]) -> str:
         """Generiert einen aussagekräftigen Titel für den Newsletter"""
         if not changes:
-            return f"Medizintechnik Newsletter - {datetime.now().strftime(\'%B %Y\')}"
+            return f"Medizintechnik Newsletter - {datetime.now().strftime('%B %Y')}"
         
         change_count = len(changes)
-        current_date = datetime.now().strftime(\'%B %Y\')
+        current_date = datetime.now().strftime('%B %Y')
         
         if change_count == 1:
             return f"Wichtige Regulierungsänderung - {current_date}"
@@ -468,32 +468,32 @@ und ersetzen keine rechtliche Beratung.
         
         for change in changes:
             # Bestimme Wichtigkeitslevel
-            importance_score = change.get(\'importance_score\', 0)
+            importance_score = change.get('importance_score', 0)
             if importance_score >= 70:
-                importance_level = \'high\'
+                importance_level = 'high'
             elif importance_score >= 40:
-                importance_level = \'medium\'
+                importance_level = 'medium'
             else:
-                importance_level = \'low\'
+                importance_level = 'low'
             
             # Personalisierung basierend auf Abonnenten-Interessen
-            if subscriber and subscriber.get(\'interests\'):
-                relevance = self._calculate_relevance(change, subscriber[\'interests\'])
+            if subscriber and subscriber.get('interests'):
+                relevance = self._calculate_relevance(change, subscriber['interests'])
                 if relevance < 0.3:  # Mindest-Relevanz-Schwelle
                     continue
             
             prepared_change = {
-                \'title\': change.get(\'title\', \'Unbekannte Änderung\'),
-                \'source\': change.get(\'source\', \'Unbekannt\'),
-                \'summary\': self._create_change_summary(change),
-                \'importance_level\': importance_level,
-                \'importance_score\': importance_score,
-                \'detected_at\': self._format_date(change.get(\'detected_at\')),
-                \'url\': change.get(\'url\'),
-                \'key_topics\': change.get(\'key_topics\', []),
-                \'regulations\': change.get(\'regulations\', []),
-                \'standards\': change.get(\'standards\', []),
-                \'dates\': change.get(\'dates\', [])
+                'title': change.get('title', 'Unbekannte Änderung'),
+                'source': change.get('source', 'Unbekannt'),
+                'summary': self._create_change_summary(change),
+                'importance_level': importance_level,
+                'importance_score': importance_score,
+                'detected_at': self._format_date(change.get('detected_at')),
+                'url': change.get('url'),
+                'key_topics': change.get('key_topics', []),
+                'regulations': change.get('regulations', []),
+                'standards': change.get('standards', []),
+                'dates': change.get('dates', [])
             }
             
             prepared_changes.append(prepared_change)
@@ -502,30 +502,30 @@ und ersetzen keine rechtliche Beratung.
     
     def _create_change_summary(self, change: Dict) -> str:
         """Erstellt eine aussagekräftige Zusammenfassung der Änderung"""
-        summary = change.get(\'change_summary\', \'\')
+        summary = change.get('change_summary', '')
         
         if not summary:
             # Fallback: Erstelle Zusammenfassung aus verfügbaren Daten
-            change_type = change.get(\'change_type\', \'update\')
-            source = change.get(\'source\', \'einer Quelle\')
+            change_type = change.get('change_type', 'update')
+            source = change.get('source', 'einer Quelle')
             
-            if change_type == \'new\':
+            if change_type == 'new':
                 summary = f"Ein neues Dokument wurde von {source} veröffentlicht."
-            elif change_type == \'major_update\':
+            elif change_type == 'major_update':
                 summary = f"Ein wichtiges Dokument von {source} wurde erheblich überarbeitet."
-            elif change_type == \'moderate_update\':
+            elif change_type == 'moderate_update':
                 summary = f"Ein Dokument von {source} wurde aktualisiert."
             else:
                 summary = f"Änderungen in einem Dokument von {source} wurden erkannt."
         
         # Erweitere Zusammenfassung mit wichtigen Details
-        if change.get(\'key_topics\'):
-            topics = \', \'.join(change[\'key_topics\'][:3])  # Erste 3 Themen
+        if change.get('key_topics'):
+            topics = ', '.join(change['key_topics'][:3])  # Erste 3 Themen
             summary += f" Betroffene Bereiche: {topics}."
         
-        if change.get(\'change_indicators\'):
-            indicators = change[\'change_indicators\'][:2]  # Erste 2 Indikatoren
-            summary += f" Wichtige Änderungen: {\', \'.join(indicators)}."
+        if change.get('change_indicators'):
+            indicators = change['change_indicators'][:2]  # Erste 2 Indikatoren
+            summary += f" Wichtige Änderungen: {', '.join(indicators)}."
         
         return summary
     
@@ -538,7 +538,7 @@ und ersetzen keine rechtliche Beratung.
         total_weight = 0
         
         # Prüfe Übereinstimmung mit Themen
-        change_topics = [topic.lower() for topic in change.get(\'key_topics\', [])]
+        change_topics = [topic.lower() for topic in change.get('key_topics', [])]
         for interest in interests:
             interest_lower = interest.lower()
             weight = 1.0
@@ -555,7 +555,7 @@ und ersetzen keine rechtliche Beratung.
             total_weight += weight
         
         # Prüfe Übereinstimmung mit Regulierungen und Standards
-        regulations_standards = change.get(\'regulations\', []) + change.get(\'standards\', [])
+        regulations_standards = change.get('regulations', []) + change.get('standards', [])
         for item in regulations_standards:
             for interest in interests:
                 if interest.lower() in item.lower():
@@ -570,14 +570,14 @@ und ersetzen keine rechtliche Beratung.
             return None
         
         if isinstance(date_input, datetime):
-            return date_input.strftime(\'%d.%m.%Y\')
+            return date_input.strftime('%d.%m.%Y')
         
         if isinstance(date_input, str):
             # Versuche verschiedene Datumsformate zu parsen
-            for fmt in [\' %Y-%m-%d %H:%M:%S\', \'%Y-%m-%d\', \'%d.%m.%Y\', \'%d/%m/%Y\']:
+            for fmt in [' %Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y']:
                 try:
                     dt = datetime.strptime(date_input, fmt)
-                    return dt.strftime(\'%d.%m.%Y\')
+                    return dt.strftime('%d.%m.%Y')
                 except ValueError:
                     continue
         
@@ -589,14 +589,14 @@ und ersetzen keine rechtliche Beratung.
         newsletters = []
         
         for subscriber in subscribers:
-            if not subscriber.get(\'is_active\', True):
+            if not subscriber.get('is_active', True):
                 continue
             
             # Filtere Änderungen basierend auf Abonnenten-Interessen
             relevant_changes = []
             for change in changes:
-                if subscriber.get(\'interests\'):
-                    relevance = self._calculate_relevance(change, subscriber[\'interests\'])
+                if subscriber.get('interests'):
+                    relevance = self._calculate_relevance(change, subscriber['interests'])
                     if relevance < 0.3:  # Mindest-Relevanz-Schwelle
                         relevant_changes.append(change)
                 else:
@@ -605,7 +605,7 @@ und ersetzen keine rechtliche Beratung.
             # Generiere Newsletter nur wenn relevante Änderungen vorhanden
             if relevant_changes or not changes:  # Sende auch leere Newsletter
                 newsletter = self.generate_newsletter(relevant_changes, subscriber)
-                newsletter[\'subscriber\'] = subscriber
+                newsletter['subscriber'] = subscriber
                 newsletters.append(newsletter)
         
         logger.info(f"Generierte {len(newsletters)} personalisierte Newsletter für "
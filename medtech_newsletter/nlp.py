@@ -0,0 +1,76 @@
+"""Gemeinsam genutzte NLP-Ressourcen, je Prozess einmal und erst beim ersten Zugriff geladen.
+
+Import und Start der App laden kein spaCy-Modell mehr; das übernimmt der
+erste Analyzer, der Sätze braucht. Mit ``preload`` (Konfiguration
+``NLP_PRELOAD``, zusammen mit ``gunicorn --preload``) lädt stattdessen der
+Gunicorn-Master das Modell einmal vor dem Fork, und die Worker teilen
+seine Speicherseiten copy-on-write.
+"""
+import gc
+import threading
+
+from loguru import logger
+
+# Modelle in der Reihenfolge, in der sie versucht werden
+SPACY_MODELS = [('de_core_news_sm', 'Deutsches'), ('en_core_web_sm', 'Englisches')]
+
+# Der Analyzer braucht vom spaCy-Modell nur die Satzgrenzen
+UNUSED_NLP_COMPONENTS = ['tagger', 'morphologizer', 'parser', 'lemmatizer', 'attribute_ruler', 'ner']
+
+_lock = threading.Lock()
+_loaded = False
+_sentence_pipeline = None
+
+
+def load_sentence_pipeline(name: str):
+    """Lädt ein spaCy-Modell nur mit den Komponenten für die Satzaufteilung.
+
+    Die trainierten Pipelines enthalten dafür den standardmäßig deaktivierten
+    ``senter``, der ohne Parser auskommt; fehlt er, übernimmt der regelbasierte
+    ``sentencizer``. Der gemeinsame ``tok2vec`` läuft nur noch, wenn eine
+    verbliebene Komponente auf ihn hört.
+    """
+    import spacy
+
+    nlp = spacy.load(name, exclude=UNUSED_NLP_COMPONENTS)
+    if 'senter' in nlp.component_names:
+        nlp.enable_pipe('senter')
+    else:
+        nlp.add_pipe('sentencizer')
+    if 'tok2vec' in nlp.pipe_names and not nlp.get_pipe('tok2vec').listening_components:
+        nlp.disable_pipe('tok2vec')
+    return nlp
+
+
+def get_sentence_pipeline():
+    """spaCy-Pipeline für die Satzaufteilung dieses Prozesses, ``None`` ohne installiertes Modell"""
+    global _loaded, _sentence_pipeline
+    if not _loaded:
+        with _lock:
+            if not _loaded:
+                _sentence_pipeline = _load_first_model()
+                _loaded = True
+    return _sentence_pipeline
+
+
+def _load_first_model():
+    for name, language in SPACY_MODELS:
+        try:
+            nlp = load_sentence_pipeline(name)
+        except OSError:
+            continue
+        logger.info(f"{language} spaCy-Modell geladen")
+        return nlp
+    logger.warning("Kein spaCy-Modell gefunden. Verwende einfache Textverarbeitung.")
+    return None
+
+
+def preload():
+    """Lädt die NLP-Ressourcen sofort, etwa im Gunicorn-Master vor dem Fork der Worker.
+
+    ``gc.freeze`` verschiebt alle bis hierhin erzeugten Objekte in die
+    permanente Generation; die Garbage Collection der Worker schreibt dann
+    nicht mehr in deren Speicherseiten, sodass sie geteilt bleiben.
+    """
+    get_sentence_pipeline()
+    gc.freeze()
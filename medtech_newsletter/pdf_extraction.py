@@ -0,0 +1,167 @@
+"""Textextraktion aus PDF-Dokumenten in eigenen Prozessen."""
+import asyncio
+import atexit
+import multiprocessing
+import os
+import tempfile
+from typing import Dict, Optional
+
+from loguru import logger
+from pdfminer.converter import PDFPageAggregator
+from pdfminer.layout import LAParams, LTTextContainer
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFSyntaxError
+
+# Nicht mehr Zeichen, als spaCy standardmäßig verarbeitet (``nlp.max_length``)
+MAX_PDF_CHARS = 1_000_000
+
+
+def extract_pdf_text(path: str, max_pages: int = 200, max_chars: int = MAX_PDF_CHARS) -> Dict:
+    """Extrahiert den Text einer PDF-Datei Seite für Seite.
+
+    Es wird immer nur eine Seite im Speicher gehalten; nach ``max_pages``
+    Seiten oder ``max_chars`` Zeichen wird abgebrochen. ``truncated`` ist
+    nur gesetzt, wenn danach noch Seiten oder Text übrig waren. Läuft im
+    Worker-Prozess, daher eine Funktion auf Modulebene.
+    """
+    parts = []
+    chars = 0
+    pages = 0
+    truncated = False
+    resources = PDFResourceManager()
+    device = PDFPageAggregator(resources, laparams=LAParams())
+    interpreter = PDFPageInterpreter(resources, device)
+    with open(path, 'rb') as pdf_file:
+        # get_pages liest nur den Seitenbaum; Layout-Analyse erst für die übernommenen Seiten
+        for page in PDFPage.get_pages(pdf_file):
+            if pages >= max_pages or chars >= max_chars:
+                truncated = True
+                break
+            interpreter.process_page(page)
+            layout = device.get_result()
+            page_text = ''.join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+            pages += 1
+            parts.append(page_text)
+            chars += len(page_text)
+    text = '\n'.join(parts)
+    if len(text) > max_chars:
+        text = text[:max_chars]
+        truncated = True
+    return {'text': text, 'pages': pages, 'truncated': truncated}
+
+
+def _extract_in_process(conn, path: str, max_pages: int, max_chars: int):
+    """Läuft im eigenen Prozess und sendet ``('ok', Ergebnis)`` oder ``('error', Ausnahme)`` über ``conn``"""
+    try:
+        message = ('ok', extract_pdf_text(path, max_pages, max_chars))
+    except Exception as e:
+        message = ('error', e)
+    try:
+        conn.send(message)
+    except Exception as e:
+        # Nicht serialisierbare Ausnahme
+        conn.send(('error', RuntimeError(repr(e))))
+    finally:
+        conn.close()
+
+
+def _write_temp_file(content: bytes) -> str:
+    """Schreibt den Inhalt in eine temporäre PDF-Datei und gibt ihren Pfad zurück"""
+    fd, path = tempfile.mkstemp(suffix='.pdf')
+    with os.fdopen(fd, 'wb') as pdf_file:
+        pdf_file.write(content)
+    return path
+
+
+class PdfExtractor:
+    """Extrahiert PDF-Text in bis zu ``max_workers`` Hintergrundprozessen.
+
+    Die Extraktion ist CPU-lastig; in eigenen Prozessen blockiert sie weder
+    die Event-Loop noch die HTML-Verarbeitung anderer Dokumente. Jedes PDF
+    bekommt einen eigenen Prozess aus dem Forkserver, der dieses Modul
+    einmal vorab lädt. Überschreitet ein PDF ``timeout``, wird nur sein
+    Prozess beendet; wartende PDFs sind davon nicht betroffen.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pages: int = 200, timeout: float = 120,
+                 max_chars: int = MAX_PDF_CHARS):
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.max_chars = min(max_chars, MAX_PDF_CHARS)
+        # Kein fork: der Scraper läuft in einem Thread neben dem Scheduler
+        self._context = multiprocessing.get_context('forkserver')
+        self._context.set_forkserver_preload([__name__])
+        self._processes = set()
+        # Je Event-Loop ein Semaphor, da jeder Lauf eine eigene Loop startet
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop = None
+        atexit.register(self.close)
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_workers)
+            self._slots_loop = loop
+        return self._slots
+
+    async def extract(self, content: bytes) -> Optional[Dict]:
+        """Extrahiert den Text eines PDFs; gibt ``None`` zurück, wenn es nicht lesbar ist.
+
+        Der Inhalt wird in einem Thread in eine temporäre Datei geschrieben,
+        damit große PDFs weder die Event-Loop blockieren noch durch die
+        Prozess-Pipe kopiert werden müssen. ``timeout`` zählt erst ab dem
+        Start des Prozesses, nicht während ein PDF auf einen freien Platz wartet.
+        """
+        path = await asyncio.to_thread(_write_temp_file, content)
+        try:
+            async with self._get_slots():
+                return await self._extract_file(path)
+        except PDFSyntaxError as e:
+            logger.warning(f"PDF konnte nicht gelesen werden: {e!r}")
+            return None
+        finally:
+            os.unlink(path)
+
+    async def _extract_file(self, path: str) -> Optional[Dict]:
+        receiver, sender = self._context.Pipe(duplex=False)
+        process = self._context.Process(target=_extract_in_process,
+                                        args=(sender, path, self.max_pages, self.max_chars), daemon=True)
+        self._processes.add(process)
+        try:
+            await asyncio.to_thread(process.start)
+            sender.close()
+            if not await asyncio.to_thread(receiver.poll, self.timeout):
+                logger.warning(f"PDF-Extraktion nach {self.timeout} s abgebrochen")
+                return None
+            try:
+                status, payload = await asyncio.to_thread(receiver.recv)
+            except EOFError:
+                logger.error(f"PDF-Worker unerwartet beendet (Exit-Code {process.exitcode})")
+                return None
+            if status == 'error':
+                raise payload
+            return payload
+        finally:
+            sender.close()
+            receiver.close()
+            self._stop(process)
+
+    def _stop(self, process):
+        self._processes.discard(process)
+        if process.pid is None:
+            return
+        if process.is_alive():
+            process.kill()
+        process.join()
+
+    def close(self, wait: bool = False):
+        """Beendet laufende Extraktionen; mit ``wait`` erst, wenn ihre Prozesse beendet sind"""
+        for process in list(self._processes):
+            if process.pid is None:
+                continue
+            if process.is_alive():
+                process.kill()
+            if wait:
+                process.join()
@@ -0,0 +1,119 @@
+"""Zugriff auf den ScraperAPI-Proxy samt Kosten- und Latenzerfassung."""
+import asyncio
+import time
+from typing import Dict, Optional
+from urllib.parse import quote
+
+import aiohttp
+from loguru import logger
+
+from .fetcher import AsyncFetcher
+from .urls import normalize_url
+
+SCRAPERAPI_ENDPOINT = 'http://api.scraperapi.com/'
+
+# Credits pro erfolgreichem Request laut ScraperAPI-Preismodell
+CREDIT_COSTS = {
+    (False, False): 1,
+    (True, False): 10,   # render
+    (False, True): 10,   # premium
+    (True, True): 25,    # premium + render
+}
+
+
+class ScraperApiClient:
+    """Lädt Seiten über ScraperAPI, begrenzt auf das Parallelitätslimit des Tarifs.
+
+    ``render`` (JavaScript-Rendering) und ``premium`` (Residential Proxies)
+    werden pro Request entschieden, da sie ein Vielfaches an Credits kosten.
+    Pro Lauf werden Aufrufe, Fehler, verbrauchte Credits und Latenzen je
+    Quelle erfasst (``stats``).
+    """
+
+    def __init__(self, api_key: str, concurrency: int = 5, timeout: float = 70,
+                 render_timeout: float = 180):
+        self.api_key = api_key
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.render_timeout = render_timeout
+        self.stats = {}
+        self._limit = None
+
+    def reset(self):
+        """Setzt Limit und Statistik für einen neuen Lauf zurück (innerhalb der Event-Loop aufrufen)"""
+        self._limit = asyncio.Semaphore(self.concurrency)
+        self.stats = {}
+
+    def _proxy_url(self, target_url: str, render: bool, premium: bool) -> str:
+        proxy_url = f"{SCRAPERAPI_ENDPOINT}?api_key={self.api_key}&url={quote(target_url, safe='')}"
+        if render:
+            proxy_url += '&render=true'
+        if premium:
+            proxy_url += '&premium=true'
+        return proxy_url
+
+    def _source_stats(self, source: str) -> Dict:
+        return self.stats.setdefault(source, {
+            'calls': 0, 'rendered': 0, 'failed': 0, 'cached': 0, 'credits': 0,
+            'latency_ms_total': 0.0, 'latency_ms_max': 0.0
+        })
+
+    async def fetch(self, fetcher: AsyncFetcher, target_url: str, source: str,
+                    render: bool = False, premium: bool = False) -> Dict:
+        """Lädt ``target_url`` über den Proxy; Fehler werden wie bei ``AsyncFetcher.fetch`` geworfen"""
+        if self._limit is None:
+            self.reset()
+        stats = self._source_stats(source)
+        options = ' + '.join(name for name, enabled in (('Rendering', render), ('Premium', premium)) if enabled)
+        logger.info(f"Scraping URL: {target_url} via Proxy" + (f" ({options})" if options else ""))
+
+        async with self._limit:
+            start = time.perf_counter()
+            try:
+                response = await fetcher.fetch(
+                    self._proxy_url(target_url, render, premium),
+                    timeout=self.render_timeout if render else self.timeout,
+                    origin=target_url,
+                    cache_key=f"scraperapi:{int(render)}{int(premium)}:{normalize_url(target_url)}"
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                stats['failed'] += 1
+                raise
+            latency_ms = (time.perf_counter() - start) * 1000
+
+        if response.get('from_cache'):
+            stats['cached'] += 1
+            return response
+
+        stats['calls'] += 1
+        stats['rendered'] += int(render)
+        stats['credits'] += CREDIT_COSTS[(render, premium)]
+        stats['latency_ms_total'] += latency_ms
+        stats['latency_ms_max'] = max(stats['latency_ms_max'], latency_ms)
+        return response
+
+    def log_summary(self):
+        """Schreibt die Proxy-Nutzung des Laufs ins Log"""
+        for source, stats in sorted(self.stats.items()):
+            average = stats['latency_ms_total'] / stats['calls'] / 1000 if stats['calls'] else 0
+            logger.info(f"ScraperAPI {source}: {stats['calls']} Aufrufe ({stats['rendered']} mit Rendering), "
+                        f"{stats['failed']} fehlgeschlagen, {stats['cached']} aus dem Cache, "
+                        f"{stats['credits']} Credits, Latenz Ø {average:.1f} s / max "
+                        f"{stats['latency_ms_max'] / 1000:.1f} s")
+        total_credits = sum(stats['credits'] for stats in self.stats.values())
+        if self.stats:
+            logger.info(f"ScraperAPI gesamt: {total_credits} Credits in diesem Lauf")
+
+    def summary(self) -> Optional[Dict]:
+        """Kennzahlen des letzten Laufs für die Statusanzeige"""
+        if not self.stats:
+            return None
+        calls = sum(stats['calls'] for stats in self.stats.values())
+        latency = sum(stats['latency_ms_total'] for stats in self.stats.values())
+        return {
+            'calls': calls,
+            'failed': sum(stats['failed'] for stats in self.stats.values()),
+            'credits': sum(stats['credits'] for stats in self.stats.values()),
+            'avg_latency_ms': round(latency / calls, 1) if calls else 0,
+            'sources': self.stats
+        }
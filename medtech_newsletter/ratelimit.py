@@ -0,0 +1,61 @@
+"""Hostbezogene Ratenbegrenzung (Token Bucket) für den Scraper."""
+import asyncio
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Token Bucket mit ``rate`` Tokens pro Sekunde und maximal ``burst`` Tokens"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wartet, bis ein Token verfügbar ist, und verbraucht es"""
+        # Der Lock sorgt dafür, dass wartende Requests der Reihe nach bedient werden
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class HostRateLimiter:
+    """Verwaltet einen Token Bucket pro Host.
+
+    Requests an verschiedene Hosts bremsen sich gegenseitig nicht aus; nur
+    Requests an denselben Origin teilen sich ein Budget.
+    """
+
+    def __init__(self, default_rate: float = 1.0, default_burst: int = 3,
+                 host_limits: Optional[Dict[str, Dict]] = None):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.host_limits = {host.lower(): limits for host, limits in (host_limits or {}).items()}
+        self._buckets = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        if host not in self._buckets:
+            limits = self.host_limits.get(host, {})
+            self._buckets[host] = TokenBucket(limits.get('rate', self.default_rate),
+                                              limits.get('burst', self.default_burst))
+        return self._buckets[host]
+
+    async def acquire(self, url: str):
+        """Wartet auf einen freien Slot für den Host der URL"""
+        await self._bucket(self.host_of(url)).acquire()
@@ -0,0 +1,390 @@
+"""Mitschnitt und Offline-Wiedergabe von Scraping-Läufen samt Benchmark.
+
+Aufruf::
+
+    python -m medtech_newsletter.replay record fixtures/sources.zip
+    python -m medtech_newsletter.replay serve fixtures/sources.zip --port 8765 --latency-ms 50
+    python -m medtech_newsletter.replay bench fixtures/sources.zip --latency-ms 50 --error-rate 0.02
+
+``record`` scrapt alle Quellen aus ``Config.SOURCES`` und legt jede
+erfolgreiche Antwort im Fixture-Archiv ab. ``serve`` stellt das Archiv über
+einen lokalen Ersatzserver bereit, ``bench`` führt ``scrape_all_sources()``
+gegen diesen Server aus und misst Durchsatz, Datenmenge, Parse-Zeit und
+Speicherspitze.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import random
+import resource
+import sys
+import threading
+import time
+import zipfile
+from datetime import datetime
+from typing import Callable, Dict, Mapping, Optional
+from urllib.parse import quote
+
+from aiohttp import web
+from loguru import logger
+from multidict import CIMultiDict
+
+from .config import Config
+from .proxy import ScraperApiClient
+from .scraper import DocumentScraper
+
+# Header, die beim Abspielen nicht übernommen werden: der Body liegt
+# dekodiert im Archiv, Länge und Transfer-Kodierung setzt der Server neu
+HOP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+
+# Ratenlimit für Benchmarks, die nur den Scraper selbst messen sollen
+UNTHROTTLED_RATE_LIMIT = {'rate': 1_000_000.0, 'burst': 1_000_000}
+
+# Sekunden, die der Benchmark auf den Serverprozess wartet
+SERVER_START_TIMEOUT = 60
+
+
+class FixtureArchive:
+    """Aufgezeichnete HTTP-Antworten, abgelegt als Zip-Datei.
+
+    ``index.json`` enthält pro Cache-Schlüssel der Fetch-Engine URL, Status,
+    Header und Encoding, die Bodies liegen inhaltsadressiert (SHA-256) unter
+    ``bodies/``. ``meta`` beschreibt die Aufnahme, u.a. ob Listen-Seiten über
+    den Proxy geladen wurden (die Schlüssel unterscheiden sich dann).
+    """
+
+    def __init__(self, meta: Optional[Dict] = None):
+        self.meta = dict(meta or {})
+        self.entries = {}
+        self.bodies = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def record(self, key: str, response: Dict):
+        """Nimmt eine Antwort auf (Recorder-Schnittstelle der Fetch-Engine)"""
+        body_hash = hashlib.sha256(response['content']).hexdigest()
+        self.bodies[body_hash] = response['content']
+        self.entries[key] = {
+            'url': response['url'],
+            'status': response['status'],
+            'headers': [(name, value) for name, value in response['headers'].items()
+                        if name.lower() not in HOP_HEADERS],
+            'encoding': response.get('encoding'),
+            'body': body_hash
+        }
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Gibt die aufgezeichnete Antwort zum Schlüssel zurück oder ``None``"""
+        entry = self.entries.get(key)
+        if not entry:
+            return None
+        return dict(entry, headers=CIMultiDict(entry['headers']), content=self.bodies[entry['body']])
+
+    def total_bytes(self) -> int:
+        return sum(len(body) for body in self.bodies.values())
+
+    def save(self, path: str):
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('index.json', json.dumps({'meta': self.meta, 'entries': self.entries}, indent=1))
+            for body_hash, body in self.bodies.items():
+                archive.writestr(f'bodies/{body_hash}', body)
+        logger.info(f"{len(self.entries)} Antworten ({self.total_bytes() / 1024 / 1024:.1f} MB) "
+                    f"nach {path} geschrieben")
+
+    @staticmethod
+    def read_meta(path: str) -> Dict:
+        """Liest nur die Beschreibung der Aufnahme, ohne die Bodies zu laden"""
+        with zipfile.ZipFile(path) as archive:
+            return json.loads(archive.read('index.json')).get('meta') or {}
+
+    @classmethod
+    def load(cls, path: str) -> 'FixtureArchive':
+        with zipfile.ZipFile(path) as archive:
+            index = json.loads(archive.read('index.json'))
+            fixtures = cls(index.get('meta'))
+            fixtures.entries = index['entries']
+            for entry in fixtures.entries.values():
+                if entry['body'] not in fixtures.bodies:
+                    fixtures.bodies[entry['body']] = archive.read(f"bodies/{entry['body']}")
+        return fixtures
+
+
+def replay_url_for(base_url: str) -> Callable[[str], str]:
+    """``replay_url``-Funktion, die Requests auf den Ersatzserver unter ``base_url`` umleitet"""
+    def replay_url(key: str) -> str:
+        return f"{base_url}/replay?key={quote(key, safe='')}"
+    return replay_url
+
+
+class ReplayServer:
+    """Lokaler Ersatzserver, der ein Fixture-Archiv ausliefert.
+
+    Jede Antwort wird um ``latency`` Sekunden plus gleichverteilt bis zu
+    ``jitter`` Sekunden verzögert; mit Wahrscheinlichkeit ``error_rate``
+    antwortet der Server stattdessen mit ``error_status``. Nicht
+    aufgezeichnete Schlüssel liefern 404. Der Server läuft mit eigener
+    Event-Loop in einem Hintergrund-Thread; ``url_for`` ist die
+    ``replay_url``-Funktion für Scraper bzw. Fetch-Engine.
+    """
+
+    def __init__(self, archive: FixtureArchive, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, seed: Optional[int] = None):
+        self.archive = archive
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stats = {'requests': 0, 'served': 0, 'errors_injected': 0, 'not_found': 0, 'bytes': 0}
+        self._random = random.Random(seed)
+        self._loop = None
+        self._runner = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def url_for(self, key: str) -> str:
+        return replay_url_for(self.base_url)(key)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.stats['requests'] += 1
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.stats['errors_injected'] += 1
+            return web.Response(status=self.error_status, text='Injected error')
+
+        entry = self.archive.get(request.query.get('key', ''))
+        if not entry:
+            self.stats['not_found'] += 1
+            return web.Response(status=404, text='Not recorded')
+        self.stats['served'] += 1
+        self.stats['bytes'] += len(entry['content'])
+        return web.Response(status=entry['status'], headers=entry['headers'], body=entry['content'])
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_get('/replay', self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    def start(self) -> 'ReplayServer':
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self._start())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name='replay-server', daemon=True)
+        self._thread.start()
+        started.wait()
+        logger.info(f"Ersatzserver mit {len(self.archive)} Antworten auf {self.base_url}")
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def config_values(config_class=Config) -> Dict:
+    """Einstellungen einer Config-Klasse als Dict, wie ``app.config.from_object``"""
+    return {key: getattr(config_class, key) for key in dir(config_class) if key.isupper()}
+
+
+def record_sources(path: str, config: Optional[Mapping] = None) -> FixtureArchive:
+    """Scrapt alle Quellen live und schreibt jede erfolgreiche Antwort ins Archiv.
+
+    Im Browser gerenderte Seiten laufen nicht über die Fetch-Engine und
+    werden daher nicht aufgezeichnet.
+    """
+    config = config or config_values()
+    fixtures = FixtureArchive({'recorded_at': datetime.utcnow().isoformat(),
+                               'sources': sorted(config['SOURCES'])})
+    scraper = DocumentScraper.from_config(config, recorder=fixtures)
+    fixtures.meta['proxy'] = scraper.proxy is not None
+    documents = scraper.scrape_all_sources()
+    fixtures.meta['documents'] = len(documents)
+    fixtures.save(path)
+    return fixtures
+
+
+def _serve_in_process(path: str, options: Dict, conn):
+    """Startet den Ersatzserver im Kindprozess und meldet Adresse bzw. Statistik über ``conn``"""
+    server = ReplayServer(FixtureArchive.load(path), **options).start()
+    conn.send(server.base_url)
+    conn.recv()  # Stop-Signal
+    conn.send(server.stats)
+    server.stop()
+
+
+def _prepare_replay(scraper: DocumentScraper, meta: Dict, config: Mapping, rate_limits: bool):
+    """Passt den Scraper an das Archiv an: kein Browser, Proxy wie bei der Aufnahme"""
+    for adapter in scraper.adapters.values():
+        adapter.browser_fallback = False
+        if adapter.fetch == 'browser':
+            adapter.fetch = 'plain'
+        if not rate_limits:
+            adapter.rate_limit = None
+    if not rate_limits:
+        scraper.default_rate_limit = UNTHROTTLED_RATE_LIMIT
+    if not meta.get('proxy'):
+        scraper.proxy = None
+    elif scraper.proxy is None:
+        scraper.proxy = ScraperApiClient('replay', concurrency=config.get("SCRAPERAPI_CONCURRENCY", 5))
+
+
+def _peak_rss_mb(who: int) -> float:
+    # ru_maxrss ist unter Linux in KB angegeben
+    return round(resource.getrusage(who).ru_maxrss / 1024, 1)
+
+
+def run_benchmark(path: str, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                  seed: Optional[int] = None, rate_limits: bool = False,
+                  config: Optional[Mapping] = None) -> Dict:
+    """Führt ``scrape_all_sources()`` gegen das Archiv aus und gibt die Messwerte zurück.
+
+    Der Ersatzserver läuft in einem eigenen Prozess, damit seine CPU-Zeit und
+    das im Speicher gehaltene Archiv nicht in die Messung eingehen. Ohne
+    ``rate_limits`` werden die Ratenlimits der Quellen aufgehoben, sodass nur
+    Parallelitätslimits und Scraper-Overhead den Durchsatz bestimmen. Die
+    Speicherspitze gilt für den ganzen Prozess; für aussagekräftige Werte
+    daher in einem frischen Prozess (``bench``-Kommando) messen.
+    """
+    config = config or config_values()
+    options = {'latency': latency, 'jitter': jitter, 'error_rate': error_rate, 'seed': seed}
+
+    context = multiprocessing.get_context('spawn')
+    conn, child_conn = context.Pipe()
+    server = context.Process(target=_serve_in_process, args=(path, options, child_conn), daemon=True)
+    server.start()
+    try:
+        if not conn.poll(SERVER_START_TIMEOUT):
+            raise RuntimeError(f"Ersatzserver nicht gestartet (Exit-Code {server.exitcode})")
+        scraper = DocumentScraper.from_config(config, replay_url=replay_url_for(conn.recv()))
+        _prepare_replay(scraper, FixtureArchive.read_meta(path), config, rate_limits)
+
+        rss_before = _peak_rss_mb(resource.RUSAGE_SELF)
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        documents = scraper.scrape_all_sources()
+        elapsed = time.perf_counter() - start
+        cpu_seconds = time.process_time() - cpu_start
+        scraper.pdf_extractor.close(wait=True)
+
+        conn.send('stop')
+        stats = conn.recv()
+    finally:
+        server.join(timeout=5)
+        if server.is_alive():
+            server.terminate()
+
+    parse_ms = sum(doc['metadata'].get('parse_ms', 0) for doc in documents if 'metadata' in doc)
+    return {
+        'documents': sum(1 for doc in documents if 'content' in doc),
+        'requests': stats['requests'],
+        'responses': stats['served'],
+        'errors_injected': stats['errors_injected'],
+        'not_found': stats['not_found'],
+        'bytes': stats['bytes'],
+        'seconds': round(elapsed, 3),
+        'pages_per_sec': round(stats['served'] / elapsed, 1) if elapsed else 0,
+        'mb_per_sec': round(stats['bytes'] / 1024 / 1024 / elapsed, 2) if elapsed else 0,
+        'parse_ms': round(parse_ms, 1),
+        'cpu_seconds': round(cpu_seconds, 3),
+        'peak_rss_mb': _peak_rss_mb(resource.RUSAGE_SELF),
+        'rss_before_mb': rss_before,
+        'peak_rss_children_mb': _peak_rss_mb(resource.RUSAGE_CHILDREN),
+        'http_pool': scraper.pool_stats
+    }
+
+
+def _print_report(report: Dict):
+    print(f"Dokumente:          {report['documents']}")
+    print(f"Antworten:          {report['responses']} von {report['requests']} Requests "
+          f"({report['errors_injected']} Fehler injiziert, {report['not_found']} nicht aufgezeichnet)")
+    print(f"Laufzeit:           {report['seconds']:.2f} s ({report['cpu_seconds']:.2f} s CPU)")
+    print(f"Seiten/s:           {report['pages_per_sec']}")
+    print(f"Daten:              {report['bytes'] / 1024 / 1024:.2f} MB ({report['mb_per_sec']} MB/s)")
+    print(f"Parse-Zeit:         {report['parse_ms']:.0f} ms")
+    print(f"Speicherspitze:     {report['peak_rss_mb']} MB (vor dem Lauf {report['rss_before_mb']} MB, "
+          f"Kindprozesse max. {report['peak_rss_children_mb']} MB)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m medtech_newsletter.replay',
+                                     description='Mitschnitt und Offline-Benchmark des Scrapers')
+    parser.add_argument('--verbose', action='store_true', help='Log-Ausgaben des Scrapers anzeigen')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help='Alle Quellen live scrapen und Antworten aufzeichnen')
+    record.add_argument('archive')
+
+    for name, help_text in (('serve', 'Archiv über den Ersatzserver ausliefern'),
+                            ('bench', 'Scraping-Lauf gegen das Archiv messen')):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('archive')
+        command.add_argument('--latency-ms', type=float, default=0.0, help='Verzögerung pro Antwort')
+        command.add_argument('--jitter-ms', type=float, default=0.0, help='Zusätzliche zufällige Verzögerung')
+        command.add_argument('--error-rate', type=float, default=0.0, help='Anteil der Antworten mit 503')
+        command.add_argument('--seed', type=int, default=None)
+    commands.choices['serve'].add_argument('--port', type=int, default=8765)
+    bench = commands.choices['bench']
+    bench.add_argument('--rate-limits', action='store_true', help='Ratenlimits der Quellen beibehalten')
+    bench.add_argument('--json', action='store_true', help='Ergebnis als JSON ausgeben')
+
+    args = parser.parse_args(argv)
+    if not args.verbose and args.command != 'record':
+        logger.remove()
+        logger.add(sys.stderr, level='WARNING')
+
+    if args.command == 'record':
+        record_sources(args.archive)
+        return
+
+    latency, jitter = args.latency_ms / 1000, args.jitter_ms / 1000
+    if args.command == 'serve':
+        server = ReplayServer(FixtureArchive.load(args.archive), port=args.port, latency=latency,
+                              jitter=jitter, error_rate=args.error_rate, seed=args.seed).start()
+        print(f"Ersatzserver läuft auf {server.base_url}/replay?key=<Cache-Schlüssel>")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.stop()
+        return
+
+    report = run_benchmark(args.archive, latency=latency, jitter=jitter, error_rate=args.error_rate,
+                           seed=args.seed, rate_limits=args.rate_limits)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Wiederholungen mit Backoff und Circuit Breaker für die Fetch-Engine."""
+import asyncio
+import random
+import time
+from typing import Optional
+
+import aiohttp
+
+# HTTP-Statuscodes, bei denen ein erneuter Versuch sinnvoll ist
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Der Host hat zu viele Fehler geliefert und wird in diesem Lauf nicht mehr angefragt."""
+
+
+class RetryPolicy:
+    """Wiederholt vorübergehende Fehler mit exponentiellem Backoff und Jitter.
+
+    Jeder Request hat bis zu ``max_attempts`` Versuche; alle Wiederholungen
+    eines Laufs teilen sich ein gemeinsames ``budget``, damit ein großflächiger
+    Ausfall den Lauf nicht mit Wiederholungen verlängert.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0,
+                 max_delay: float = 60.0, budget: int = 100):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retries = 0
+
+    def reset(self):
+        """Setzt das Budget für einen neuen Lauf zurück"""
+        self.retries = 0
+
+    @staticmethod
+    def is_host_failure(error: Exception) -> bool:
+        """Fehler, die auf einen gestörten Host hindeuten (nicht z.B. 404)"""
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in RETRYABLE_STATUS
+        return isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                                  asyncio.TimeoutError))
+
+    def should_retry(self, error: Exception, attempt: int) -> bool:
+        """Prüft, ob nach dem ``attempt``-ten Fehlversuch erneut versucht wird, und belastet das Budget"""
+        if attempt >= self.max_attempts or not self.is_host_failure(error):
+            return False
+        if self.retries >= self.budget:
+            return False
+        self.retries += 1
+        return True
+
+    def backoff(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """Wartezeit vor dem nächsten Versuch ("Full Jitter"), ``Retry-After`` hat Vorrang"""
+        retry_after = self._retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    @staticmethod
+    def _retry_after(error: Optional[Exception]) -> Optional[float]:
+        headers = getattr(error, 'headers', None)
+        if not headers or not headers.get('Retry-After'):
+            return None
+        try:
+            return max(0.0, float(headers['Retry-After']))
+        except ValueError:
+            return None  # HTTP-Datum statt Sekunden; dann normaler Backoff
+
+
+class CircuitBreaker:
+    """Öffnet nach ``failure_threshold`` aufeinanderfolgenden Fehlern eines Hosts.
+
+    Solange der Breaker offen ist, werden Requests an den Host sofort mit
+    ``CircuitOpenError`` abgelehnt. Nach ``reset_timeout`` Sekunden wird ein
+    einzelner Probe-Request durchgelassen; gelingt er, schließt der Breaker.
+    Endet die Probe ohne Erfolg oder Fehler (etwa durch eine andere
+    Exception), gibt ``release_probe`` sie für den nächsten Request frei.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 300):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """Darf ein Request an den Host gesendet werden?"""
+        if self.opened_at is None:
+            return True
+        if not self._probing and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._probing = True
+            return True
+        return False
+
+    def blocked(self) -> bool:
+        """Werden Requests derzeit abgelehnt? Anders als ``allow`` ohne die Probe zu beanspruchen"""
+        if self.opened_at is None:
+            return False
+        return self._probing or time.monotonic() - self.opened_at < self.reset_timeout
+
+    def release_probe(self):
+        self._probing = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> bool:
+        """Zählt einen Fehler; gibt ``True`` zurück, wenn der Breaker dadurch öffnet"""
+        self.failures += 1
+        was_open = self.is_open and not self._probing
+        self._probing = False
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            return not was_open
+        return False
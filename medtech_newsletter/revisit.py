@@ -0,0 +1,163 @@
+"""Adaptive Besuchsplanung für Quellen und Dokumente anhand ihrer Änderungshistorie."""
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from loguru import logger
+from sqlalchemy import case, func
+
+from .extensions import db
+from .models import Document, DocumentChange, ScrapingRunItem, SourceSchedule
+
+# Gewicht der Vorab-Schätzung (Rate der Quelle bzw. Standardintervall) in Tagen
+# Beobachtungszeit; verhindert, dass wenige Prüfungen das Intervall sofort
+# an eine der Grenzen treiben
+PRIOR_DAYS = 14
+
+
+def estimate_change_rate(checks: int, changes: int, observed_days: float) -> float:
+    """Änderungsrate pro Tag aus ``checks`` Prüfungen, bei denen ``changes`` Änderungen erkannt wurden.
+
+    Pro Prüfung wird höchstens eine Änderung erkannt, auch wenn sich das
+    Dokument seit der letzten Prüfung mehrfach geändert hat. Der Schätzer
+    nach Cho und Garcia-Molina korrigiert das für einen Poisson-Prozess;
+    so kann das Intervall auch unter das bisherige Prüfintervall sinken.
+    """
+    if checks <= 0 or observed_days <= 0:
+        return 0.0
+    changes = min(changes, checks)
+    changes_per_check = -math.log((checks - changes + 0.5) / (checks + 0.5))
+    return changes_per_check * checks / observed_days
+
+
+class RevisitPlanner:
+    """Leitet Besuchsintervalle aus den beobachteten Änderungsraten ab.
+
+    Die Rate eines Dokuments wird aus seinen ``DocumentChange``-Einträgen
+    und seinen Prüfungen (``ScrapingRunItem``) im Fenster der letzten
+    ``window_days`` Tage geschätzt und mit der mittleren Rate der Dokumente
+    seiner Quelle geglättet. Für eine Quelle zählen zusätzlich neu entdeckte
+    Dokumente. Das Intervall ist die erwartete Zeit bis zur nächsten
+    Änderung, begrenzt auf ``min_hours`` bis ``max_hours``; ohne Historie
+    gilt ``default_hours``.
+    """
+
+    def __init__(self, min_hours: float = 2, max_hours: float = 14 * 24,
+                 default_hours: float = 24, window_days: int = 90):
+        self.min_hours = min_hours
+        self.max_hours = max_hours
+        self.default_hours = default_hours
+        self.window_days = window_days
+
+    def interval_hours(self, rate_per_day: float) -> float:
+        if rate_per_day <= 0:
+            return self.max_hours
+        return min(self.max_hours, max(self.min_hours, 24 / rate_per_day))
+
+    def _smoothed(self, rate: float, observed_days: float, prior_rate: float) -> float:
+        weight = observed_days / (observed_days + PRIOR_DAYS)
+        return weight * rate + (1 - weight) * prior_rate
+
+    def estimate(self, sources: Iterable[str], now: Optional[datetime] = None) -> Dict:
+        """Schätzt Raten und Intervalle aller Quellen und ihrer bekannten Dokumente.
+
+        Gibt ``{'sources': {name: {...}}, 'urls': {url: interval_hours}}`` zurück.
+        """
+        now = now or datetime.utcnow()
+        window_start = now - timedelta(days=self.window_days)
+        default_rate = 24 / self.default_hours
+
+        # Erste Prüfung (Lauf und Zeitpunkt), letzte Prüfung und Zahl der Prüfungen im Fenster je URL
+        history = db.session.query(
+            ScrapingRunItem.url,
+            func.min(ScrapingRunItem.source),
+            func.min(ScrapingRunItem.run_id),
+            func.min(ScrapingRunItem.processed_at),
+            func.max(ScrapingRunItem.processed_at),
+            func.sum(case((ScrapingRunItem.processed_at >= window_start, 1), else_=0))
+        ).filter(ScrapingRunItem.status == 'done').group_by(ScrapingRunItem.url).all()
+
+        changes = dict(db.session.query(Document.url, func.count(DocumentChange.id))
+                       .join(DocumentChange, DocumentChange.document_id == Document.id)
+                       .filter(DocumentChange.detected_at >= window_start)
+                       .group_by(Document.url).all())
+
+        by_source = {name: [] for name in sources}
+        for url, source, first_run, first_checked, last_checked, checks in history:
+            if source in by_source and first_checked is not None:
+                by_source[source].append((url, first_run, first_checked, last_checked, int(checks or 0)))
+
+        plan = {'sources': {}, 'urls': {}}
+        for name, documents in by_source.items():
+            plan['sources'][name] = self._estimate_source(documents, changes, window_start,
+                                                          default_rate, plan['urls'])
+        return plan
+
+    def _estimate_source(self, documents: List, changes: Dict, window_start: datetime,
+                         default_rate: float, url_intervals: Dict) -> Dict:
+        if not documents:
+            return {'rate_per_day': default_rate, 'interval_hours': self.interval_hours(default_rate),
+                    'documents': 0, 'changes': 0, 'new_documents': 0}
+
+        def observed(first: datetime, last: datetime) -> float:
+            """Beobachtete Tage zwischen erster und letzter Prüfung innerhalb des Fensters"""
+            return max(0.0, (last - max(first, window_start)).total_seconds() / 86400)
+
+        first_run = min(run for _, run, _, _, _ in documents)
+        source_changes = sum(changes.get(url, 0) for url, _, _, _, _ in documents)
+        # Dokumente aus dem ersten Lauf der Quelle gelten nicht als neu
+        new_documents = sum(1 for _, run, first, _, _ in documents
+                            if run > first_run and first >= window_start)
+
+        # Mittlere Rate je Dokument der Quelle, Vorab-Schätzung für ihre Dokumente
+        document_days = sum(observed(first, last) for _, _, first, last, _ in documents)
+        document_rate = (source_changes + PRIOR_DAYS * default_rate) / (document_days + PRIOR_DAYS)
+        for url, _, first, last, checks in documents:
+            days = observed(first, last)
+            # Änderungen erkennt erst die zweite Prüfung im Fenster
+            intervals = checks - 1 if first >= window_start else checks
+            rate = estimate_change_rate(intervals, changes.get(url, 0), days)
+            url_intervals[url] = self.interval_hours(self._smoothed(rate, days, document_rate))
+
+        # Die Listen-Seiten einer Quelle ändern sich mit jedem neuen oder geänderten Dokument
+        source_days = observed(min(first for _, _, first, _, _ in documents),
+                               max(last for _, _, _, last, _ in documents))
+        source_rate = (source_changes + new_documents + PRIOR_DAYS * default_rate) / (source_days + PRIOR_DAYS)
+        return {
+            'rate_per_day': round(source_rate, 3),
+            'interval_hours': round(self.interval_hours(source_rate), 1),
+            'documents': len(documents),
+            'changes': source_changes,
+            'new_documents': new_documents
+        }
+
+    def due_sources(self, sources: Iterable[str], now: Optional[datetime] = None) -> List[str]:
+        """Quellen, deren nächster Besuch fällig ist (noch nie besuchte immer)"""
+        now = now or datetime.utcnow()
+        schedules = {schedule.source: schedule for schedule in SourceSchedule.query.all()}
+        return [name for name in sources
+                if name not in schedules or schedules[name].next_visit <= now]
+
+    def next_visits(self, documents: Iterable[Document], url_intervals: Dict) -> Dict[str, datetime]:
+        """Frühester Zeitpunkt der nächsten Prüfung je bekannter Dokument-URL"""
+        return {doc.url: doc.last_checked + timedelta(hours=url_intervals.get(doc.url, self.default_hours))
+                for doc in documents if doc.last_checked}
+
+    def record_visits(self, source_plans: Dict, visited: Iterable[str], now: Optional[datetime] = None):
+        """Plant den nächsten Besuch der besuchten Quellen (ohne Commit)"""
+        now = now or datetime.utcnow()
+        schedules = {schedule.source: schedule for schedule in SourceSchedule.query.all()}
+        for name in visited:
+            source_plan = source_plans.get(name)
+            if source_plan is None:
+                continue
+            schedule = schedules.get(name)
+            if schedule is None:
+                schedule = SourceSchedule(source=name)
+                db.session.add(schedule)
+            schedule.interval_hours = source_plan['interval_hours']
+            schedule.rate_per_day = source_plan['rate_per_day']
+            schedule.last_visited = now
+            schedule.next_visit = now + timedelta(hours=source_plan['interval_hours'])
+            logger.info(f"{name}: {source_plan['rate_per_day']:.2f} Änderungen/Tag, "
+                        f"nächster Besuch in {source_plan['interval_hours']:.0f} Stunden")
@@ -0,0 +1,233 @@
+"""Checkpoints für fortsetzbare Scraping-Läufe."""
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from .extensions import db
+from .models import ScrapingLock, ScrapingRun, ScrapingRunItem
+
+# Es gibt genau eine Sperrzeile
+LOCK_ID = 1
+
+
+def prune_runs(finished_before: datetime) -> int:
+    """Löscht abgeschlossene Läufe, die vor ``finished_before`` endeten, samt ihrer URLs (ohne Commit)"""
+    old_runs = db.session.query(ScrapingRun.id).filter(
+        ScrapingRun.status.notin_(['running', 'failed']),
+        ScrapingRun.finished_at < finished_before
+    )
+    ScrapingRunItem.query.filter(ScrapingRunItem.run_id.in_(old_runs)).delete(synchronize_session=False)
+    removed = ScrapingRun.query.filter(ScrapingRun.id.in_(old_runs)).delete(synchronize_session=False)
+    if removed:
+        logger.info(f"{removed} alte Scraping-Läufe entfernt")
+    return removed
+
+
+class RunInProgressError(Exception):
+    """Ein anderer Prozess arbeitet gerade an einem Scraping-Lauf."""
+
+
+class ScrapingRunJournal:
+    """Persistiert Frontier und Fortschritt eines Scraping-Laufs in der Datenbank.
+
+    Jeder Lauf bekommt eine ID. Die Frontier wird nach der Link-Erkennung
+    vollständig gespeichert, bearbeitete URLs werden laufend markiert und
+    alle ``commit_every`` Dokumente zusammen mit den Dokument-Änderungen
+    committet. Stirbt der Prozess oder bricht der Lauf mit einem Fehler ab
+    (Status ``failed``), setzt der nächste Lauf bei den noch offenen URLs
+    fort, solange der abgebrochene Lauf nicht älter als ``max_resume_age``
+    ist.
+
+    Nur der Prozess, der die ``ScrapingLock``-Zeile per bedingtem UPDATE
+    übernommen hat, darf einen Lauf bearbeiten. Er erneuert ihren Heartbeat
+    bei jedem Checkpoint und über ``heartbeat`` mindestens alle
+    ``heartbeat_interval``; bleibt der Heartbeat länger als ``stale_after``
+    aus, gilt der Prozess als tot und ein anderer übernimmt die Sperre.
+    """
+
+    def __init__(self, commit_every: int = 20, stale_after: timedelta = timedelta(minutes=10),
+                 max_resume_age: timedelta = timedelta(hours=12),
+                 heartbeat_interval: timedelta = timedelta(minutes=1)):
+        self.commit_every = commit_every
+        self.stale_after = stale_after
+        self.max_resume_age = max_resume_age
+        self.heartbeat_interval = heartbeat_interval
+        self.run = None
+        self.resumed = False
+        self._items = {}
+        self._uncommitted = 0
+        self._token = uuid.uuid4().hex
+        self._locked = False
+        self._last_heartbeat = 0.0
+
+    def begin(self) -> Optional[List[Dict]]:
+        """Startet einen neuen Lauf oder setzt einen abgebrochenen fort.
+
+        Gibt bei Fortsetzung die offenen Frontier-Einträge in ihrer
+        ursprünglichen Reihenfolge zurück, sonst ``None``. Hält ein anderer
+        lebender Prozess die Sperre, wird ``RunInProgressError`` ausgelöst.
+        """
+        now = datetime.utcnow()
+        self._claim_lock(now)
+        resumable = None
+        # Mit der Sperre gehören unfertige Läufe keinem lebenden Prozess mehr
+        unfinished = ScrapingRun.query.filter(ScrapingRun.status.in_(['running', 'failed'])) \
+            .order_by(ScrapingRun.started_at.desc()).all()
+        for run in unfinished:
+            if resumable is None and run.started_at > now - self.max_resume_age:
+                resumable = run
+            else:
+                run.status = 'abandoned'
+                run.finished_at = now
+
+        if resumable is None:
+            self.run = ScrapingRun(status='running', started_at=now, updated_at=now)
+            db.session.add(self.run)
+            db.session.commit()
+            logger.info(f"Scraping-Lauf {self.run.id} gestartet")
+            return None
+
+        self.run = resumable
+        self.resumed = True
+        self.run.status = 'running'
+        self.run.updated_at = now
+        pending = ScrapingRunItem.query.filter_by(run_id=self.run.id, status='pending') \
+            .order_by(ScrapingRunItem.position).all()
+        self._items = {item.url: item for item in pending}
+        db.session.commit()
+        logger.info(f"Setze Scraping-Lauf {self.run.id} fort: {len(pending)} von "
+                    f"{self.run.total_items} URLs offen")
+        return [item.to_entry() for item in pending]
+
+    def _claim_lock(self, now: datetime):
+        """Übernimmt die Sperre, wenn sie frei ist oder ihr Heartbeat älter als ``stale_after`` ist.
+
+        Das bedingte UPDATE entscheidet atomar: Von zwei gleichzeitig
+        startenden Prozessen ändert nur einer die Zeile.
+        """
+        if db.session.get(ScrapingLock, LOCK_ID) is None:
+            try:
+                db.session.add(ScrapingLock(id=LOCK_ID))
+                db.session.commit()
+            except IntegrityError:
+                # Ein anderer Prozess hat die Zeile gerade angelegt
+                db.session.rollback()
+        claimed = ScrapingLock.query.filter(
+            ScrapingLock.id == LOCK_ID,
+            or_(ScrapingLock.holder.is_(None), ScrapingLock.heartbeat_at < now - self.stale_after)
+        ).update({'holder': self._token, 'heartbeat_at': now}, synchronize_session=False)
+        db.session.commit()
+        if not claimed:
+            raise RunInProgressError("Ein anderer Prozess führt gerade einen Scraping-Lauf aus")
+        self._locked = True
+        self._last_heartbeat = time.monotonic()
+
+    def _release_lock(self):
+        """Gibt die Sperre frei, sofern dieser Prozess sie noch hält (ohne Commit)"""
+        if self._locked:
+            ScrapingLock.query.filter_by(id=LOCK_ID, holder=self._token) \
+                .update({'holder': None, 'heartbeat_at': None}, synchronize_session=False)
+            self._locked = False
+
+    def take_deferred(self) -> List[Dict]:
+        """Übernimmt die in früheren Läufen zurückgestellten URLs in diesen Lauf.
+
+        Zurückgestellt werden URLs, deren Host wegen eines offenen Circuit
+        Breakers nicht angefragt wurde. Sie werden als ``rescheduled``
+        markiert und landen über die Frontier im aktuellen Lauf.
+        """
+        items = ScrapingRunItem.query.filter(ScrapingRunItem.status == 'deferred',
+                                             ScrapingRunItem.run_id != self.run.id) \
+            .order_by(ScrapingRunItem.run_id, ScrapingRunItem.position).all()
+        entries = []
+        for item in items:
+            entries.append(item.to_entry())
+            item.status = 'rescheduled'
+        db.session.commit()
+        return entries
+
+    def record_frontier(self, entries: List[Dict]):
+        """Speichert die Frontier eines neuen Laufs"""
+        items = [ScrapingRunItem(run_id=self.run.id, position=position, url=entry['url'],
+                                 source=entry['source'], title=(entry.get('title') or '')[:255])
+                 for position, entry in enumerate(entries)]
+        db.session.add_all(items)
+        self._items = {item.url: item for item in items}
+        self.run.total_items = len(items)
+        self.run.updated_at = datetime.utcnow()
+        db.session.commit()
+
+    def record_document(self, url: str, status: str = 'done'):
+        """Markiert eine URL als bearbeitet (``done``, ``failed`` oder ``deferred``); committet in Batches"""
+        item = self._items.pop(url, None)
+        if item is None:
+            return
+        item.status = status
+        item.processed_at = datetime.utcnow()
+        self.run.processed_items += 1
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Committet den aktuellen Fortschritt samt aller offenen Änderungen der Session.
+
+        Erneuert dabei den Heartbeat der Sperre. Hat ein anderer Prozess sie
+        inzwischen übernommen, wird nichts committet und
+        ``RunInProgressError`` ausgelöst.
+        """
+        now = datetime.utcnow()
+        renewed = ScrapingLock.query.filter_by(id=LOCK_ID, holder=self._token) \
+            .update({'heartbeat_at': now}, synchronize_session=False)
+        if not renewed:
+            self._locked = False
+            db.session.rollback()
+            raise RunInProgressError(f"Scraping-Lauf {self.run.id} wurde von einem anderen Prozess übernommen")
+        self.run.updated_at = now
+        db.session.commit()
+        self._uncommitted = 0
+        self._last_heartbeat = time.monotonic()
+
+    def heartbeat(self):
+        """Zeigt an, dass der Lauf noch lebt; committet höchstens alle ``heartbeat_interval``.
+
+        Der Writer ruft das auch in Wartephasen regelmäßig auf, etwa während
+        der Link-Erkennung oder langer Analysen.
+        """
+        if time.monotonic() - self._last_heartbeat >= self.heartbeat_interval.total_seconds():
+            self.checkpoint()
+
+    def finish(self, status: str = 'completed'):
+        """Schließt den Lauf ab und gibt die Sperre frei"""
+        self.run.status = status
+        self.run.finished_at = datetime.utcnow()
+        self.checkpoint()
+        self._release_lock()
+        db.session.commit()
+        logger.info(f"Scraping-Lauf {self.run.id} abgeschlossen ({self.run.processed_items} URLs)")
+
+    def fail(self):
+        """Bricht den Lauf nach einem Fehler ab; er bleibt fortsetzbar.
+
+        Verwirft zuerst alle nicht committeten Änderungen der Session (eine
+        fehlgeschlagene Abfrage lässt sonst keinen weiteren Commit zu). Die
+        seit dem letzten Checkpoint bearbeiteten URLs sind damit wieder offen.
+        Hat ein anderer Prozess den Lauf übernommen, bleibt er unverändert.
+        """
+        db.session.rollback()
+        run_id = self.run.id
+        if not self._locked:
+            return
+        try:
+            self.run.status = 'failed'
+            self.run.updated_at = datetime.utcnow()
+            self._release_lock()
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Scraping-Lauf {run_id} konnte nicht als abgebrochen markiert werden: {e}")
@@ -1,18 +1,22 @@
 """Modul für die Aufgabenplanung und -ausführung."""
 import atexit
-import hashlib
+import sqlite3
 from datetime import datetime, timedelta
 
-import requests
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from loguru import logger
 
 # Lokale Module importieren
+from .analysis_cache import AnalysisCache
 from .analyzer import DocumentAnalyzer
+from .change_processing import ChangeAnalysisPool, ScrapeResultWriter
 from .email_service import EmailService
-from .models import Document, DocumentChange, Newsletter, User, db
+from .http_cache import ResponseCache
+from .models import Document, DocumentChange, DocumentValidator, Newsletter, SourceSchedule, User, db
 from .newsletter_generator import NewsletterGenerator
+from .revisit import RevisitPlanner
+from .run_journal import RunInProgressError, ScrapingRunJournal, prune_runs
 from .scraper import DocumentScraper
 
 
@@ -25,6 +29,9 @@ class TaskScheduler:
         self.scraper = None
         self.newsletter_generator = None
         self.email_service = None
+        self.revisit_planner = None
+        self.analysis_pool = None
+        self.analysis_cache = AnalysisCache()
         self.document_analyzer = DocumentAnalyzer()  # Initialisiere den Analyzer einmal
         if app:
             self.init_app(app)
@@ -33,7 +40,18 @@ class TaskScheduler:
         """Initialisiert den Scheduler mit der Flask-Anwendung."""
         self.app = app
         with app.app_context():
-            self.scraper = DocumentScraper(app.config["SOURCES"])
+            self.scraper = DocumentScraper.from_config(app.config, cache=self._create_response_cache(app.config))
+            if app.config.get("SCRAPING_ADAPTIVE", True):
+                self.revisit_planner = RevisitPlanner(
+                    min_hours=app.config.get("SCRAPING_MIN_INTERVAL_HOURS", 2),
+                    max_hours=app.config.get("SCRAPING_MAX_INTERVAL_HOURS", 336),
+                    default_hours=app.config.get("SCRAPING_INTERVAL_HOURS", 24),
+                    window_days=app.config.get("SCRAPING_CHANGE_WINDOW_DAYS", 90)
+                )
+            self.analysis_pool = ChangeAnalysisPool(
+                max_workers=app.config.get("SCRAPING_ANALYSIS_WORKERS", 2),
+                analyzer=self.document_analyzer
+            )
             self.newsletter_generator = NewsletterGenerator()
             self.email_service = EmailService(app)
 
@@ -41,6 +59,21 @@ class TaskScheduler:
             self._add_newsletter_generation_job()
             self._add_cleanup_job()
 
+    def _create_response_cache(self, config):
+        """Erstellt den HTTP-Antwort-Cache des Scrapers, falls konfiguriert."""
+        cache_dir = config.get("HTTP_CACHE_DIR")
+        if not cache_dir:
+            return None
+        try:
+            return ResponseCache(
+                cache_dir,
+                ttl=config.get("HTTP_CACHE_TTL_HOURS", 6) * 3600,
+                max_bytes=config.get("HTTP_CACHE_MAX_MB", 500) * 1024 * 1024
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"HTTP-Cache konnte nicht geöffnet werden, Scraping ohne Cache: {e}")
+            return None
+
     def start_scheduler(self):
         """Startet den APScheduler."""
         if not self.scheduler.running:
@@ -62,12 +95,24 @@ class TaskScheduler:
                 })
         return {
             "scheduler_running": self.scheduler.running,
-            "jobs": jobs_info
+            "jobs": jobs_info,
+            "http_pool": self.scraper.pool_stats if self.scraper else {},
+            "proxy_usage": self.scraper.proxy.summary() if self.scraper and self.scraper.proxy else None,
+            "source_schedule": [schedule.to_dict() for schedule in
+                                SourceSchedule.query.order_by(SourceSchedule.next_visit).all()]
+            if self.revisit_planner else []
         }
 
     def _add_scraping_job(self):
-        """Fügt den regelmäßigen Scraping-Job hinzu."""
-        interval = self.app.config.get("SCRAPING_INTERVAL_HOURS", 24)
+        """Fügt den regelmäßigen Scraping-Job hinzu.
+
+        Mit adaptiven Intervallen läuft der Job im kürzesten Intervall und
+        besucht jeweils nur die fälligen Quellen und Dokumente.
+        """
+        if self.revisit_planner:
+            interval = self.revisit_planner.min_hours
+        else:
+            interval = self.app.config.get("SCRAPING_INTERVAL_HOURS", 24)
         self.scheduler.add_job(
             self._run_scraping_task,
             "interval",
@@ -102,69 +147,84 @@ class TaskScheduler:
         )
         logger.info("Cleanup-Job hinzugefügt (täglich um 2:00 Uhr)")
 
-    def _process_single_document(self, doc_data, existing_docs):
-        url = doc_data["url"]
-        title = doc_data["title"]
-        source = doc_data["source"]
-        
-        new_doc_added = False
-        doc_changed = False
+    def _run_scraping_task(self, force=False):
+        """Führt die Scraping-Aufgabe aus, um neue Dokumente zu finden und Änderungen zu erkennen.
 
-        try:
-            response = requests.get(url, headers=self.scraper.session.headers, timeout=30)
-            response.raise_for_status()
-            content = response.text
-            new_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
-
-            if url not in existing_docs:
-                new_doc = Document(source=source, url=url, title=title, 
-                                   content_hash=new_hash, last_checked=datetime.utcnow())
-                db.session.add(new_doc)
-                new_doc_added = True
-                logger.info(f"Neues Dokument gefunden: {title}")
-
-            elif existing_docs[url] != new_hash:
-                existing_doc = Document.query.filter_by(url=url).first()
-                if existing_doc:
-                    change_info = self.document_analyzer.compare_documents("", content)  
-
-                    new_change = DocumentChange(document_id=existing_doc.id, 
-                                                change_summary=change_info["diff_summary"], 
-                                                importance_score=change_info["importance_score"])
-                    db.session.add(new_change)
-
-                    existing_doc.content_hash = new_hash
-                    existing_doc.last_checked = datetime.utcnow()
-                    doc_changed = True
-                    logger.info(f"Änderung im Dokument gefunden: {title}")
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Netzwerk- oder HTTP-Fehler bei {url}: {e}")
-        except Exception as e:
-            logger.error(f"Allgemeiner Fehler bei der Verarbeitung von {url}: {e}")
-        
-        return new_doc_added, doc_changed
-
-    def _run_scraping_task(self):
-        """Führt die Scraping-Aufgabe aus, um neue Dokumente zu finden und Änderungen zu erkennen."""
+        Der Fortschritt wird laufend über ein ``ScrapingRunJournal`` gesichert,
+        sodass ein abgebrochener Lauf beim nächsten Aufruf fortgesetzt wird.
+        Mit adaptiven Intervallen werden nur fällige Quellen und Dokumente
+        besucht, außer bei ``force`` (manuelles Scraping).
+        """
         with self.app.app_context():
             logger.info("Starte Scraping-Aufgabe...")
-            existing_docs = {doc.url: doc.content_hash for doc in Document.query.all()}
-            scraped_docs = self.scraper.scrape_all_sources()
+            journal = ScrapingRunJournal(
+                commit_every=self.app.config.get("SCRAPING_CHECKPOINT_EVERY", 20),
+                max_resume_age=timedelta(hours=self.app.config.get("SCRAPING_RESUME_HOURS", 12))
+            )
+            try:
+                resume_entries = journal.begin()
+            except RunInProgressError as e:
+                logger.warning(f"Scraping übersprungen: {e}")
+                return
 
-            new_docs_count = 0
-            changed_docs_count = 0
+            deferred_entries = journal.take_deferred() if resume_entries is None else None
+            documents = Document.query.all()
+            validators = {v.url: v for v in DocumentValidator.query.all()}
+            existing_docs = {doc.url: doc.content_hash for doc in documents}
+
+            revisit_plan = due_sources = next_visit = None
+            if self.revisit_planner and resume_entries is None:
+                revisit_plan = self.revisit_planner.estimate(self.scraper.adapters)
+                if not force:
+                    due_sources = self.revisit_planner.due_sources(self.scraper.adapters)
+                    next_visit = self.revisit_planner.next_visits(documents, revisit_plan["urls"])
+                    if not due_sources and not deferred_entries:
+                        logger.info("Keine Quelle fällig, Scraping übersprungen")
+                        journal.finish("skipped")
+                        return
+                    logger.info(f"Fällige Quellen: {', '.join(due_sources) or 'keine'}")
+
+            # Nur Dokumente, die bereits in der Datenbank liegen, bedingt anfragen
+            conditional = {url: validator.to_dict() for url, validator in validators.items()
+                           if url in existing_docs}
+            last_checked = {doc.url: doc.last_checked for doc in documents}
+            writer = ScrapeResultWriter(journal, self.analysis_pool, existing_docs, validators,
+                                        batch_size=self.app.config.get("SCRAPING_CHECKPOINT_EVERY", 20),
+                                        analysis_cache=self.analysis_cache)
+
+            def scrape(on_frontier, on_document):
+                self.scraper.scrape_all_sources(
+                    validators=conditional,
+                    last_checked=last_checked,
+                    resume_entries=resume_entries,
+                    deferred_entries=deferred_entries,
+                    on_frontier=on_frontier,
+                    on_document=on_document,
+                    sources=due_sources,
+                    next_visit=next_visit
+                )
 
-            for doc_data in scraped_docs:
-                new_added, changed = self._process_single_document(doc_data, existing_docs)
-                if new_added:
-                    new_docs_count += 1
-                if changed:
-                    changed_docs_count += 1
+            try:
+                # Der Scraper läuft in einem eigenen Thread, Änderungen werden
+                # parallel analysiert und hier gebündelt geschrieben
+                writer.run(scrape)
+            except Exception as e:
+                # Der Fortschritt bis zum letzten Checkpoint bleibt erhalten, der Lauf fortsetzbar
+                journal.fail()
+                logger.error(f"Scraping-Lauf {journal.run.id} abgebrochen: {e}")
+                return
 
-            db.session.commit()
-            logger.info(f"Scraping abgeschlossen: {new_docs_count} neue Dokumente, "
-                        f"{changed_docs_count} Änderungen erkannt")
+            if revisit_plan:
+                visited = self.scraper.adapters if due_sources is None else due_sources
+                self.revisit_planner.record_visits(revisit_plan["sources"], visited)
+            journal.finish()
+            counts = writer.counts
+            logger.info(f"Scraping abgeschlossen: {counts['new']} neue Dokumente, "
+                        f"{counts['changed']} Änderungen erkannt, "
+                        f"{counts['unchanged']} Dokumente unverändert, "
+                        f"{counts['analyzed']} Inhalte analysiert, "
+                        f"{counts['failed']} fehlgeschlagen, "
+                        f"{counts['deferred']} URLs auf den nächsten Lauf verschoben")
 
     def _run_newsletter_generation_task(self):
         """Generiert und versendet Newsletter an Abonnenten."""
@@ -184,7 +244,7 @@ class TaskScheduler:
 
                 # Generiere personalisierte Newsletter für jeden Abonnenten
                 generated_newsletters = self.newsletter_generator.generate_personalized_newsletters(
-                    unprocessed_changes,
+                    self._newsletter_changes(unprocessed_changes),
                     [{
                         "id": user.id,
                         "email": user.email,
@@ -225,8 +285,35 @@ class TaskScheduler:
                 #     message=f"Ein Fehler ist aufgetreten: {e}"
                 # )
 
+    def _newsletter_changes(self, changes):
+        """Änderungen mit den gespeicherten Analysen ihrer Dokumentversionen für den Newsletter.
+
+        Analysiert wird beim Scraping (siehe ``AnalysisCache``); hier werden
+        die Ergebnisse nur noch mit einer gemeinsamen Abfrage gelesen.
+        Änderungen ohne ``content_hash`` (vor dessen Einführung erkannt)
+        verwenden die aktuelle Version des Dokuments.
+        """
+        content_hashes = {change.id: change.content_hash or change.document.content_hash for change in changes}
+        analyses = self.analysis_cache.lookup(content_hashes.values())
+        newsletter_changes = []
+        for change in changes:
+            document = change.document
+            analysis = analyses.get(content_hashes[change.id])
+            newsletter_change = analysis.to_dict() if analysis else {}
+            # Felder der Änderung haben Vorrang vor der Analyse
+            newsletter_change.update({
+                "title": document.title,
+                "source": document.source,
+                "url": document.url,
+                "change_summary": change.change_summary,
+                "importance_score": change.importance_score,
+                "detected_at": change.detected_at.isoformat()
+            })
+            newsletter_changes.append(newsletter_change)
+        return newsletter_changes
+
     def _run_cleanup_task(self):
-        """Bereinigt alte, verarbeitete Dokumentenänderungen aus der Datenbank."""
+        """Bereinigt alte, verarbeitete Dokumentenänderungen, veraltete Analysen und alte Scraping-Läufe."""
         with self.app.app_context():
             try:
                 one_month_ago = datetime.utcnow() - timedelta(days=30)
@@ -234,19 +321,33 @@ class TaskScheduler:
                     DocumentChange.processed is True,
                     DocumentChange.detected_at < one_month_ago
                 ).delete()
+                self.analysis_cache.prune()
+                prune_runs(datetime.utcnow() - self._run_retention())
                 db.session.commit()
                 if old_changes > 0:
                     logger.info(f"{old_changes} alte Änderungen wurden bereinigt.")
             except Exception as e:
                 logger.error(f"Fehler bei der Datenbereinigung: {e}")
 
+    def _run_retention(self):
+        """Wie lange abgeschlossene Scraping-Läufe samt URLs aufbewahrt werden.
+
+        Die Änderungsraten der adaptiven Intervalle brauchen die Prüfungen im
+        Fenster ``SCRAPING_CHANGE_WINDOW_DAYS`` und zusätzlich mindestens eine
+        Prüfung davor, sonst gälte ein altes Dokument als neu entdeckt. Da
+        jedes Dokument spätestens nach dem maximalen Intervall wieder geprüft
+        wird, reicht das Fenster plus dieses Intervall.
+        """
+        return timedelta(days=self.app.config.get("SCRAPING_CHANGE_WINDOW_DAYS", 90),
+                         hours=self.app.config.get("SCRAPING_MAX_INTERVAL_HOURS", 336))
+
     # Manuelle Trigger
     def run_manual_scraping(self):
         """Löst ein manuelles Scraping aus."""
         logger.info("Starte manuelles Scraping...")
         self.scheduler.add_job(self._run_scraping_task, "date", 
                                run_date=datetime.now(), id="manual_scraping_now", 
-                               replace_existing=True)
+                               kwargs={"force": True}, replace_existing=True)
 
     def run_manual_newsletter_generation(self):
         """Löst eine manuelle Newsletter-Generierung aus."""
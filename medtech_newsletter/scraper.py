@@ -1,10 +1,31 @@
-import requests
-from bs4 import BeautifulSoup
-from loguru import logger
-from urllib.parse import urljoin
+import asyncio
+import hashlib
 import os
-import time
 import random
+import re
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Mapping, Optional
+from urllib.parse import urljoin, urlparse
+
+import aiohttp
+from loguru import logger
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from .browser_pool import BrowserPool
+from .extraction import ContentRules, extract_document, extract_links
+from .feeds import FeedParser
+from .fetcher import AsyncFetcher, ContentRejectedError
+from .frontier import CrawlFrontier
+from .http_cache import ResponseCache
+from .metadata import MetadataExtractor
+from .pdf_extraction import PdfExtractor
+from .proxy import ScraperApiClient
+from .ratelimit import HostRateLimiter
+from .resilience import CircuitOpenError, RetryPolicy
+from .sources import SourceAdapter, build_adapters
+from .urls import url_fingerprint
 
 # Eine Liste von echten Browser User-Agents zur zufälligen Auswahl
 USER_AGENTS = [
@@ -13,85 +34,559 @@ USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36',
 ]
 
+# Inhaltstypen, die als Dokument verarbeitet werden; alles andere wird vor dem Download verworfen
+DOCUMENT_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain', 'application/pdf')
+
+WHITESPACE = re.compile(r'\s+')
+
+
 class DocumentScraper:
-    """Klasse zum Scrapen von Dokumenten aus verschiedenen Quellen."""
-    def __init__(self, sources):
+    """Klasse zum Scrapen von Dokumenten aus verschiedenen Quellen.
+
+    Jede Quelle aus ``Config.SOURCES`` wird über einen ``SourceAdapter``
+    beschrieben; Listen- und Dokumentseiten aller Quellen werden über eine
+    gemeinsame asynchrone Fetch-Engine parallel geladen.
+
+    ``recorder`` und ``replay_url`` werden an die Fetch-Engine durchgereicht
+    und erlauben Mitschnitt und Offline-Wiedergabe eines Laufs (``replay``).
+    """
+    def __init__(self, sources: Dict, max_concurrency: int = 20, per_host_concurrency: int = 4,
+                 default_rate_limit: Optional[Dict] = None, cache: Optional[ResponseCache] = None,
+                 browser_pool_size: int = 2, browser_max_pages: int = 50,
+                 pool_per_host: int = 0, keepalive_timeout: float = 30,
+                 max_document_mb: float = 10, pdf_workers: int = 2, pdf_max_pages: int = 200,
+                 retry_policy: Optional[RetryPolicy] = None, breaker_threshold: int = 5,
+                 breaker_reset_timeout: float = 300, proxy_concurrency: int = 5,
+                 proxy_timeout: float = 70, proxy_render_timeout: float = 180,
+                 metadata_scan_kb: float = 16, recorder=None, replay_url: Optional[Callable[[str], str]] = None):
         self.sources = sources
-        self.session = requests.Session()
-        self.scraper_api_key = os.environ.get(\'SCRAPER_API_KEY\')
-        if not self.scraper_api_key:
-            logger.warning("SCRAPER_API_KEY nicht gefunden. Scraping wird fehlschlagen.")
-
-    def scrape_all_sources(self):
-        """Scrapt Dokumente von allen konfigurierten Quellen."""
-        logger.info("Starte gezieltes Scraping zur Fehleranalyse...")
-        all_documents = []
-        
-        # WIR TESTEN JETZT NUR EINE QUELLE
-        source_to_test = \'G-BA\'
-        
-        logger.info(f"Fokussiere auf Test-Quelle: {source_to_test}")
-        config = self.sources.get(source_to_test)
-        
-        if config:
-            docs = self.scrape_source(source_to_test, config)
-            all_documents.extend(docs)
-        else:
-            logger.error(f"Test-Quelle \'{source_to_test}\' nicht in der Konfiguration gefunden.")
-            
-        logger.info(f"Scraping abgeschlossen. {len(all_documents)} Dokumente von {source_to_test} gefunden.")
-        return all_documents
+        self.adapters = build_adapters(sources)
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.default_rate_limit = default_rate_limit or {'rate': 1.0, 'burst': 3}
+        self.cache = cache
+        self.browser_pool_size = browser_pool_size
+        self.browser_max_pages = browser_max_pages
+        self.pool_per_host = pool_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.max_document_mb = max_document_mb
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset_timeout = breaker_reset_timeout
+        self.recorder = recorder
+        self.replay_url = replay_url
+        self.pool_stats = {}
+        self._browser_pool = None
+        self.pdf_extractor = PdfExtractor(max_workers=pdf_workers, max_pages=pdf_max_pages)
+        self.metadata_extractor = MetadataExtractor(scan_kb=metadata_scan_kb)
+        self.headers = {'User-Agent': random.choice(USER_AGENTS)}
+        self.scraper_api_key = os.environ.get('SCRAPER_API_KEY')
+        self.proxy = None
+        proxy_sources = [name for name, adapter in self.adapters.items() if adapter.fetch == 'proxy']
+        if self.scraper_api_key:
+            self.proxy = ScraperApiClient(self.scraper_api_key, concurrency=proxy_concurrency,
+                                          timeout=proxy_timeout, render_timeout=proxy_render_timeout)
+        elif proxy_sources:
+            logger.warning(f"SCRAPER_API_KEY nicht gefunden. Listen-Seiten von {', '.join(proxy_sources)} "
+                           f"werden ohne Proxy geladen.")
 
-    def scrape_source(self, name, config):
-        """Scrapt Dokumente von einer spezifischen Quelle."""
-        logger.info(f"Starte Scraping für: {name}...")
-        base_url = config[\'base_url\']
-        all_docs = []
-        for path in config[\'search_paths\']:
-            all_docs.extend(self._scrape_generic_page(base_url, path))
-            time.sleep(random.uniform(2, 5))
-        logger.info(f"{name} Scraping abgeschlossen. {len(all_docs)} Dokumente gefunden.")
-        return all_docs
-
-    def _scrape_generic_page(self, base_url, path):
-        """Scrapt eine generische Seite nach Links zu Dokumenten."""
-        target_url = urljoin(base_url, path)
-        
-        if not self.scraper_api_key:
-            logger.error("Scraping ohne API Key nicht möglich.")
-            return []
+    @classmethod
+    def from_config(cls, config: Mapping, **kwargs) -> 'DocumentScraper':
+        """Erstellt den Scraper aus der App-Konfiguration; ``kwargs`` überschreiben einzelne Parameter"""
+        options = dict(
+            max_concurrency=config.get("FETCH_MAX_CONCURRENCY", 20),
+            per_host_concurrency=config.get("FETCH_PER_HOST_CONCURRENCY", 4),
+            default_rate_limit=config.get("SCRAPING_DEFAULT_RATE_LIMIT"),
+            browser_pool_size=config.get("BROWSER_POOL_SIZE", 2),
+            browser_max_pages=config.get("BROWSER_MAX_PAGES_PER_WORKER", 50),
+            pool_per_host=config.get("HTTP_POOL_PER_HOST", 8),
+            keepalive_timeout=config.get("HTTP_KEEPALIVE_SECONDS", 30),
+            max_document_mb=config.get("SCRAPING_MAX_DOCUMENT_MB", 10),
+            pdf_workers=config.get("PDF_WORKERS", 2),
+            pdf_max_pages=config.get("PDF_MAX_PAGES", 200),
+            retry_policy=RetryPolicy(
+                max_attempts=config.get("FETCH_RETRY_ATTEMPTS", 3),
+                base_delay=config.get("FETCH_RETRY_BASE_DELAY", 1.0),
+                max_delay=config.get("FETCH_RETRY_MAX_DELAY", 60.0),
+                budget=config.get("FETCH_RETRY_BUDGET", 100)
+            ),
+            breaker_threshold=config.get("CIRCUIT_BREAKER_THRESHOLD", 5),
+            breaker_reset_timeout=config.get("CIRCUIT_BREAKER_RESET_SECONDS", 300),
+            proxy_concurrency=config.get("SCRAPERAPI_CONCURRENCY", 5),
+            proxy_timeout=config.get("SCRAPERAPI_TIMEOUT", 70),
+            proxy_render_timeout=config.get("SCRAPERAPI_RENDER_TIMEOUT", 180),
+            metadata_scan_kb=config.get("SCRAPING_METADATA_SCAN_KB", 16)
+        )
+        options.update(kwargs)
+        return cls(config["SOURCES"], **options)
+
+    def _get_selenium_driver(self) -> webdriver.Chrome:
+        """Erstellt einen Selenium WebDriver für dynamische Inhalte"""
+        chrome_options = Options()
+        chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--window-size=1920,1080')
 
-        proxy_url = f"http://api.scraperapi.com/?api_key={self.scraper_api_key}&url={target_url}&render=true&premium=true"
-        documents = []
-        
         try:
-            headers = {\'User-Agent\': random.choice(USER_AGENTS )}
-            logger.info(f"Scraping URL: {target_url} via Premium Proxy")
-            response = self.session.get(proxy_url, headers=headers, timeout=180)
-            
-            if response.status_code != 200:
-                logger.error(f"Fehlerhafte Antwort für {target_url}. Status: {response.status_code}")
-                logger.error(f"Antwort-Anfang: {response.text[:1000]}") 
-                response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, \'html.parser\')
-            links = soup.find_all(\'a\', href=True)
-            
-            if not links:
-                logger.warning(f"Keine Links auf der Seite gefunden: {target_url}")
-                logger.warning(f"Seiteninhalt-Anfang: {response.text[:1000]}")
-
-            for link in links:
-                href = link[\'href\']
-                if href.startswith((\'#\', \'mailto:\', \'javascript:\')) or not link.get_text(strip=True):
+            return webdriver.Chrome(options=chrome_options)
+        except Exception as e:
+            logger.error(f"Fehler beim Erstellen des WebDrivers: {e}")
+            raise
+
+    def _get_browser_pool(self) -> BrowserPool:
+        """Gibt den (lazy gestarteten) Browser-Pool zurück, der über Läufe hinweg bestehen bleibt"""
+        if self._browser_pool is None:
+            self._browser_pool = BrowserPool(self._get_selenium_driver, size=self.browser_pool_size,
+                                             max_pages_per_worker=self.browser_max_pages)
+        return self._browser_pool
+
+    @staticmethod
+    def _is_pdf(response: Dict) -> bool:
+        """Erkennt PDFs am Content-Type oder an der Signatur"""
+        content_type = response['headers'].get('Content-Type', '').lower()
+        return content_type.startswith('application/pdf') or response['content'][:5] == b'%PDF-'
+
+    def _calculate_content_hash(self, content: str) -> str:
+        """Berechnet SHA-256 Hash des Inhalts"""
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def _clean_text(self, text: str) -> str:
+        """Bereinigt Text von überflüssigen Whitespaces und Zeichen"""
+        if not text:
+            return ""
+        return WHITESPACE.sub(' ', text).strip()
+
+    def _extract_metadata(self, page_text: str, meta: Dict, url: str) -> Dict:
+        """Extrahiert Metadaten aus dem Seitentext und den Meta-Tags"""
+        return self.metadata_extractor.extract(page_text, meta, url)
+
+    def scrape_all_sources(self, validators: Optional[Dict] = None,
+                           last_checked: Optional[Dict] = None,
+                           resume_entries: Optional[List[Dict]] = None,
+                           deferred_entries: Optional[List[Dict]] = None,
+                           on_frontier: Optional[Callable] = None,
+                           on_document: Optional[Callable] = None,
+                           sources: Optional[List[str]] = None,
+                           next_visit: Optional[Dict] = None) -> List[Dict]:
+        """Scrapt Dokumente von allen konfigurierten Quellen.
+
+        ``validators`` ordnet bekannten Dokument-URLs ihre gespeicherten
+        ``etag``/``last_modified``-Werte zu. Diese Dokumente werden bedingt
+        angefragt; unveränderte kommen mit ``not_modified=True`` und ohne
+        Inhalt zurück. ``last_checked`` (URL -> Zeitpunkt) bestimmt die
+        Reihenfolge, in der bekannte Dokumente geladen werden.
+
+        Für fortsetzbare Läufe: ``resume_entries`` ersetzt die Link-Erkennung
+        durch die offenen Frontier-Einträge eines abgebrochenen Laufs,
+        ``on_frontier(entries)`` wird nach der Link-Erkennung mit der
+        vollständigen Frontier aufgerufen und ``on_document(entry, doc)`` für
+        jede bearbeitete URL, sobald sie fertig ist (``doc`` ist ``None``,
+        wenn das Dokument nicht geladen werden konnte). Die zurückgegebenen
+        Dokumente enthalten dann keinen ``content`` mehr, damit nicht alle
+        Inhalte bis zum Ende des Laufs im Speicher bleiben. Löst
+        ``on_document`` eine Ausnahme aus, werden keine weiteren Dokumente
+        geladen und die Ausnahme wird weitergereicht.
+
+        Fehler beim Laden einzelner Dokumente brechen den Lauf nicht ab; sie
+        werden je Quelle protokolliert und wie nicht ladbare Dokumente
+        behandelt.
+
+        URLs eines Hosts, dessen Circuit Breaker offen ist, kommen mit
+        ``deferred=True`` zurück und sollten im nächsten Lauf über
+        ``deferred_entries`` erneut eingeplant werden.
+
+        Für adaptive Besuchsintervalle beschränkt ``sources`` die Link-Erkennung
+        auf die fälligen Quellen, und bekannte URLs werden nur geladen, wenn
+        ihr Zeitpunkt in ``next_visit`` (URL -> Zeitpunkt) erreicht ist oder
+        ihr Feed-Eintrag eine Änderung meldet.
+        """
+        adapters = self.adapters if sources is None else \
+            {name: adapter for name, adapter in self.adapters.items() if name in sources}
+        logger.info(f"Starte Scraping von {len(adapters)} Quellen...")
+        all_documents = asyncio.run(self._scrape_all_sources_async(
+            validators or {}, last_checked or {}, resume_entries, on_frontier, on_document,
+            deferred_entries, adapters, next_visit
+        ))
+        logger.info(f"Scraping aller Quellen abgeschlossen. Insgesamt {len(all_documents)} Dokumente gefunden.")
+        return all_documents
+
+    def _build_rate_limiter(self) -> HostRateLimiter:
+        """Erstellt den Ratenbegrenzer mit den ``rate_limit``-Angaben der Quellen"""
+        host_limits = {}
+        for adapter in self.adapters.values():
+            if adapter.rate_limit:
+                host_limits[HostRateLimiter.host_of(adapter.base_url)] = adapter.rate_limit
+        return HostRateLimiter(default_rate=self.default_rate_limit['rate'],
+                               default_burst=self.default_rate_limit['burst'],
+                               host_limits=host_limits)
+
+    def _host_concurrency(self) -> Dict[str, int]:
+        """Hostbezogene Parallelitätslimits aus den ``concurrency``-Angaben der Quellen"""
+        return {adapter.host: adapter.concurrency
+                for adapter in self.adapters.values() if adapter.concurrency}
+
+    async def _scrape_all_sources_async(self, validators: Dict, last_checked: Dict,
+                                        resume_entries: Optional[List[Dict]] = None,
+                                        on_frontier: Optional[Callable] = None,
+                                        on_document: Optional[Callable] = None,
+                                        deferred_entries: Optional[List[Dict]] = None,
+                                        adapters: Optional[Dict[str, SourceAdapter]] = None,
+                                        next_visit: Optional[Dict] = None) -> List[Dict]:
+        """Scrapt alle Quellen parallel über eine gemeinsame Fetch-Engine.
+
+        Zuerst werden die Listen-Seiten aller Quellen gelesen und die
+        gefundenen Links in einer gemeinsamen Frontier dedupliziert, danach
+        werden die Dokumente in Prioritätsreihenfolge geladen.
+        """
+        adapters = self.adapters if adapters is None else adapters
+        frontier = CrawlFrontier(last_checked, next_visit)
+        validators = {url_fingerprint(url): validator for url, validator in validators.items()}
+        if self.proxy:
+            self.proxy.reset()
+
+        async with AsyncFetcher(max_concurrency=self.max_concurrency,
+                                per_host_concurrency=self.per_host_concurrency,
+                                headers=self.headers,
+                                rate_limiter=self._build_rate_limiter(),
+                                cache=self.cache,
+                                host_concurrency=self._host_concurrency(),
+                                pool_per_host=self.pool_per_host,
+                                keepalive_timeout=self.keepalive_timeout,
+                                retry_policy=self.retry_policy,
+                                breaker_threshold=self.breaker_threshold,
+                                breaker_reset_timeout=self.breaker_reset_timeout,
+                                recorder=self.recorder,
+                                replay_url=self.replay_url) as fetcher:
+            if resume_entries is not None:
+                for entry in resume_entries:
+                    frontier.add(entry['url'], source=entry['source'], title=entry['title'])
+                entries = frontier.drain()
+            else:
+                # Im letzten Lauf zurückgestellte URLs zuerst wieder aufnehmen
+                for entry in deferred_entries or []:
+                    frontier.add(entry['url'], source=entry['source'], title=entry['title'])
+                if deferred_entries:
+                    logger.info(f"{len(deferred_entries)} zurückgestellte URLs aus dem letzten Lauf eingeplant")
+                results = await asyncio.gather(
+                    *(self.discover_source(fetcher, adapter, frontier) for adapter in adapters.values()),
+                    return_exceptions=True
+                )
+                for name, result in zip(adapters, results):
+                    if isinstance(result, Exception):
+                        logger.error(f"Fehler beim Scraping von {name}: {result}")
+                        continue
+                    added = sum(frontier.add(doc_url, source=name, title=doc_title)
+                                for doc_url, doc_title in result)
+                    logger.info(f"{name}: {len(result)} Links gefunden, {added} neu in der Warteschlange")
+                entries = frontier.drain()
+                if on_frontier:
+                    on_frontier(entries)
+
+            failures = Counter()
+            reporting_failed = asyncio.Event()
+
+            async def scrape_and_report(entry):
+                if reporting_failed.is_set():
+                    return None
+                try:
+                    doc = await self._scrape_document(fetcher, entry, validators.get(url_fingerprint(entry['url'])))
+                except Exception as e:
+                    logger.error(f"{entry['source']}: Fehler beim Laden von {entry['url']}: {e}")
+                    failures[entry['source']] += 1
+                    doc = None
+                if not on_document:
+                    return doc
+                try:
+                    on_document(entry, doc)
+                except Exception:
+                    reporting_failed.set()
+                    raise
+                return {key: value for key, value in doc.items() if key != 'content'} if doc else None
+
+            # Tasks in Prioritätsreihenfolge anlegen; die Semaphoren der
+            # Fetch-Engine bedienen Wartende in derselben Reihenfolge
+            documents = await asyncio.gather(*(scrape_and_report(entry) for entry in entries),
+                                             return_exceptions=True)
+            errors = [result for result in documents if isinstance(result, Exception)]
+            if errors:
+                raise errors[0]
+
+        self.pool_stats = dict(fetcher.pool_stats)
+        if self.proxy:
+            self.proxy.log_summary()
+        if self.cache:
+            logger.info(f"{fetcher.cache_hits} Antworten aus dem HTTP-Cache geladen")
+
+        documents = [doc for doc in documents if doc]
+        for name in adapters:
+            source_docs = [doc for doc in documents if doc['source'] == name and not doc.get('deferred')]
+            deferred = sum(1 for doc in documents if doc['source'] == name and doc.get('deferred'))
+            parse_ms = sum(doc['metadata'].get('parse_ms', 0) for doc in source_docs if 'metadata' in doc)
+            logger.info(f"{name} Scraping abgeschlossen. {len(source_docs)} Dokumente gefunden "
+                        f"(Parse-Zeit Dokumente: {parse_ms:.0f} ms)"
+                        + (f", {failures[name]} Dokumente mit Fehler abgebrochen" if failures[name] else "")
+                        + (f", {deferred} URLs auf den nächsten Lauf verschoben." if deferred else "."))
+        return documents
+
+    async def discover_source(self, fetcher: AsyncFetcher, adapter: SourceAdapter,
+                              frontier: Optional[CrawlFrontier] = None) -> List:
+        """Sammelt die Dokument-Links einer Quelle.
+
+        Quellen mit ``feeds`` werden über ihre Sitemaps bzw. RSS-/Atom-Feeds
+        erkannt; die Listen-Seiten werden nur gelesen, wenn keiner der Feeds
+        geladen werden konnte. Bekannte URLs, deren nächste Prüfung laut
+        ``frontier`` noch nicht fällig ist, werden ausgelassen.
+        """
+        logger.info(f"Starte Scraping für: {adapter.name}...")
+        if frontier is None:
+            frontier = CrawlFrontier()
+        if adapter.feeds:
+            links = await self._discover_from_feeds(fetcher, adapter, frontier)
+            if links is not None:
+                return links
+            logger.warning(f"Keine Feeds von {adapter.name} abrufbar, lese Listen-Seiten")
+        pages = await asyncio.gather(
+            *(self._scrape_listing_page(fetcher, adapter, target_url)
+              for target_url in adapter.listing_urls())
+        )
+        links = [link for page_links in pages for link in page_links]
+        due_links = [link for link in links if frontier.is_due(link[0])]
+        if len(due_links) < len(links):
+            logger.info(f"{adapter.name}: {len(links) - len(due_links)} bekannte Dokumente noch nicht fällig")
+        return due_links
+
+    async def _discover_from_feeds(self, fetcher: AsyncFetcher, adapter: SourceAdapter,
+                                   frontier: CrawlFrontier) -> Optional[List]:
+        """Liest Sitemaps und Feeds einer Quelle inkrementell.
+
+        Übernommen werden nur Einträge, die neu sind oder deren
+        ``lastmod``/``pubDate`` jünger ist als ``last_checked`` des Dokuments.
+        Untergeordnete Sitemaps eines Sitemap-Index werden übersprungen, wenn
+        sie seit der letzten Prüfung der Quelle nicht geändert wurden.
+        Gibt ``None`` zurück, wenn kein Feed geladen werden konnte.
+        """
+        cutoff = frontier.latest_check(adapter.host)
+        pending = [(feed_url, 0) for feed_url in adapter.feed_urls()]
+        links = []
+        loaded = total = 0
+
+        while pending:
+            feed_url, depth = pending.pop(0)
+            # Geparst wird während der Übertragung
+            parser = FeedParser()
+            try:
+                await fetcher.fetch(feed_url, on_chunk=parser.feed)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Feed {feed_url} nicht abrufbar: {e}")
+                continue
+            loaded += 1
+            entries = parser.close()
+            if parser.truncated:
+                logger.warning(f"Feed {feed_url} nach {parser.max_bytes} Bytes abgeschnitten")
+            for entry in entries:
+                if entry.is_sitemap:
+                    if depth < 2 and (cutoff is None or entry.lastmod is None or entry.lastmod > cutoff):
+                        pending.append((urljoin(feed_url, entry.url), depth + 1))
                     continue
+                total += 1
+                url = urljoin(feed_url, entry.url)
+                if not adapter.accepts_feed_entry(url, entry.title):
+                    continue
+                checked = frontier.last_checked(url)
+                if checked and entry.lastmod and entry.lastmod <= checked:
+                    continue
+                # Ohne lastmod entscheidet das Besuchsintervall des Dokuments
+                if entry.lastmod is None and not frontier.is_due(url):
+                    continue
+                # Sitemaps liefern keinen Titel, dann den letzten Pfadabschnitt verwenden
+                title = entry.title or urlparse(url).path.rstrip('/').rsplit('/', 1)[-1].replace('-', ' ')
+                links.append((url, self._clean_text(title)))
+
+        if not loaded:
+            return None
+        logger.info(f"{adapter.name}: {total} Feed-Einträge gelesen, {len(links)} neu oder geändert")
+        return links
+
+    def _max_document_bytes(self, adapter: Optional[SourceAdapter]) -> int:
+        """Größenlimit für Dokumente einer Quelle in Bytes"""
+        max_mb = adapter.max_document_mb if adapter and adapter.max_document_mb else self.max_document_mb
+        return int(max_mb * 1024 * 1024)
 
-                doc_url = urljoin(target_url, href)
-                doc_title = link.get_text(strip=True)
-                
-                documents.append({\'source\': base_url, \'url\': doc_url, \'title\': doc_title})
+    async def _scrape_document(self, fetcher: AsyncFetcher, entry: Dict,
+                               validator: Optional[Dict] = None) -> Optional[Dict]:
+        """Lädt ein Dokument aus der Frontier und baut das Ergebnis-Dict"""
+        doc_content = await self._scrape_document_content(fetcher, entry['url'], validator,
+                                                          self.adapters.get(entry['source']))
+        if not doc_content:
+            return None
+        if doc_content.get('not_modified'):
+            return {'source': entry['source'], 'title': entry['title'], 'url': entry['url'], 'not_modified': True}
+        if doc_content.get('deferred'):
+            return {'source': entry['source'], 'title': entry['title'], 'url': entry['url'], 'deferred': True}
+        return {
+            'source': entry['source'],
+            'title': entry['title'],
+            'url': entry['url'],
+            'content': doc_content['content'],
+            'content_hash': self._calculate_content_hash(doc_content['content']),
+            'metadata': doc_content['metadata'],
+            'etag': doc_content['etag'],
+            'last_modified': doc_content['last_modified']
+        }
 
-        except requests.exceptions.RequestException as e:
+    async def _render_with_browser(self, fetcher: AsyncFetcher, target_url: str,
+                                   adapter: SourceAdapter) -> str:
+        """Rendert eine dynamische Listen-Seite im Browser-Pool"""
+        logger.info(f"Scraping URL: {target_url} via Headless-Browser")
+        await fetcher.throttle(target_url)
+        # Selenium blockiert, daher im Thread ausführen
+        return await asyncio.to_thread(self._get_browser_pool().render, target_url, adapter.wait_for)
+
+    async def _fetch_listing_html(self, fetcher: AsyncFetcher, target_url: str,
+                                  adapter: SourceAdapter, render: Optional[bool] = None) -> str:
+        """Lädt das HTML einer Listen-Seite gemäß der Fetch-Strategie der Quelle.
+
+        ``render`` überschreibt die Rendering-Option der Quelle für Proxy-Requests.
+        """
+        if adapter.fetch == 'browser':
+            return await self._render_with_browser(fetcher, target_url, adapter)
+
+        if adapter.fetch == 'proxy' and self.proxy:
+            if render is None:
+                render = adapter.render is True
+            response = await self.proxy.fetch(fetcher, target_url, adapter.name,
+                                              render=render, premium=adapter.premium)
+        else:
+            logger.info(f"Scraping URL: {target_url}")
+            response = await fetcher.fetch(target_url)
+
+        return response['content'].decode(response['encoding'], errors='replace')
+
+    async def _scrape_listing_page(self, fetcher: AsyncFetcher, adapter: SourceAdapter,
+                                   target_url: str) -> List:
+        """Scrapt eine Listen-Seite nach Links zu Dokumenten.
+
+        Gibt eine Liste von (URL, Titel)-Tupeln zurück, gefiltert über
+        ``adapter.accepts_link``. Mit ``render: "auto"`` (Proxy) bzw.
+        ``browser_fallback`` wird die Seite nur dann gerendert, wenn das
+        statische HTML keine passenden Links enthält.
+        """
+        try:
+            html = await self._fetch_listing_html(fetcher, target_url, adapter)
+            links = self._extract_listing_links(html, target_url, adapter)
+            if not links and adapter.fetch == 'proxy' and adapter.render == 'auto' and self.proxy:
+                logger.info(f"Keine passenden Links ohne Rendering von {target_url}, "
+                            f"lade mit Rendering über den Proxy")
+                html = await self._fetch_listing_html(fetcher, target_url, adapter, render=True)
+                links = self._extract_listing_links(html, target_url, adapter)
+            if not links and adapter.browser_fallback and adapter.fetch != 'browser':
+                logger.info(f"Keine passenden Links im statischen HTML von {target_url}, "
+                            f"wechsle zum Browser")
+                html = await self._render_with_browser(fetcher, target_url, adapter)
+                links = self._extract_listing_links(html, target_url, adapter)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"Netzwerkfehler beim Scraping von {target_url}: {e}")
-        
-        return documents
+            return []
+        except Exception as e:
+            logger.error(f"Fehler beim Scraping von {target_url}: {e}")
+            return []
+
+        return links
+
+    def _extract_listing_links(self, html: str, target_url: str, adapter: SourceAdapter) -> List:
+        """Extrahiert die vom Adapter akzeptierten Dokument-Links einer Listen-Seite"""
+        links = []
+
+        parse_start = time.perf_counter()
+        anchors = extract_links(html)
+        parse_ms = (time.perf_counter() - parse_start) * 1000
+
+        if not anchors:
+            logger.warning(f"Keine Links auf der Seite gefunden: {target_url}")
+            logger.warning(f"Seiteninhalt-Anfang: {html[:1000]}")
+        else:
+            logger.info(f"{len(anchors)} Links aus {target_url} extrahiert ({parse_ms:.1f} ms)")
+
+        for href, link_text in anchors:
+            text = self._clean_text(link_text)
+            if not adapter.accepts_link(href, text):
+                continue
+            links.append((urljoin(target_url, href), text))
+
+        return links
+
+    def _conditional_headers(self, validator: Optional[Dict]) -> Dict:
+        """Baut If-None-Match/If-Modified-Since-Header aus gespeicherten Validatoren"""
+        headers = {}
+        if validator:
+            if validator.get('etag'):
+                headers['If-None-Match'] = validator['etag']
+            if validator.get('last_modified'):
+                headers['If-Modified-Since'] = validator['last_modified']
+        return headers
+
+    async def _scrape_document_content(self, fetcher: AsyncFetcher, url: str,
+                                       validator: Optional[Dict] = None,
+                                       adapter: Optional[SourceAdapter] = None) -> Optional[Dict]:
+        """Scrapt den Inhalt eines einzelnen Dokuments.
+
+        Bei 304 Not Modified wird ``{'not_modified': True}`` zurückgegeben,
+        ohne den Inhalt zu parsen, bei offenem Circuit Breaker
+        ``{'deferred': True}``. Nicht unterstützte Inhaltstypen und
+        Dokumente über dem Größenlimit der Quelle werden verworfen, bevor sie
+        vollständig geladen sind. Von HTML-Seiten wird nur der Hauptinhalt
+        nach den ``content_rules`` der Quelle übernommen, damit Navigation,
+        Banner oder Teaser den Hash nicht verändern.
+        """
+        try:
+            response = await fetcher.fetch(url, headers=self._conditional_headers(validator),
+                                           max_bytes=self._max_document_bytes(adapter),
+                                           accept_types=DOCUMENT_CONTENT_TYPES)
+        except ContentRejectedError as e:
+            logger.info(f"Dokument übersprungen: {e}")
+            return None
+        except CircuitOpenError:
+            # Host ist gestört; die URL wird für den nächsten Lauf vorgemerkt
+            return {'deferred': True}
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Fehler beim Scraping von {url}: {e}")
+            return None
+
+        if response['status'] == 304:
+            return {'not_modified': True}
+
+        try:
+            parse_start = time.perf_counter()
+            if self._is_pdf(response):
+                # PDFs im Prozess-Pool extrahieren, damit die Event-Loop weiterläuft
+                pdf = await self.pdf_extractor.extract(response['content'])
+                if not pdf:
+                    return None
+                page = {'text': pdf['text'], 'meta': {}}
+                extra_metadata = {'content_type': 'application/pdf', 'pages': pdf['pages'],
+                                  'truncated': pdf['truncated']}
+            else:
+                # HTML-Parsing ist CPU-lastig und blockiert sonst die Event-Loop
+                page = await asyncio.to_thread(extract_document, response['content'],
+                                               encoding=response['encoding'],
+                                               rules=adapter.content_rules if adapter else ContentRules())
+                extra_metadata = {}
+            content = self._clean_text(page['text'])
+            metadata = self._extract_metadata(content, page['meta'], url)
+            metadata.update(extra_metadata)
+            metadata['parse_ms'] = round((time.perf_counter() - parse_start) * 1000, 2)
+        except Exception as e:
+            logger.warning(f"Fehler beim Verarbeiten von {url}: {e}")
+            return None
+
+        if len(content) < 100:  # Zu kurzer Inhalt, wahrscheinlich nicht relevant
+            return None
+
+        return {
+            'content': content,
+            'metadata': metadata,
+            'etag': response['headers'].get('ETag'),
+            'last_modified': response['headers'].get('Last-Modified')
+        }
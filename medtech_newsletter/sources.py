@@ -0,0 +1,139 @@
+"""Deklarative Quellen-Adapter für den Scraper.
+
+Jeder Eintrag in ``Config.SOURCES`` wird zu einem ``SourceAdapter``. Quellen,
+die ein abweichendes Verhalten brauchen, registrieren eine Unterklasse per
+``@register_adapter("name")`` und wählen sie mit ``"adapter": "name"``.
+"""
+from typing import Dict, List, Optional, Type
+from urllib.parse import urljoin, urlparse
+
+from loguru import logger
+
+from .extraction import ContentRules
+
+FETCH_STRATEGIES = ('plain', 'proxy', 'browser')
+
+ADAPTER_REGISTRY: Dict[str, Type['SourceAdapter']] = {}
+
+
+def register_adapter(name: str):
+    """Dekorator zum Registrieren einer Adapter-Klasse unter ``name``"""
+    def decorator(cls):
+        ADAPTER_REGISTRY[name] = cls
+        return cls
+    return decorator
+
+
+@register_adapter('default')
+class SourceAdapter:
+    """Beschreibt, wie Links einer Quelle gefunden und gefiltert werden.
+
+    Konfigurationsschlüssel:
+        base_url, search_paths  Listen-Seiten der Quelle
+        feeds                   Sitemaps oder RSS-/Atom-Feeds; ersetzen die
+                                Listen-Seiten, solange sie abrufbar sind
+        url_prefixes            Pfad-Präfixe, auf die Feed-Einträge
+                                beschränkt werden (optional)
+        keywords                Linktext muss eines davon enthalten (optional)
+        fetch                   'plain', 'proxy' (ScraperAPI) oder 'browser'
+        browser_fallback        Browser nur, wenn statisch keine Links passen
+        render, premium         Optionen für 'proxy': JavaScript-Rendering
+                                (True, False oder 'auto': nur wenn ohne
+                                Rendering keine Links passen) und
+                                Residential-Proxies
+        wait_for                CSS-Selektor, auf den der Browser wartet
+        max_document_mb         Größenlimit für Dokumente der Quelle (optional)
+        main_content            Selektoren des Inhaltscontainers (optional)
+        strip_content           Selektoren für zusätzlich zu entfernende Bereiche
+        boilerplate             False: gesamten Seitentext hashen statt nur
+                                den Hauptinhalt
+        concurrency             parallele Requests an den Host der Quelle
+        rate_limit              {'rate': Requests/s, 'burst': n} für den Host
+        adapter                 Name einer per ``register_adapter``
+                                registrierten Unterklasse (optional)
+    """
+
+    def __init__(self, name: str, config: Dict):
+        self.name = name
+        self.config = config
+        self.base_url = config['base_url']
+        self.search_paths = config.get('search_paths', [])
+        self.feeds = config.get('feeds', [])
+        self.url_prefixes = config.get('url_prefixes', [])
+        self.keywords = [keyword.lower() for keyword in config.get('keywords', [])]
+        self.fetch = config.get('fetch', 'plain')
+        self.browser_fallback = config.get('browser_fallback', False)
+        self.render = config.get('render', False)
+        self.premium = config.get('premium', False)
+        self.wait_for = config.get('wait_for', 'a[href]')
+        self.concurrency = config.get('concurrency')
+        self.max_document_mb = config.get('max_document_mb')
+        self.content_rules = ContentRules(main=config.get('main_content'),
+                                          strip=config.get('strip_content'),
+                                          boilerplate=config.get('boilerplate', True))
+        self.rate_limit = config.get('rate_limit')
+
+        # Ältere Konfigurationen verwenden "dynamic"
+        if config.get('dynamic') is True:
+            self.fetch = 'browser'
+        elif config.get('dynamic') == 'auto':
+            self.browser_fallback = True
+
+        if self.fetch not in FETCH_STRATEGIES:
+            raise ValueError(f"Unbekannte Fetch-Strategie '{self.fetch}' für Quelle {name}")
+        if self.render not in (True, False, 'auto'):
+            raise ValueError(f"Ungültiger Wert für 'render' bei Quelle {name}: {self.render}")
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name} ({self.fetch})>"
+
+    @property
+    def host(self) -> str:
+        return urlparse(self.base_url).netloc.lower()
+
+    def listing_urls(self) -> List[str]:
+        """Absolute URLs aller Listen-Seiten"""
+        return [urljoin(self.base_url, path) for path in self.search_paths]
+
+    def feed_urls(self) -> List[str]:
+        """Absolute URLs aller Sitemaps und Feeds"""
+        return [urljoin(self.base_url, feed) for feed in self.feeds]
+
+    def accepts_feed_entry(self, url: str, title: str) -> bool:
+        """Entscheidet, ob ein Sitemap-/Feed-Eintrag ein Dokument der Quelle ist.
+
+        Einträge ohne Titel (Sitemaps) werden über ihren URL-Pfad gegen die
+        ``keywords`` geprüft.
+        """
+        path = urlparse(url).path
+        if self.url_prefixes and not path.startswith(tuple(self.url_prefixes)):
+            return False
+        if self.keywords:
+            haystack = (title or path.replace('-', ' ')).lower()
+            return any(keyword in haystack for keyword in self.keywords)
+        return True
+
+    def accepts_link(self, href: str, text: str) -> bool:
+        """Entscheidet, ob ein Link auf einer Listen-Seite ein Dokument ist"""
+        if href.startswith(('#', 'mailto:', 'javascript:')) or not text:
+            return False
+        if self.keywords:
+            text_lower = text.lower()
+            return any(keyword in text_lower for keyword in self.keywords)
+        return True
+
+
+def build_adapters(sources: Dict) -> Dict[str, SourceAdapter]:
+    """Erstellt die Adapter für alle Einträge von ``Config.SOURCES``"""
+    adapters = {}
+    for name, config in sources.items():
+        adapter_name = config.get('adapter', 'default')
+        adapter_cls: Optional[Type[SourceAdapter]] = ADAPTER_REGISTRY.get(adapter_name)
+        if adapter_cls is None:
+            logger.error(f"Unbekannter Adapter '{adapter_name}' für Quelle {name}, Quelle wird übersprungen")
+            continue
+        try:
+            adapters[name] = adapter_cls(name, config)
+        except (KeyError, ValueError) as e:
+            logger.error(f"Ungültige Konfiguration für Quelle {name}: {e}")
+    return adapters
@@ -0,0 +1,53 @@
+"""Hilfsfunktionen für URLs."""
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query-Parameter, die nur der Reichweitenmessung dienen und den Inhalt nicht ändern
+TRACKING_PARAMS = {
+    'gclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', '_ga', '_gl',
+    'sid', 'phpsessid', 'jsessionid', 'cfid', 'cftoken'
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_')
+
+_SESSION_PATH_PARAM = re.compile(r';(jsessionid|phpsessid|sid)=[^/?#]*', re.IGNORECASE)
+_DUPLICATE_SLASHES = re.compile(r'/{2,}')
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def normalize_url(url: str) -> str:
+    """Normalisiert eine URL für Vergleiche, als Cache-Schlüssel und zum Laden.
+
+    Schema und Host werden kleingeschrieben, Standard-Ports, Fragmente,
+    Session-IDs und Tracking-Parameter entfernt und Query-Parameter sortiert.
+    Die so normalisierte URL verweist weiterhin auf dieselbe Ressource.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    path = _SESSION_PATH_PARAM.sub('', parts.path) or '/'
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ))
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+
+def url_fingerprint(url: str) -> str:
+    """Kanonischer Schlüssel zur Duplikaterkennung.
+
+    Geht über ``normalize_url`` hinaus: doppelte Slashes und ein
+    abschließender Slash werden entfernt, ``www.`` ignoriert. Nur zum
+    Vergleichen gedacht, nicht zum Laden.
+    """
+    parts = urlsplit(normalize_url(url))
+    netloc = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    path = _DUPLICATE_SLASHES.sub('/', parts.path)
+    if len(path) > 1:
+        path = path.rstrip('/')
+    return urlunsplit((parts.scheme, netloc, path, parts.query, ''))
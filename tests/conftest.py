@@ -0,0 +1,27 @@
+"""Gemeinsame Fixtures der Tests.
+
+Die Tests verwenden statt ``create_app`` eine eigene Flask-App mit einer
+SQLite-Datenbank im Speicher. Aufruf: ``python -m pytest tests``
+"""
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from medtech_newsletter import models  # noqa: E402,F401  (registriert die Tabellen)
+from medtech_newsletter.extensions import db  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
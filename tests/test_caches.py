@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+from multidict import CIMultiDict
+from sqlalchemy import inspect, text
+
+from medtech_newsletter.analysis_cache import AnalysisCache
+from medtech_newsletter.extensions import db
+from medtech_newsletter.http_cache import ResponseCache
+from medtech_newsletter.models import Document, DocumentChange, upgrade_schema
+from medtech_newsletter.scheduler import TaskScheduler
+
+INFO = {'summary': 'Neue Frist', 'key_topics': ['Software'], 'regulations': ['MDR'], 'standards': [],
+        'dates': ['2026-01-01'], 'change_indicators': ['neu'], 'importance_score': 12}
+
+
+def response(url, content=b'<html>Leitlinie</html>'):
+    return {'url': url, 'status': 200, 'headers': CIMultiDict({'ETag': '"1"'}), 'content': content,
+            'encoding': 'utf-8'}
+
+
+def entry_count(cache):
+    return cache._db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+
+def test_response_cache_roundtrip(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put('https://example.org/a', response('https://example.org/a'))
+    cached = cache.get('https://example.org/a')
+    assert cached['content'] == b'<html>Leitlinie</html>' and cached['from_cache']
+    assert cached['headers']['ETag'] == '"1"'
+    assert cache.get('https://example.org/b') is None
+    cache.close()
+
+
+def test_response_cache_evicts_at_most_once_per_interval(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=0, evict_interval=3600)
+    cache.put('a', response('https://example.org/a'))
+    cache.put('b', response('https://example.org/b', b'anderer Inhalt'))
+    cache.put('c', response('https://example.org/c'))
+    # Das erste put hat aufgeräumt, die folgenden erst nach evict_interval
+    assert entry_count(cache) == 2
+    assert cache.get('b') is None
+
+    cache.evict_interval = 0
+    cache.put('d', response('https://example.org/d'))
+    assert entry_count(cache) == 0
+    cache.close()
+
+
+def test_analysis_cache_is_scoped_to_the_analyzer_version(app):
+    db.session.add(Document(source='BfArM', url='https://example.org/a', content_hash='h1'))
+    cache = AnalysisCache(version='1')
+    cache.store('h1', INFO)
+    cache.store('h2', INFO)
+    db.session.commit()
+
+    assert cache.known(['h1', 'h2', 'h3']) == {'h1', 'h2'}
+    assert cache.lookup(['h1', None])['h1'].to_dict() == INFO
+    assert AnalysisCache(version='2').known(['h1']) == set()
+
+    # h2 gehört zu keinem aktuellen Dokument mehr
+    assert cache.prune() == 1
+    assert AnalysisCache(version='2').prune() == 1
+    db.session.commit()
+    assert cache.known(['h1', 'h2']) == set()
+
+
+def add_change(content_hash, importance_score=3, processed=False):
+    document = Document(source='BfArM', url='https://example.org/a', title='Leitlinie', content_hash='aktuell')
+    db.session.add(document)
+    db.session.flush()
+    change = DocumentChange(document_id=document.id, change_summary='Dokument geändert',
+                            importance_score=importance_score, content_hash=content_hash, processed=processed)
+    db.session.add(change)
+    db.session.commit()
+    return change
+
+
+def test_prune_keeps_the_analysis_of_pending_changes(app):
+    add_change('alt')
+    cache = AnalysisCache()
+    cache.store('alt', INFO)
+    cache.store('verworfen', INFO)
+    db.session.commit()
+
+    assert cache.prune() == 1
+    assert cache.known(['alt', 'verworfen']) == {'alt'}
+
+
+def test_newsletter_changes_use_the_analysis_of_the_changed_version(app):
+    change = add_change('alt', importance_score=3)
+    cache = AnalysisCache()
+    cache.store('alt', INFO)
+    cache.store('aktuell', dict(INFO, summary='Spätere Version'))
+    db.session.commit()
+
+    [newsletter_change] = TaskScheduler._newsletter_changes(SimpleNamespace(analysis_cache=cache), [change])
+    assert newsletter_change['summary'] == 'Neue Frist'
+    # Felder der Änderung haben Vorrang vor der Analyse
+    assert newsletter_change['importance_score'] == 3
+    assert newsletter_change['url'] == 'https://example.org/a'
+
+
+def test_upgrade_schema_adds_missing_columns(app):
+    db.session.execute(text('ALTER TABLE document_change DROP COLUMN content_hash'))
+    db.session.commit()
+    upgrade_schema()
+    upgrade_schema()
+    assert 'content_hash' in {column['name'] for column in inspect(db.engine).get_columns('document_change')}
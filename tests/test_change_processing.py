@@ -0,0 +1,139 @@
+import hashlib
+
+import pytest
+
+from medtech_newsletter.analyzer import DocumentAnalyzer
+from medtech_newsletter.change_processing import CHANGE_SUMMARY, ChangeAnalysisPool, ScrapeResultWriter
+from medtech_newsletter.extensions import db
+from medtech_newsletter.models import (Document, DocumentAnalysis, DocumentChange, DocumentValidator,
+                                       ScrapingRunItem)
+from medtech_newsletter.run_journal import ScrapingRunJournal
+
+CONTENT = ('Die neue Leitlinie zur MDR tritt am 01.01.2026 in Kraft. Hersteller müssen das '
+           'Qualitätsmanagement nach ISO 13485 anpassen; die Frist ist verbindlich. ')
+
+
+class FailingExtractAnalyzer(DocumentAnalyzer):
+    def extract_key_information(self, content, metadata):
+        raise RuntimeError('Extraktion fehlgeschlagen')
+
+
+def scraped(url, content=CONTENT, etag='"v1"'):
+    entry = {'url': url, 'source': 'BfArM', 'title': url}
+    return entry, {
+        'source': 'BfArM', 'title': url, 'url': url, 'content': content,
+        'content_hash': hashlib.sha256(content.encode('utf-8')).hexdigest(),
+        'metadata': {}, 'etag': etag, 'last_modified': None
+    }
+
+
+def run_writer(results, analyzer=None):
+    """Ein kompletter Lauf über ``ScrapeResultWriter`` mit Analyse im aufrufenden Thread"""
+    journal = ScrapingRunJournal()
+    journal.begin()
+    documents = {document.url: document.content_hash for document in Document.query}
+    validators = {validator.url: validator for validator in DocumentValidator.query}
+    writer = ScrapeResultWriter(journal, ChangeAnalysisPool(max_workers=0, analyzer=analyzer or DocumentAnalyzer()),
+                                documents, validators)
+
+    def scrape(on_frontier, on_document):
+        on_frontier([entry for entry, _ in results])
+        for entry, doc_data in results:
+            on_document(entry, doc_data)
+
+    writer.run(scrape)
+    journal.finish()
+    return writer
+
+
+def item_statuses(run_id=None):
+    query = ScrapingRunItem.query if run_id is None else ScrapingRunItem.query.filter_by(run_id=run_id)
+    return {item.url: item.status for item in query}
+
+
+def add_document(url, content):
+    db.session.add(Document(source='BfArM', url=url, title=url,
+                            content_hash=hashlib.sha256(content.encode('utf-8')).hexdigest()))
+    db.session.commit()
+
+
+def test_new_document_is_analyzed_once_per_content_version(app):
+    writer = run_writer([scraped('https://example.org/a'), scraped('https://example.org/b')])
+    assert writer.counts['new'] == 2
+    # Beide Dokumente haben denselben Inhalt
+    assert writer.counts['analyzed'] == 1
+    assert DocumentAnalysis.query.count() == 1
+    assert {validator.url for validator in DocumentValidator.query} == {'https://example.org/a',
+                                                                        'https://example.org/b'}
+
+    writer = run_writer([scraped('https://example.org/a')])
+    assert writer.counts == {'new': 0, 'changed': 0, 'unchanged': 1, 'deferred': 0, 'failed': 0, 'analyzed': 0}
+
+
+def test_changed_document_records_change_and_analysis(app):
+    add_document('https://example.org/a', 'alter Inhalt')
+    writer = run_writer([scraped('https://example.org/a')])
+
+    assert writer.counts['changed'] == 1 and writer.counts['analyzed'] == 1
+    change = DocumentChange.query.one()
+    analysis = DocumentAnalysis.query.one()
+    assert change.change_summary == CHANGE_SUMMARY
+    assert analysis.importance_score > 0
+    assert change.importance_score == analysis.importance_score
+    assert change.content_hash == analysis.content_hash
+    assert Document.query.one().content_hash == scraped('https://example.org/a')[1]['content_hash']
+    assert set(item_statuses().values()) == {'done'}
+
+
+def test_change_to_already_analyzed_content_uses_the_cached_analysis(app):
+    run_writer([scraped('https://example.org/a')])
+    add_document('https://example.org/b', 'alter Inhalt')
+    writer = run_writer([scraped('https://example.org/b')], analyzer=FailingExtractAnalyzer())
+
+    assert writer.counts['changed'] == 1 and writer.counts['analyzed'] == 0
+    assert DocumentChange.query.one().importance_score == DocumentAnalysis.query.one().importance_score
+
+
+def test_documents_with_the_same_new_content_share_one_analysis(app):
+    add_document('https://example.org/a', 'alter Inhalt')
+    writer = run_writer([scraped('https://example.org/a'), scraped('https://example.org/b')])
+
+    assert writer.counts == {'new': 1, 'changed': 1, 'unchanged': 0, 'deferred': 0, 'failed': 0, 'analyzed': 1}
+    assert DocumentChange.query.count() == 1
+    assert set(item_statuses().values()) == {'done'}
+
+
+def test_failed_analysis_keeps_old_state_and_validators(app):
+    add_document('https://example.org/a', 'alter Inhalt')
+    writer = run_writer([scraped('https://example.org/a')], analyzer=FailingExtractAnalyzer())
+
+    assert writer.counts['failed'] == 1
+    assert DocumentChange.query.count() == 0
+    assert Document.query.one().content_hash == hashlib.sha256(b'alter Inhalt').hexdigest()
+    # Ohne gespeichertes ETag lädt der nächste Lauf den Inhalt vollständig statt eines 304
+    assert DocumentValidator.query.count() == 0
+    assert item_statuses() == {'https://example.org/a': 'failed'}
+
+    # Der nächste Lauf erkennt die Änderung erneut
+    writer = run_writer([scraped('https://example.org/a')])
+    assert writer.counts['changed'] == 1 and writer.counts['analyzed'] == 1
+
+
+def test_documents_stored_before_url_normalization_are_matched(app):
+    add_document('https://Example.org/a?utm_source=feed', CONTENT)
+    add_document('https://example.org/b/', 'alter Inhalt')
+    db.session.add(DocumentValidator(url='https://example.org/b/', etag='"v0"'))
+    db.session.commit()
+    writer = run_writer([scraped('https://example.org/a'), scraped('https://example.org/b')])
+
+    assert writer.counts['new'] == 0
+    assert writer.counts['unchanged'] == 1 and writer.counts['changed'] == 1
+    assert Document.query.count() == 2
+    assert DocumentValidator.query.filter_by(url='https://example.org/b/').one().etag == '"v1"'
+
+
+def test_writer_error_aborts_the_scraper(app):
+    entry, doc_data = scraped('https://example.org/a')
+    doc_data['url'] = None
+    with pytest.raises(Exception):
+        run_writer([(entry, doc_data)])
@@ -0,0 +1,34 @@
+from medtech_newsletter.benchmarks import _sample_entity_texts
+from medtech_newsletter.entities import ENTITY_PATTERN, ENTITY_TYPES, _normalize, extract_entities, iter_entities
+
+EDGE_CASES = (
+    'FDA 21 CFR 820 und (EC) No 1907/2006, Medizinproduktegesetz (MPG), DIN EN 13485, ASTM F1980. '
+    'Neue Frist 31.02.2024 bzw. 2024-3-5; wirksam ab 5. Oktober 2025, revised guidance, new'
+)
+
+
+def test_trigger_prefilter_matches_the_full_pattern():
+    for text in (_sample_entity_texts(None)[0], EDGE_CASES):
+        expected = [(ENTITY_TYPES[match.lastgroup], _normalize(match)) for match in ENTITY_PATTERN.finditer(text)]
+        assert list(iter_entities(text)) == [entity for entity in expected if entity[1]]
+
+
+def test_entities_are_normalized_and_deduplicated():
+    entities = extract_entities(_sample_entity_texts(None)[0])
+    assert entities == {
+        'dates': ['2021-05-26', '2024-03-12', '2026-02-02'],
+        'regulations': ['EU 2017/745', 'FDA guidance', '21 CFR 820'],
+        'standards': ['ISO 13485', 'IEC 60601-1'],
+        'change_indicators': ['updated', 'effective from'],
+    }
+
+
+def test_edge_cases():
+    entities = extract_entities(EDGE_CASES)
+    # 31.02. ist kein gültiges Datum; "new" am Textende hat kein Bezugswort
+    assert entities['dates'] == ['2024-03-05', '2025-10-05']
+    # Wie bisher "FDA <Folgewort>"; die CFR-Angabe wird trotzdem erkannt
+    assert entities['regulations'] == ['FDA 21', '21 CFR 820', 'EC 1907/2006', 'Medizinproduktegesetz', 'MPG']
+    assert entities['standards'] == ['DIN EN 13485', 'ASTM F1980']
+    assert entities['change_indicators'] == ['frist', 'wirksam ab', 'revised']
+    assert extract_entities('Der Termin wurde 12/25/2024 festgelegt')['dates'] == ['2024-12-25']
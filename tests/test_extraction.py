@@ -0,0 +1,39 @@
+from medtech_newsletter.extraction import ContentRules, extract_document
+
+ARTICLE = 'Die Leitlinie beschreibt die Anforderungen an die klinische Bewertung von Medizinprodukten. ' * 3
+
+
+def test_main_content_inside_boilerplate_looking_container_is_kept():
+    html = f'''<html><body>
+        <div class="sidebar">Links</div>
+        <div class="layout-with-sidebar"><main><p>{ARTICLE}</p></main></div>
+        </body></html>'''
+    text = extract_document(html, rules=ContentRules())['text']
+    assert 'klinische Bewertung' in text
+    assert 'Links' not in text
+
+
+def test_main_element_overrides_enclosing_boilerplate_area():
+    html = f'''<html><body><div class="content sidebar">
+        <nav>Menü</nav><article><p>{ARTICLE}</p></article>
+        </div></body></html>'''
+    text = extract_document(html, rules=ContentRules())['text']
+    assert 'klinische Bewertung' in text
+    assert 'Menü' not in text
+
+
+def test_boilerplate_names_match_whole_tokens_only():
+    html = f'''<html><body>
+        <div class="header">Kopfzeile</div>
+        <div class="subheader-text"><p>{ARTICLE}</p></div>
+        <div class="cookie-banner">Cookies akzeptieren</div>
+        </body></html>'''
+    text = extract_document(html, rules=ContentRules())['text']
+    assert 'klinische Bewertung' in text
+    assert 'Kopfzeile' not in text and 'Cookies' not in text
+
+
+def test_falls_back_to_raw_text_when_cleanup_discards_the_content():
+    html = f'<html><body><div class="banner"><p>{ARTICLE}</p></div></body></html>'
+    text = extract_document(html, rules=ContentRules())['text']
+    assert 'klinische Bewertung' in text
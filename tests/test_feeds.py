@@ -0,0 +1,87 @@
+import asyncio
+import gzip
+from datetime import datetime
+
+from aiohttp import web
+
+from medtech_newsletter.fetcher import AsyncFetcher
+from medtech_newsletter.feeds import FeedEntry, FeedParser, parse_feed
+
+SITEMAP = b'''<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://example.org/leitlinie</loc><lastmod>2026-01-02T10:00:00+01:00</lastmod></url>
+  <url><loc>https://example.org/ohne-datum</loc></url>
+</urlset>'''
+
+SITEMAP_INDEX = b'''<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.org/sitemap-1.xml.gz</loc><lastmod>2026-01-01</lastmod></sitemap>
+</sitemapindex>'''
+
+RSS = b'''<rss version="2.0"><channel><title>News</title>
+  <item><title>Neue  Leitlinie</title><link>https://example.org/news/1</link>
+    <pubDate>Fri, 02 Jan 2026 09:00:00 GMT</pubDate></item>
+</channel></rss>'''
+
+ATOM = b'''<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry><title>Bekanntmachung</title><link rel="edit" href="https://example.org/edit/1"/>
+    <link href="https://example.org/atom/1"/><updated>2026-01-02T09:00:00Z</updated></entry>
+</feed>'''
+
+
+def test_sitemap_entries_and_dates_in_utc():
+    assert parse_feed(SITEMAP) == [
+        FeedEntry('https://example.org/leitlinie', '', datetime(2026, 1, 2, 9, 0)),
+        FeedEntry('https://example.org/ohne-datum', '', None),
+    ]
+
+
+def test_sitemap_index_rss_and_atom():
+    assert parse_feed(SITEMAP_INDEX) == [
+        FeedEntry('https://example.org/sitemap-1.xml.gz', '', datetime(2026, 1, 1), is_sitemap=True)
+    ]
+    assert parse_feed(RSS) == [FeedEntry('https://example.org/news/1', 'Neue Leitlinie', datetime(2026, 1, 2, 9, 0))]
+    assert parse_feed(ATOM) == [FeedEntry('https://example.org/atom/1', 'Bekanntmachung', datetime(2026, 1, 2, 9, 0))]
+
+
+def test_chunks_split_inside_elements():
+    assert parse_feed(SITEMAP[i:i + 7] for i in range(0, len(SITEMAP), 7)) == parse_feed(SITEMAP)
+
+
+def test_gzip_sitemaps_are_decompressed():
+    compressed = gzip.compress(SITEMAP)
+    assert parse_feed(compressed[i:i + 16] for i in range(0, len(compressed), 16)) == parse_feed(SITEMAP)
+
+
+def test_decompressed_size_is_limited():
+    urls = b''.join(b'<url><loc>https://example.org/%d</loc></url>' % i for i in range(10_000))
+    parser = FeedParser(max_bytes=10_000)
+    parser.feed(gzip.compress(b'<urlset>' + urls + b'</urlset>'))
+    entries = parser.close()
+    assert parser.truncated
+    assert 0 < len(entries) < 10_000
+
+
+def test_feed_is_parsed_while_streaming():
+    async def main():
+        async def handler(request):
+            return web.Response(body=gzip.compress(SITEMAP), content_type='application/x-gzip')
+
+        app = web.Application()
+        app.router.add_get('/sitemap.xml.gz', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        host, port = runner.addresses[0][:2]
+        try:
+            parser = FeedParser()
+            async with AsyncFetcher() as fetcher:
+                response = await fetcher.fetch(f'http://{host}:{port}/sitemap.xml.gz', on_chunk=parser.feed)
+            return response, parser.close()
+        finally:
+            await runner.cleanup()
+
+    response, entries = asyncio.run(main())
+    # Ohne Cache und Mitschnitt wird der Inhalt nicht zusätzlich gepuffert
+    assert response['content'] == b''
+    assert entries == parse_feed(SITEMAP)
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from medtech_newsletter.fetcher import AsyncFetcher, ContentRejectedError
+from medtech_newsletter.http_cache import ResponseCache
+from medtech_newsletter.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+RESET_TIMEOUT = 0.05
+
+
+def test_circuit_breaker_lets_one_probe_through_after_reset_timeout():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    assert not breaker.is_open
+    assert breaker.record_failure()
+    assert breaker.allow()
+    assert breaker.blocked() and not breaker.allow()
+    breaker.release_probe()
+    assert breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open and not breaker.blocked()
+
+
+async def serve(response):
+    """Lokaler Server, der jede Anfrage mit ``response()`` beantwortet"""
+    async def handler(request):
+        return response()
+
+    app = web.Application()
+    app.router.add_get('/{path}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f'http://{host}:{port}'
+
+
+def run_against_server(scenario):
+    """Führt ``scenario(fetcher, base_url, state)`` gegen einen Server aus, dessen Antwort ``state`` bestimmt"""
+    state = {'status': 503, 'content_type': 'text/html'}
+
+    async def main():
+        runner, base_url = await serve(lambda: web.Response(status=state['status'], text='x' * 200,
+                                                            content_type=state['content_type']))
+        try:
+            async with AsyncFetcher(retry_policy=RetryPolicy(max_attempts=1), breaker_threshold=1,
+                                    breaker_reset_timeout=RESET_TIMEOUT) as fetcher:
+                await scenario(fetcher, base_url, state)
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+async def open_circuit(fetcher, base_url, state):
+    state.update(status=503, content_type='text/html')
+    with pytest.raises(Exception):
+        await fetcher.fetch(f'{base_url}/failing')
+    assert fetcher.open_circuits()
+    with pytest.raises(CircuitOpenError):
+        await fetcher.fetch(f'{base_url}/blocked')
+    await asyncio.sleep(RESET_TIMEOUT * 2)
+
+
+def test_rejected_probe_closes_the_circuit():
+    async def scenario(fetcher, base_url, state):
+        await open_circuit(fetcher, base_url, state)
+        state.update(status=200, content_type='application/zip')
+        with pytest.raises(ContentRejectedError):
+            await fetcher.fetch(f'{base_url}/probe', accept_types=['text/html'])
+        assert not fetcher.open_circuits()
+
+    run_against_server(scenario)
+
+
+def test_client_error_probe_closes_the_circuit():
+    async def scenario(fetcher, base_url, state):
+        await open_circuit(fetcher, base_url, state)
+        state['status'] = 404
+        with pytest.raises(Exception) as error:
+            await fetcher.fetch(f'{base_url}/probe')
+        assert not isinstance(error.value, CircuitOpenError)
+        assert not fetcher.open_circuits()
+
+    run_against_server(scenario)
+
+
+def test_aborted_probe_is_released_for_the_next_request():
+    async def scenario(fetcher, base_url, state):
+        await open_circuit(fetcher, base_url, state)
+        throttle = fetcher.throttle
+
+        async def failing_throttle(url):
+            raise RuntimeError('abgebrochen')
+
+        fetcher.throttle = failing_throttle
+        with pytest.raises(RuntimeError):
+            await fetcher.fetch(f'{base_url}/probe')
+        fetcher.throttle = throttle
+        state['status'] = 200
+        response = await fetcher.fetch(f'{base_url}/next')
+        assert response['status'] == 200
+        assert not fetcher.open_circuits()
+
+    run_against_server(scenario)
+
+
+def test_cached_responses_are_subject_to_the_callers_limits(tmp_path):
+    async def main():
+        runner, base_url = await serve(lambda: web.Response(text='<html>' + 'x' * 2000 + '</html>',
+                                                            content_type='text/html'))
+        try:
+            async with AsyncFetcher(cache=ResponseCache(str(tmp_path))) as fetcher:
+                url = f'{base_url}/leitlinie'
+                await fetcher.fetch(url)
+                with pytest.raises(ContentRejectedError):
+                    await fetcher.fetch(url, max_bytes=1000)
+                with pytest.raises(ContentRejectedError):
+                    await fetcher.fetch(url, accept_types=['application/pdf'])
+                cached = await fetcher.fetch(url, max_bytes=10_000, accept_types=['text/html'])
+                assert fetcher.cache_hits == 3 and cached['status'] == 200
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+from medtech_newsletter.frontier import CrawlFrontier
+from medtech_newsletter.urls import normalize_url, url_fingerprint
+
+
+def test_normalize_url_keeps_the_resource_and_drops_tracking():
+    assert normalize_url('HTTPS://Www.BfArM.de:443/leitlinie;jsessionid=ABC?utm_source=x&b=2&a=1#teil') == \
+        'https://www.bfarm.de/leitlinie?a=1&b=2'
+    assert normalize_url('http://example.org') == 'http://example.org/'
+
+
+def test_fingerprint_ignores_www_trailing_and_duplicate_slashes():
+    assert url_fingerprint('https://www.example.org//news/leitlinie/') == \
+        url_fingerprint('https://example.org/news/leitlinie?gclid=1')
+    assert url_fingerprint('https://example.org/a') != url_fingerprint('https://example.org/a?seite=2')
+
+
+def test_each_url_is_queued_once_with_its_normalized_form():
+    frontier = CrawlFrontier()
+    assert frontier.add('https://example.org/a?utm_campaign=x', source='BfArM')
+    assert not frontier.add('https://www.example.org/a/')
+    assert 'https://EXAMPLE.org/a' in frontier
+    assert frontier.drain() == [{'source': 'BfArM', 'url': 'https://example.org/a'}]
+
+
+def test_new_urls_first_then_known_urls_by_last_check():
+    now = datetime.utcnow()
+    frontier = CrawlFrontier(last_checked={
+        'https://example.org/alt': now - timedelta(days=10),
+        'https://example.org/neu-geprueft': now - timedelta(hours=1),
+    })
+    for path in ('neu-geprueft', 'alt', 'unbekannt'):
+        frontier.add(f'https://example.org/{path}')
+    assert [entry['url'] for entry in frontier.drain()] == [
+        'https://example.org/unbekannt', 'https://example.org/alt', 'https://example.org/neu-geprueft'
+    ]
+
+
+def test_next_visit_and_latest_check():
+    now = datetime.utcnow()
+    frontier = CrawlFrontier(
+        last_checked={'https://www.example.org/a': now - timedelta(days=2),
+                      'https://example.org/b': now - timedelta(days=1)},
+        next_visit={'https://example.org/a': now + timedelta(days=1),
+                    'https://example.org/b': now - timedelta(minutes=1)}
+    )
+    assert not frontier.is_due('https://example.org/a')
+    assert frontier.is_due('https://example.org/b') and frontier.is_due('https://example.org/c')
+    assert frontier.latest_check('www.example.org') == now - timedelta(days=1)
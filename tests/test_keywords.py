@@ -0,0 +1,37 @@
+from medtech_newsletter.benchmarks import _legacy_document_score, _legacy_sentence_scores, keyword_benchmark
+from medtech_newsletter.keywords import ANALYZER_TABLES, MEDICAL_KEYWORDS, TOPIC_KEYWORDS, KeywordMatcher
+
+
+def test_matcher_counts_like_substring_search():
+    matcher = KeywordMatcher({'a': ['Iso', 'iso 13485'], 'b': ['iso', 'norm']})
+    hits = matcher.scan('ISO 13485 und ISO 14971 sind Normen; normativ')
+    assert len(matcher.keywords) == 3
+    assert hits.score(matcher.weights({'a': 1})) == 3
+    # "iso" steht in beiden Tabellen und zählt doppelt
+    assert hits.score(matcher.weights({'a': 1, 'b': 1})) == 7
+    assert hits.score(matcher.weights({'b': 1}), distinct=True) == 2
+    assert hits.any('a') and not matcher.scan('Leitlinie').any('b')
+
+
+def test_scan_each_does_not_match_across_texts():
+    matcher = KeywordMatcher({'change': ['new', 'neu']})
+    first, second, third = matcher.scan_each(['brand new', 'ne', 'w leitlinie neu neu'])
+    assert first.counts and not second.counts
+    assert third.score(matcher.weights({'change': 1})) == 2
+    assert matcher.scan_each([]) == []
+
+
+def test_automaton_matches_the_legacy_keyword_search():
+    assert all(result['identical'] for result in keyword_benchmark(rounds=1))
+
+    content = ('Updated mandatory requirements: the new ISO 13485 quality management deadline. '
+               'Neu: überarbeitete Risikomanagement-Pflicht nach ISO 14971 und IEC 62304 Software.')
+    sentences = content.split('. ')
+    matcher = KeywordMatcher(ANALYZER_TABLES)
+    medical = {f'medical:{category}': 1 for category in MEDICAL_KEYWORDS}
+    hits = matcher.scan(content)
+    legacy = _legacy_document_score(content)
+    assert hits.score(matcher.weights({**medical, 'high_importance': 2})) == legacy['score']
+    assert [topic for topic in TOPIC_KEYWORDS if hits.any(f'topic:{topic}')] == legacy['topics']
+    assert [sentence_hits.score(matcher.weights({**medical, 'change': 2}), distinct=True)
+            for sentence_hits in matcher.scan_each(sentences)] == _legacy_sentence_scores(sentences)
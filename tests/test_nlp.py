@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from medtech_newsletter import nlp
+from medtech_newsletter.analyzer import DocumentAnalyzer
+
+
+class ModelLoader:
+    """Ersetzt ``load_sentence_pipeline`` und protokolliert die geladenen Modelle"""
+
+    def __init__(self, available):
+        self.available = set(available)
+        self.calls = []
+
+    def __call__(self, name):
+        self.calls.append(name)
+        if name not in self.available:
+            raise OSError(f"Modell {name} nicht installiert")
+        return f'pipeline:{name}'
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    loader = ModelLoader(available={'en_core_web_sm'})
+    monkeypatch.setattr(nlp, 'load_sentence_pipeline', loader)
+    monkeypatch.setattr(nlp, '_loaded', False)
+    monkeypatch.setattr(nlp, '_sentence_pipeline', None)
+    return loader
+
+
+def test_model_is_loaded_on_first_use_only(loader):
+    analyzer = DocumentAnalyzer()
+    assert loader.calls == []
+    assert analyzer.nlp == 'pipeline:en_core_web_sm'
+    assert DocumentAnalyzer().nlp is analyzer.nlp
+    assert loader.calls == ['de_core_news_sm', 'en_core_web_sm']
+
+
+def test_concurrent_first_use_loads_once(loader):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(nlp.get_sentence_pipeline())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ['pipeline:en_core_web_sm'] * 8
+    assert loader.calls.count('en_core_web_sm') == 1
+
+
+def test_missing_models_are_not_retried(loader):
+    loader.available.clear()
+    assert nlp.get_sentence_pipeline() is None
+    assert nlp.get_sentence_pipeline() is None
+    assert loader.calls == ['de_core_news_sm', 'en_core_web_sm']
@@ -0,0 +1,82 @@
+import asyncio
+
+from medtech_newsletter.pdf_extraction import MAX_PDF_CHARS, PdfExtractor, extract_pdf_text
+
+
+def make_pdf(pages):
+    """Minimales PDF mit einer Textzeile je Seite"""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>',
+               b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+                   b' '.join(b'%d 0 R' % (4 + 2 * i) for i in range(len(pages))), len(pages)),
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    for text in pages:
+        stream = b'BT /F1 12 Tf 72 720 Td (%s) Tj ET' % text.encode('latin-1')
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (len(objects) + 2))
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+    pdf = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(pdf)
+    pdf += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    pdf += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    pdf += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return pdf
+
+
+def test_truncated_only_when_pages_remain(tmp_path):
+    path = tmp_path / 'leitlinie.pdf'
+    path.write_bytes(make_pdf(['Seite 1', 'Seite 2', 'Seite 3']))
+
+    complete = extract_pdf_text(str(path), max_pages=3)
+    assert complete['pages'] == 3 and not complete['truncated']
+    assert 'Seite 3' in complete['text']
+
+    limited = extract_pdf_text(str(path), max_pages=2)
+    assert limited['pages'] == 2 and limited['truncated']
+
+    short = extract_pdf_text(str(path), max_chars=5)
+    assert short['text'] == 'Seite' and short['truncated']
+
+
+def test_max_chars_is_capped_at_the_spacy_limit():
+    assert PdfExtractor(max_chars=10 * MAX_PDF_CHARS).max_chars == MAX_PDF_CHARS
+
+
+def test_timeout_stops_only_the_hung_pdf():
+    async def main():
+        extractor = PdfExtractor(max_workers=1, max_pages=10_000, timeout=1)
+        try:
+            slow = make_pdf(['Text %d ' % page * 40 for page in range(3000)])
+            # Das kleine PDF wartet auf den einzigen Platz und läuft nach dem Abbruch
+            return await asyncio.gather(extractor.extract(slow), extractor.extract(make_pdf(['klein'])))
+        finally:
+            extractor.close(wait=True)
+
+    hung, small = asyncio.run(main())
+    assert hung is None
+    assert small['text'].strip() == 'klein'
+
+
+def test_unreadable_pdf_returns_none():
+    async def main():
+        extractor = PdfExtractor(max_workers=1)
+        return await extractor.extract(b'kein PDF')
+
+    assert asyncio.run(main()) is None
+
+
+def test_temp_file_is_removed(tmp_path, monkeypatch):
+    monkeypatch.setattr('tempfile.tempdir', str(tmp_path))
+
+    async def main():
+        extractor = PdfExtractor(max_workers=1)
+        try:
+            return await extractor.extract(make_pdf(['Seite 1']))
+        finally:
+            extractor.close(wait=True)
+
+    assert asyncio.run(main())['pages'] == 1
+    assert list(tmp_path.iterdir()) == []
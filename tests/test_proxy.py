@@ -0,0 +1,79 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from medtech_newsletter.proxy import ScraperApiClient
+
+
+class RecordingFetcher:
+    """Nimmt die Proxy-Aufrufe entgegen, ohne ins Netz zu gehen"""
+
+    def __init__(self, cached_keys=(), failing=False):
+        self.calls = []
+        self.cached_keys = set(cached_keys)
+        self.failing = failing
+
+    async def fetch(self, url, timeout=None, origin=None, cache_key=None):
+        self.calls.append({'url': url, 'timeout': timeout, 'origin': origin, 'cache_key': cache_key})
+        if self.failing:
+            raise aiohttp.ClientError('Proxy nicht erreichbar')
+        return {'url': origin, 'content': b'<html></html>', 'from_cache': cache_key in self.cached_keys}
+
+
+def test_credits_follow_render_and_premium_options():
+    client = ScraperApiClient('KEY', timeout=70, render_timeout=180)
+    fetcher = RecordingFetcher()
+
+    async def main():
+        await client.fetch(fetcher, 'https://www.fda.gov/a', 'FDA')
+        await client.fetch(fetcher, 'https://www.fda.gov/b', 'FDA', render=True)
+        await client.fetch(fetcher, 'https://www.ema.europa.eu/c', 'EMA', premium=True)
+        await client.fetch(fetcher, 'https://www.ema.europa.eu/d', 'EMA', render=True, premium=True)
+
+    asyncio.run(main())
+    assert client.stats['FDA']['credits'] == 11
+    assert client.stats['FDA']['rendered'] == 1
+    assert client.stats['EMA']['credits'] == 35
+    assert client.summary()['calls'] == 4
+    assert client.summary()['credits'] == 46
+    assert [call['timeout'] for call in fetcher.calls] == [70, 180, 70, 180]
+    assert fetcher.calls[3]['url'].endswith('&render=true&premium=true')
+    assert 'url=https%3A%2F%2Fwww.fda.gov%2Fa' in fetcher.calls[0]['url']
+
+
+def test_cached_responses_cost_no_credits():
+    client = ScraperApiClient('KEY')
+    fetcher = RecordingFetcher(cached_keys={'scraperapi:10:https://www.fda.gov/a'})
+
+    async def main():
+        await client.fetch(fetcher, 'https://WWW.fda.gov/a#teil', 'FDA', render=True)
+
+    asyncio.run(main())
+    assert client.stats['FDA']['cached'] == 1
+    assert client.stats['FDA']['calls'] == 0
+    assert client.stats['FDA']['credits'] == 0
+
+
+def test_failed_requests_are_counted_and_raised():
+    client = ScraperApiClient('KEY')
+
+    async def main():
+        await client.fetch(RecordingFetcher(failing=True), 'https://www.fda.gov/a', 'FDA')
+
+    with pytest.raises(aiohttp.ClientError):
+        asyncio.run(main())
+    assert client.stats['FDA']['failed'] == 1
+    assert client.summary()['credits'] == 0
+
+
+def test_reset_starts_a_new_run():
+    client = ScraperApiClient('KEY')
+    assert client.summary() is None
+
+    async def main():
+        await client.fetch(RecordingFetcher(), 'https://www.fda.gov/a', 'FDA')
+        client.reset()
+
+    asyncio.run(main())
+    assert client.summary() is None
@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+from medtech_newsletter.ratelimit import HostRateLimiter, TokenBucket
+
+
+def elapsed(coroutine_factory):
+    async def main():
+        start = time.monotonic()
+        await coroutine_factory()
+        return time.monotonic() - start
+
+    return asyncio.run(main())
+
+
+def test_burst_is_immediate_and_further_tokens_follow_the_rate():
+    bucket = TokenBucket(rate=20, burst=3)
+
+    async def take(count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    assert elapsed(lambda: take(3)) < 0.03
+    # Zwei weitere Tokens bei 20/s: mindestens 0,1 s
+    assert elapsed(lambda: take(2)) >= 0.09
+
+
+def test_hosts_do_not_share_a_budget():
+    limiter = HostRateLimiter(default_rate=5, default_burst=1)
+
+    async def one_per_host():
+        await asyncio.gather(*(limiter.acquire(f'https://host{i}.example.org/doc') for i in range(5)))
+
+    assert elapsed(one_per_host) < 0.05
+
+
+def test_host_limits_override_the_defaults():
+    limiter = HostRateLimiter(default_rate=1, default_burst=1,
+                              host_limits={'WWW.FDA.GOV': {'rate': 50, 'burst': 4}})
+
+    async def same_host():
+        for _ in range(4):
+            await limiter.acquire('https://www.fda.gov/guidance')
+
+    assert elapsed(same_host) < 0.05
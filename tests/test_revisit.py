@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from medtech_newsletter.extensions import db
+from medtech_newsletter.models import ScrapingRun, ScrapingRunItem
+from medtech_newsletter.revisit import RevisitPlanner, estimate_change_rate
+
+
+def test_estimate_change_rate_corrects_for_missed_changes():
+    assert estimate_change_rate(10, 0, 10) == 0
+    assert estimate_change_rate(0, 0, 10) == 0
+    # Jede Prüfung fand eine Änderung: vermutlich mehr als eine pro Intervall
+    assert estimate_change_rate(10, 10, 10) > 1.0
+    assert estimate_change_rate(10, 5, 10) < estimate_change_rate(10, 9, 10)
+
+
+def test_interval_is_bounded():
+    planner = RevisitPlanner(min_hours=2, max_hours=100)
+    assert planner.interval_hours(0) == 100
+    assert planner.interval_hours(1000) == 2
+    assert planner.interval_hours(1) == 24
+
+
+def add_run(checked_at, urls):
+    run = ScrapingRun(status='completed', started_at=checked_at, finished_at=checked_at)
+    db.session.add(run)
+    db.session.flush()
+    for position, url in enumerate(urls):
+        db.session.add(ScrapingRunItem(run_id=run.id, position=position, url=url, source='BfArM',
+                                       status='done', processed_at=checked_at))
+
+
+def test_only_documents_first_seen_inside_the_window_are_new(app):
+    now = datetime.utcnow()
+    add_run(now - timedelta(days=100), ['a', 'b'])
+    add_run(now - timedelta(days=10), ['a', 'b', 'c'])
+    db.session.commit()
+
+    plan = RevisitPlanner(window_days=90).estimate(['BfArM'], now=now)
+    source = plan['sources']['BfArM']
+    assert (source['documents'], source['new_documents'], source['changes']) == (3, 1, 0)
+    assert set(plan['urls']) == {'a', 'b', 'c'}
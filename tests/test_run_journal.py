@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from medtech_newsletter.extensions import db
+from medtech_newsletter.models import Document, ScrapingLock, ScrapingRun, ScrapingRunItem
+from medtech_newsletter.run_journal import LOCK_ID, RunInProgressError, ScrapingRunJournal, prune_runs
+
+
+def entries(*urls):
+    return [{'url': url, 'source': 'BfArM', 'title': url} for url in urls]
+
+
+def expire_lock():
+    """Lässt den Heartbeat des aktuellen Sperrinhabers veralten, als wäre sein Prozess gestorben"""
+    db.session.get(ScrapingLock, LOCK_ID).heartbeat_at = datetime.utcnow() - timedelta(hours=1)
+    db.session.commit()
+
+
+def test_new_run_records_frontier_and_completes(app):
+    journal = ScrapingRunJournal()
+    assert journal.begin() is None
+    journal.record_frontier(entries('a', 'b'))
+    journal.record_document('a')
+    journal.record_document('b', 'failed')
+    journal.finish()
+
+    run = db.session.get(ScrapingRun, journal.run.id)
+    assert (run.status, run.total_items, run.processed_items) == ('completed', 2, 2)
+    assert db.session.get(ScrapingLock, LOCK_ID).holder is None
+
+
+def test_live_run_blocks_a_second_journal(app):
+    ScrapingRunJournal().begin()
+    with pytest.raises(RunInProgressError):
+        ScrapingRunJournal().begin()
+
+
+def test_stale_run_is_resumed_with_pending_entries_in_order(app):
+    first = ScrapingRunJournal(commit_every=1)
+    first.begin()
+    first.record_frontier(entries('a', 'b', 'c', 'd'))
+    first.record_document('c')
+    expire_lock()
+
+    second = ScrapingRunJournal()
+    assert second.begin() == entries('a', 'b', 'd')
+    assert second.resumed and second.run.id == first.run.id
+
+
+def test_taken_over_run_stops_its_previous_holder(app):
+    first = ScrapingRunJournal()
+    first.begin()
+    first.record_frontier(entries('a', 'b'))
+    expire_lock()
+    second = ScrapingRunJournal()
+    second.begin()
+
+    first.record_document('a')
+    with pytest.raises(RunInProgressError):
+        first.checkpoint()
+    first.fail()
+    assert db.session.get(ScrapingRun, second.run.id).status == 'running'
+    assert db.session.get(ScrapingLock, LOCK_ID).holder == second._token
+
+
+def test_heartbeat_renews_the_lock(app):
+    journal = ScrapingRunJournal(heartbeat_interval=timedelta(0))
+    journal.begin()
+    expire_lock()
+    journal.heartbeat()
+    assert db.session.get(ScrapingLock, LOCK_ID).heartbeat_at > datetime.utcnow() - timedelta(minutes=1)
+    with pytest.raises(RunInProgressError):
+        ScrapingRunJournal().begin()
+
+
+def test_fail_after_database_error_keeps_run_resumable(app):
+    journal = ScrapingRunJournal(commit_every=1)
+    journal.begin()
+    journal.record_frontier(entries('a', 'b'))
+    journal.record_document('a')
+    db.session.add(Document(source='BfArM', url=None))
+    with pytest.raises(IntegrityError):
+        db.session.flush()
+
+    journal.fail()
+    run = db.session.get(ScrapingRun, journal.run.id)
+    assert run.status == 'failed'
+    assert db.session.get(ScrapingLock, LOCK_ID).holder is None
+
+    resumed = ScrapingRunJournal()
+    assert resumed.begin() == entries('b')
+    assert resumed.run.id == journal.run.id and resumed.run.status == 'running'
+
+
+def test_deferred_entries_move_to_the_next_run(app):
+    first = ScrapingRunJournal()
+    first.begin()
+    first.record_frontier(entries('a', 'b'))
+    first.record_document('a')
+    first.record_document('b', 'deferred')
+    first.finish()
+
+    second = ScrapingRunJournal()
+    second.begin()
+    assert second.take_deferred() == entries('b')
+    assert second.take_deferred() == []
+
+
+def test_prune_runs_keeps_recent_and_unfinished_runs(app):
+    now = datetime.utcnow()
+    runs = [ScrapingRun(status='completed', finished_at=now - timedelta(days=200)),
+            ScrapingRun(status='completed', finished_at=now - timedelta(days=1)),
+            ScrapingRun(status='failed')]
+    db.session.add_all(runs)
+    db.session.flush()
+    for position, run in enumerate(runs):
+        db.session.add(ScrapingRunItem(run_id=run.id, position=position, url=f'u{position}', source='BfArM'))
+    db.session.commit()
+
+    assert prune_runs(now - timedelta(days=100)) == 1
+    db.session.commit()
+    assert [run.status for run in ScrapingRun.query.order_by(ScrapingRun.id)] == ['completed', 'failed']
+    assert sorted(item.url for item in ScrapingRunItem.query) == ['u1', 'u2']
@@ -0,0 +1,79 @@
+import http.server
+import threading
+
+import pytest
+
+from medtech_newsletter.scraper import DocumentScraper
+
+DOCUMENT = 'Die Leitlinie beschreibt die Anforderungen an die klinische Bewertung nach MDR. ' * 3
+
+
+class SourceHandler(http.server.BaseHTTPRequestHandler):
+    """Listen-Seite mit drei Dokument-Links und die zugehörigen Dokumente"""
+
+    def do_GET(self):
+        if self.path.startswith('/doc/'):
+            body = f'<html><body><main><p>{DOCUMENT}{self.path}</p></main></body></html>'
+        else:
+            body = '<html><body>' + ''.join(f'<a href="/doc/{i}">Leitlinie {i}</a>' for i in range(3)) \
+                + '</body></html>'
+        content = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    monkeypatch.delenv('SCRAPER_API_KEY', raising=False)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), SourceHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    yield DocumentScraper.from_config({
+        'SOURCES': {'BfArM': {'base_url': base_url, 'search_paths': ['/liste'], 'keywords': ['leitlinie']}},
+        'SCRAPING_DEFAULT_RATE_LIMIT': {'rate': 100, 'burst': 100}
+    })
+    server.shutdown()
+
+
+@pytest.fixture
+def failing_document(monkeypatch):
+    """Lässt das Laden von /doc/1 mit einer unerwarteten Exception scheitern"""
+    scrape_document = DocumentScraper._scrape_document
+
+    async def scrape(self, fetcher, entry, validator=None):
+        if entry['url'].endswith('/doc/1'):
+            raise ValueError('defekt')
+        return await scrape_document(self, fetcher, entry, validator)
+
+    monkeypatch.setattr(DocumentScraper, '_scrape_document', scrape)
+
+
+def test_failing_document_does_not_abort_the_run(scraper, failing_document):
+    reported = {}
+    documents = scraper.scrape_all_sources(on_document=lambda entry, doc: reported.update({entry['url']: doc}))
+
+    assert len(reported) == 3
+    assert [url for url, doc in reported.items() if doc is None] == [url for url in reported if url.endswith('/doc/1')]
+    assert len(documents) == 2
+    # Der Empfänger hat den Inhalt bereits; die Rückgabe enthält ihn nicht mehr
+    assert all('content' not in doc and doc['content_hash'] for doc in documents)
+
+
+def test_documents_keep_their_content_without_on_document(scraper):
+    documents = scraper.scrape_all_sources()
+    assert len(documents) == 3
+    assert all(DOCUMENT.strip() in doc['content'] for doc in documents)
+
+
+def test_on_document_errors_propagate(scraper):
+    def on_document(entry, doc):
+        raise RuntimeError('Writer abgebrochen')
+
+    with pytest.raises(RuntimeError, match='Writer abgebrochen'):
+        scraper.scrape_all_sources(on_document=on_document)
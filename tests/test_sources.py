@@ -0,0 +1,56 @@
+from medtech_newsletter.sources import (ADAPTER_REGISTRY, SourceAdapter, build_adapters,
+                                        register_adapter)
+
+
+def test_registered_adapter_is_selected_by_name():
+    @register_adapter('nur_pdf')
+    class PdfOnlyAdapter(SourceAdapter):
+        def accepts_link(self, href, text):
+            return href.endswith('.pdf') and super().accepts_link(href, text)
+
+    try:
+        adapters = build_adapters({
+            'BfArM': {'base_url': 'https://www.bfarm.de', 'adapter': 'nur_pdf'},
+            'FDA': {'base_url': 'https://www.fda.gov'},
+        })
+        assert type(adapters['BfArM']) is PdfOnlyAdapter
+        assert type(adapters['FDA']) is SourceAdapter
+        assert not adapters['BfArM'].accepts_link('/leitlinie.html', 'Leitlinie')
+        assert adapters['BfArM'].accepts_link('/leitlinie.pdf', 'Leitlinie')
+    finally:
+        del ADAPTER_REGISTRY['nur_pdf']
+
+
+def test_unknown_adapter_and_invalid_config_skip_only_that_source():
+    adapters = build_adapters({
+        'Unbekannt': {'base_url': 'https://example.org', 'adapter': 'gibt_es_nicht'},
+        'Ohne URL': {'search_paths': ['/news']},
+        'Falsche Strategie': {'base_url': 'https://example.org', 'fetch': 'ftp'},
+        'EMA': {'base_url': 'https://www.ema.europa.eu'},
+    })
+    assert list(adapters) == ['EMA']
+
+
+def test_config_keys_and_legacy_dynamic_flag():
+    adapter = SourceAdapter('Swissmedic', {
+        'base_url': 'https://WWW.Swissmedic.ch',
+        'search_paths': ['/news'],
+        'feeds': ['/sitemap.xml'],
+        'keywords': ['Leitfaden'],
+        'dynamic': 'auto',
+    })
+    assert adapter.host == 'www.swissmedic.ch'
+    assert adapter.listing_urls() == ['https://WWW.Swissmedic.ch/news']
+    assert adapter.feed_urls() == ['https://WWW.Swissmedic.ch/sitemap.xml']
+    assert adapter.fetch == 'plain' and adapter.browser_fallback
+    assert SourceAdapter('X', {'base_url': 'https://x.org', 'dynamic': True}).fetch == 'browser'
+
+
+def test_link_and_feed_entry_filters():
+    adapter = SourceAdapter('FDA', {'base_url': 'https://www.fda.gov',
+                                    'url_prefixes': ['/guidance'], 'keywords': ['Guidance']})
+    assert adapter.accepts_link('/doc', 'Final GUIDANCE for Industry')
+    assert not adapter.accepts_link('/doc', 'Press release')
+    assert not adapter.accepts_link('#top', 'Guidance')
+    assert adapter.accepts_feed_entry('https://www.fda.gov/guidance/cyber-guidance', '')
+    assert not adapter.accepts_feed_entry('https://www.fda.gov/news/cyber-guidance', '')